@@ -37,6 +37,18 @@ autodoc_default_options = {
     "member-order": "bysource",
 }
 
+# Dependencias pesadas (extensiones C, Qt) que autodoc no necesita
+# importar para documentar las firmas del código fuente
+autodoc_mock_imports = [
+    "PyQt6",
+    "numpy",
+    "mutagen",
+    "sqlalchemy",
+    "sklearn",
+    "essentia",
+    "PIL",
+]
+
 napoleon_google_docstring = True
 napoleon_numpy_docstring = False
 napoleon_include_init_with_doc = True
@@ -47,6 +59,9 @@ intersphinx_mapping = {
     "PyQt6": ("https://doc.qt.io/qtforpython/", None),
 }
 
+# Días que se reutilizan los inventarios guardados en _build/doctrees
+intersphinx_cache_limit = 30
+
 # Configuración de búsqueda
 templates_path = ["_templates"]
 exclude_patterns = ["_build", "Thumbs.db", ".DS_Store"]
@@ -82,8 +97,12 @@ latex_elements = {
 master_doc = "index"
 source_suffix = ".rst"
 
+# Modo estricto (advertencias como errores); activo por defecto para CI.
+# Exportar SPHINX_STRICT=0 en construcciones locales incrementales.
+warning_is_error = os.environ.get("SPHINX_STRICT", "1") == "1"
+
 # Configuración de advertencias
-nitpicky = True
+nitpicky = warning_is_error
 nitpick_ignore = [
     ("py:class", "PyQt6.QtWidgets.QWidget"),
     ("py:class", "PyQt6.QtCore.QObject"),
@@ -91,7 +110,6 @@ nitpick_ignore = [
 
 # Logging
 keep_warnings = True
-warning_is_error = True
 
 # Generación de documentación de API
 add_module_names = False
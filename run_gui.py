@@ -14,19 +14,16 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-def signal_handler(sig, frame):
-    """Maneja la señal de interrupción."""
-    print('\nCerrando aplicación...')
-    sys.exit(0)
-
 if __name__ == "__main__":
-    # Configurar manejo de señales
-    signal.signal(signal.SIGINT, signal_handler)
+    # Ctrl-C termina el proceso directamente, sin que Python tenga que
+    # interrumpir el loop de eventos de Qt
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
     
     from nueva_biblioteca.main import Application
     
-    # Crear aplicación
-    app = Application(sys.argv)
+    # Crear aplicación; la pantalla de carga se muestra antes de importar
+    # los módulos pesados
+    app = Application(sys.argv, show_splash=True)
     
     # Ejecutar loop de eventos
     try:
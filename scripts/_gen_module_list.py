@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Genera scripts/_module_list.py con los módulos de nueva_biblioteca.
+
+optimize_performance.py lee la tupla generada en lugar de recorrer el
+paquete en cada ejecución; se regenera con ``--refresh-modules``.
+"""
+
+import pkgutil
+import sys
+from pathlib import Path
+
+# Directorio con el código fuente del paquete
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Módulo generado
+OUTPUT_FILE = Path(__file__).parent / "_module_list.py"
+
+def generate_module_list(output_file: Path = OUTPUT_FILE) -> tuple[str, ...]:
+    """
+    Enumera los módulos del paquete y los guarda como tupla.
+    
+    Args:
+        output_file: Archivo Python a generar
+        
+    Returns:
+        Nombres completos de los módulos, ordenados
+    """
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    
+    # walk_packages importa los subpaquetes para recorrerlos; los que
+    # fallan (dependencias ausentes) se omiten
+    modules = tuple(sorted(
+        module.name
+        for module in pkgutil.walk_packages(
+            [str(SRC_DIR / "nueva_biblioteca")],
+            prefix="nueva_biblioteca.",
+            onerror=lambda name: None
+        )
+        if not module.ispkg
+    ))
+    
+    lines = [
+        "# Generado por scripts/_gen_module_list.py; no editar a mano.",
+        "# Regenerar con: python scripts/optimize_performance.py --refresh-modules",
+        "",
+        "MODULES = (",
+        *(f"    {name!r}," for name in modules),
+        ")",
+        "",
+    ]
+    output_file.write_text("\n".join(lines))
+    print(f"✓ {len(modules)} módulos guardados en {output_file.name}")
+    
+    return modules
+
+if __name__ == "__main__":
+    generate_module_list()
@@ -0,0 +1,24 @@
+# Generado por scripts/_gen_module_list.py; no editar a mano.
+# Regenerar con: python scripts/optimize_performance.py --refresh-modules
+
+MODULES = (
+    'nueva_biblioteca.core.audio_analyzer',
+    'nueva_biblioteca.core.file_scanner',
+    'nueva_biblioteca.core.meta_designer',
+    'nueva_biblioteca.core.metadata',
+    'nueva_biblioteca.core.play_queue',
+    'nueva_biblioteca.core.player',
+    'nueva_biblioteca.core.recommender',
+    'nueva_biblioteca.data.models',
+    'nueva_biblioteca.data.repository',
+    'nueva_biblioteca.main',
+    'nueva_biblioteca.ui.main_window',
+    'nueva_biblioteca.ui.theme',
+    'nueva_biblioteca.ui.theme_manager',
+    'nueva_biblioteca.utils.batch_processor',
+    'nueva_biblioteca.utils.cache_manager',
+    'nueva_biblioteca.utils.config',
+    'nueva_biblioteca.utils.exporter',
+    'nueva_biblioteca.utils.logger',
+    'nueva_biblioteca.utils.task_queue',
+)
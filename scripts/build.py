@@ -6,19 +6,38 @@ Este script maneja la compilación, empaquetado y generación
 de instaladores para diferentes plataformas.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Deque, List, Dict, Any, Optional
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.etree import ElementTree
 import subprocess
+import argparse
+import hashlib
 import platform
+import fnmatch
+import pkgutil
 import shutil
 import json
 import sys
 import os
 
+# Líneas de salida conservadas para reportar errores
+OUTPUT_TAIL_LINES = 200
+
+# Plataforma actual
+_SYSTEM = platform.system().lower()
+
+# Marcadores de cached_run; se eliminan junto con build/ al limpiar
+RUN_CACHE_DIR = Path(__file__).parent.parent / "build" / ".run-cache"
+
 def run_command(command: List[str], cwd: Optional[Path] = None) -> bool:
     """
     Ejecuta un comando del sistema.
     
+    La salida se muestra en tiempo real; solo se conservan las últimas
+    OUTPUT_TAIL_LINES líneas para mostrarlas si el comando falla.
+    
     Args:
         command: Lista con el comando y sus argumentos
         cwd: Directorio de trabajo
@@ -26,48 +45,188 @@ def run_command(command: List[str], cwd: Optional[Path] = None) -> bool:
     Returns:
         True si el comando fue exitoso
     """
-    try:
-        subprocess.run(
-            command,
-            cwd=cwd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
+    tail: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    
+    with subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            sys.stdout.write(line)
+            tail.append(line)
+        returncode = process.wait()
+    
+    if returncode != 0:
         print(f"Error ejecutando {' '.join(command)}:")
-        print(e.stdout)
-        print(e.stderr, file=sys.stderr)
+        print("".join(tail), file=sys.stderr)
         return False
+    return True
+
+def cached_run(
+    command: List[str],
+    inputs: List[Path],
+    outputs: List[Path],
+    cwd: Optional[Path] = None
+) -> bool:
+    """
+    Ejecuta un comando solo si cambiaron sus entradas.
+    
+    La clave combina el comando con el contenido de cada entrada (o su
+    mtime si supera 1 MiB). Tras una ejecución exitosa se crea un
+    marcador en RUN_CACHE_DIR; si existe y todas las salidas siguen
+    presentes, el comando se omite.
+    
+    Args:
+        command: Lista con el comando y sus argumentos
+        inputs: Archivos de los que depende el resultado
+        outputs: Archivos o directorios que genera el comando
+        cwd: Directorio de trabajo
+        
+    Returns:
+        True si el comando fue exitoso o estaba en caché
+    """
+    digest = hashlib.sha1(repr((command, str(cwd))).encode())
+    for path in sorted(inputs):
+        stat = path.stat()
+        digest.update(str(path).encode())
+        if stat.st_size < 1 << 20:
+            digest.update(path.read_bytes())
+        else:
+            digest.update(str(stat.st_mtime_ns).encode())
+    
+    marker = RUN_CACHE_DIR / f"{digest.hexdigest()}.ok"
+    if marker.exists() and all(path.exists() for path in outputs):
+        print(f"✓ Sin cambios, se omite: {' '.join(command)}")
+        return True
+    
+    if not run_command(command, cwd=cwd):
+        return False
+    
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    return True
 
 def clean_build_dirs(project_dir: Path) -> None:
     """
     Limpia directorios de construcción.
     
+    Recorre el árbol una sola vez; los directorios eliminados y los
+    ignorados (.git, .venv) no se exploran.
+    
     Args:
         project_dir: Directorio del proyecto
     """
-    dirs_to_clean = [
+    names_to_clean = {
         "build",
         "dist",
-        "*.egg-info",
         "__pycache__",
         ".pytest_cache",
         ".ruff_cache",
         ".mypy_cache",
         "htmlcov"
-    ]
+    }
+    patterns_to_clean = ["*.egg-info"]
+    skip_dirs = {".git", ".venv"}
     
-    for pattern in dirs_to_clean:
-        for path in project_dir.rglob(pattern):
-            if path.is_dir():
-                shutil.rmtree(path)
+    def should_clean(name: str) -> bool:
+        return name in names_to_clean or any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in patterns_to_clean
+        )
+    
+    for root, dirnames, filenames in os.walk(project_dir, topdown=True):
+        kept = []
+        for name in dirnames:
+            if name in skip_dirs:
+                continue
+            if should_clean(name):
+                shutil.rmtree(Path(root) / name)
             else:
-                path.unlink()
+                kept.append(name)
+        dirnames[:] = kept
+        
+        for name in filenames:
+            if should_clean(name):
+                (Path(root) / name).unlink()
     
     print("✓ Directorios de construcción limpiados")
 
+def _write_if_changed(path: Path, content: str) -> bool:
+    """
+    Escribe un archivo solo si su contenido cambió.
+    
+    Evita modificar el mtime de archivos idénticos, que invalidaría
+    las cachés de las herramientas que dependen de ellos.
+    
+    Args:
+        path: Archivo destino
+        content: Contenido a escribir
+        
+    Returns:
+        True si el archivo fue escrito
+    """
+    if path.exists() and path.read_text() == content:
+        return False
+    path.write_text(content)
+    return True
+
+def _qrc_dependencies(qrc_file: Path) -> List[Path]:
+    """
+    Obtiene los archivos referenciados por un .qrc.
+    
+    El resultado se guarda en un ``.rcc-deps.json`` junto al .qrc y solo
+    se vuelve a parsear el XML cuando el .qrc cambia.
+    
+    Args:
+        qrc_file: Archivo de recursos Qt
+        
+    Returns:
+        Lista de rutas referenciadas
+    """
+    cache_file = qrc_file.parent / ".rcc-deps.json"
+    key = qrc_file.name
+    mtime = qrc_file.stat().st_mtime_ns
+    
+    try:
+        cache: Dict[str, Any] = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    
+    entry = cache.get(key)
+    if entry and entry["mtime"] == mtime:
+        deps = entry["deps"]
+    else:
+        root = ElementTree.parse(qrc_file).getroot()
+        deps = [elem.text.strip() for elem in root.iter("file") if elem.text]
+        cache[key] = {"mtime": mtime, "deps": deps}
+        _write_if_changed(cache_file, json.dumps(cache, indent=2))
+    
+    return [qrc_file.parent / dep for dep in deps]
+
+def _is_up_to_date(output: Path, inputs: List[Path]) -> bool:
+    """
+    Indica si un archivo generado es más reciente que sus entradas.
+    
+    Args:
+        output: Archivo generado
+        inputs: Archivos de los que depende
+        
+    Returns:
+        True si no hace falta regenerarlo
+    """
+    if not output.exists():
+        return False
+    
+    output_mtime = output.stat().st_mtime
+    return all(
+        path.exists() and path.stat().st_mtime <= output_mtime
+        for path in inputs
+    )
+
 def build_ui_resources(project_dir: Path) -> bool:
     """
     Compila recursos de UI.
@@ -84,23 +243,35 @@ def build_ui_resources(project_dir: Path) -> bool:
     if not resources_dir.exists():
         return True
     
-    success = True
-    
-    # Compilar archivos .qrc
-    for qrc_file in resources_dir.glob("*.qrc"):
-        py_file = qrc_file.with_suffix(".py")
-        
-        if not run_command(["pyside6-rcc", "-o", str(py_file), str(qrc_file)]):
-            success = False
+    # Recolectar trabajos de compilación (.qrc y .ui), omitiendo los que
+    # ya están al día
+    jobs = [
+        ("pyside6-rcc", qrc_file, qrc_file.with_suffix(".py"))
+        for qrc_file in resources_dir.glob("*.qrc")
+        if not _is_up_to_date(
+            qrc_file.with_suffix(".py"),
+            [qrc_file, *_qrc_dependencies(qrc_file)]
+        )
+    ] + [
+        ("pyside6-uic", ui_file, ui_file.with_suffix(".py"))
+        for ui_file in resources_dir.glob("*.ui")
+        if not _is_up_to_date(ui_file.with_suffix(".py"), [ui_file])
+    ]
     
-    # Compilar archivos .ui
-    for ui_file in resources_dir.glob("*.ui"):
-        py_file = ui_file.with_suffix(".py")
-        
-        if not run_command(["pyside6-uic", "-o", str(py_file), str(ui_file)]):
-            success = False
+    if not jobs:
+        print("✓ Recursos de UI al día")
+        return True
     
-    return success
+    # Cada herramienta corre en su propio proceso, así que basta con
+    # hilos para lanzarlas en paralelo
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(run_command, [tool, "-o", str(py_file), str(src_file)])
+            for tool, src_file, py_file in jobs
+        ]
+        # Esperar a todas, aunque alguna falle
+        results = [future.result() for future in as_completed(futures)]
+    return all(results)
 
 def build_package(project_dir: Path) -> bool:
     """
@@ -114,19 +285,92 @@ def build_package(project_dir: Path) -> bool:
     """
     print("\n=== Construyendo paquete Python ===")
     
+    inputs = [
+        project_dir / name
+        for name in ("pyproject.toml", "setup.py", "requirements.txt", "README.md")
+        if (project_dir / name).exists()
+    ]
+    inputs.extend(
+        path
+        for path in (project_dir / "src").rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    )
+    
     # Construir distribución
-    if not run_command(["python", "-m", "build"], cwd=project_dir):
+    if not cached_run(
+        ["python", "-m", "build"],
+        inputs=inputs,
+        outputs=[project_dir / "dist"],
+        cwd=project_dir
+    ):
         return False
     
     print("✓ Paquete construido exitosamente")
     return True
 
-def build_executable(project_dir: Path) -> bool:
+def compile_bytecode(project_dir: Path) -> bool:
+    """
+    Precompila el paquete a bytecode en __pycache__.
+    
+    Así el primer arranque no paga la compilación de todos los módulos.
+    
+    Args:
+        project_dir: Directorio del proyecto
+        
+    Returns:
+        True si la compilación fue exitosa
+    """
+    print("\n=== Compilando bytecode ===")
+    
+    command = [
+        "python", "-m", "compileall",
+        "-j", str(os.cpu_count() or 1),
+        "-q",
+        str(project_dir / "src" / "nueva_biblioteca")
+    ]
+    
+    if not run_command(command):
+        return False
+    
+    print("✓ Bytecode compilado")
+    return True
+
+def _package_modules(project_dir: Path) -> List[str]:
+    """
+    Enumera todos los módulos del paquete nueva_biblioteca.
+    
+    Se pasan a PyInstaller como ``--hidden-import`` para que no omita
+    módulos importados dinámicamente.
+    
+    Args:
+        project_dir: Directorio del proyecto
+        
+    Returns:
+        Nombres completos de los módulos
+    """
+    src_dir = str(project_dir / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    
+    return sorted(
+        module.name
+        for module in pkgutil.walk_packages(
+            [str(project_dir / "src" / "nueva_biblioteca")],
+            prefix="nueva_biblioteca."
+        )
+    )
+
+def build_executable(project_dir: Path, release: bool = False) -> bool:
     """
     Construye ejecutable con PyInstaller.
     
+    Por defecto genera un directorio (``--onedir``), que arranca sin
+    desempaquetar el bundle en cada ejecución. Con ``release`` se genera
+    un único archivo para distribución.
+    
     Args:
         project_dir: Directorio del proyecto
+        release: Si debe generar un único ejecutable (``--onefile``)
         
     Returns:
         True si la construcción fue exitosa
@@ -145,20 +389,22 @@ def build_executable(project_dir: Path) -> bool:
         ],
         "hidden_imports": [
             "PyQt6.QtSvg",
-            "PyQt6.QtMultimedia"
+            "PyQt6.QtMultimedia",
+            *_package_modules(project_dir)
         ]
     }
     
     # Guardar spec
     spec_file = project_dir / "nueva-biblioteca.spec"
-    spec_file.write_text(json.dumps(spec, indent=2))
+    _write_if_changed(spec_file, json.dumps(spec, indent=2))
     
     # Construir ejecutable
     command = [
         "pyinstaller",
         "--clean",
         "--windowed",
-        "--onefile",
+        "--onefile" if release else "--onedir",
+        "--noupx",
         f"--name={spec['name']}",
         f"--icon={project_dir/spec['icon']}",
         "--specpath", str(project_dir),
@@ -191,7 +437,7 @@ def create_installer(project_dir: Path) -> bool:
     """
     print("\n=== Creando instalador ===")
     
-    system = platform.system().lower()
+    system = _SYSTEM
     
     if system == "windows":
         return _create_windows_installer(project_dir)
@@ -245,6 +491,46 @@ def _create_linux_installer(project_dir: Path) -> bool:
     print("⚠ Creación de instalador Linux no implementada")
     return False
 
+def parse_args() -> argparse.Namespace:
+    """
+    Parsea los argumentos de línea de comandos.
+    
+    Returns:
+        Argumentos parseados
+    """
+    parser = argparse.ArgumentParser(description="Construye Nueva Biblioteca")
+    parser.add_argument(
+        "-c", "--clean",
+        action="store_true",
+        help="Eliminar artefactos de construcciones anteriores"
+    )
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="Generar un único ejecutable (--onefile) para distribución"
+    )
+    parser.add_argument(
+        "--skip-ui",
+        action="store_true",
+        help="Omitir la compilación de recursos de UI"
+    )
+    parser.add_argument(
+        "--skip-package",
+        action="store_true",
+        help="Omitir la construcción del paquete Python"
+    )
+    parser.add_argument(
+        "--skip-exe",
+        action="store_true",
+        help="Omitir la construcción del ejecutable"
+    )
+    parser.add_argument(
+        "--skip-installer",
+        action="store_true",
+        help="Omitir la creación del instalador"
+    )
+    return parser.parse_args()
+
 def main() -> int:
     """
     Función principal.
@@ -252,28 +538,36 @@ def main() -> int:
     Returns:
         0 si todo fue exitoso, otro valor en caso de error
     """
+    args = parse_args()
     project_dir = Path(__file__).parent.parent
     
-    # Limpiar directorios
-    clean_build_dirs(project_dir)
+    # Limpiar directorios solo si se pide, para conservar los
+    # artefactos y marcadores de construcciones anteriores
+    if args.clean:
+        clean_build_dirs(project_dir)
     
     # Compilar recursos
-    if not build_ui_resources(project_dir):
+    if not args.skip_ui and not build_ui_resources(project_dir):
         print("\n⚠ Error compilando recursos de UI")
         return 1
     
     # Construir paquete
-    if not build_package(project_dir):
+    if not args.skip_package and not build_package(project_dir):
         print("\n⚠ Error construyendo paquete")
         return 1
     
+    # Precompilar bytecode
+    if not compile_bytecode(project_dir):
+        print("\n⚠ Error compilando bytecode")
+        return 1
+    
     # Construir ejecutable
-    if not build_executable(project_dir):
+    if not args.skip_exe and not build_executable(project_dir, release=args.release):
         print("\n⚠ Error construyendo ejecutable")
         return 1
     
     # Crear instalador
-    if not create_installer(project_dir):
+    if not args.skip_installer and not create_installer(project_dir):
         print("\n⚠ Error creando instalador")
         return 1
     
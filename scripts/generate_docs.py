@@ -6,17 +6,36 @@ Este script automatiza la generación de documentación usando Sphinx
 y realiza varias tareas de preparación y limpieza.
 """
 
-from typing import List, Optional
+from typing import Deque, List, Optional
 from pathlib import Path
+from collections import deque
+from importlib.metadata import PackageNotFoundError, version
 import subprocess
+import argparse
+import hashlib
 import shutil
+import shlex
+import time
 import sys
 import os
 
+# Procesos de sphinx-build; usar SPHINX_JOBS=1 si alguna extensión
+# no soporta lectura en paralelo
+SPHINX_JOBS = os.environ.get("SPHINX_JOBS", "auto")
+
+# Validez del marcador de dependencias verificadas (segundos)
+DEPS_CACHE_TTL = 3600
+
+# Líneas de salida conservadas para reportar errores
+OUTPUT_TAIL_LINES = 200
+
 def run_command(command: List[str], cwd: Optional[Path] = None) -> bool:
     """
     Ejecuta un comando del sistema.
     
+    La salida se muestra en tiempo real; solo se conservan las últimas
+    OUTPUT_TAIL_LINES líneas para mostrarlas si el comando falla.
+    
     Args:
         command: Lista con el comando y sus argumentos
         cwd: Directorio de trabajo o None para usar el actual
@@ -24,20 +43,27 @@ def run_command(command: List[str], cwd: Optional[Path] = None) -> bool:
     Returns:
         True si el comando fue exitoso
     """
-    try:
-        subprocess.run(
-            command,
-            cwd=cwd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
+    tail: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    
+    with subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            sys.stdout.write(line)
+            tail.append(line)
+        returncode = process.wait()
+    
+    if returncode != 0:
         print(f"Error ejecutando {' '.join(command)}:")
-        print(e.stdout)
-        print(e.stderr, file=sys.stderr)
+        print("".join(tail), file=sys.stderr)
         return False
+    return True
 
 def clean_build_directory(docs_dir: Path) -> None:
     """
@@ -51,10 +77,17 @@ def clean_build_directory(docs_dir: Path) -> None:
         shutil.rmtree(build_dir)
         print("✓ Limpiado directorio _build")
 
-def verify_requirements() -> bool:
+def verify_requirements(docs_dir: Path) -> bool:
     """
     Verifica que estén instalados los requisitos.
     
+    Consulta los metadatos de las distribuciones en lugar de importarlas
+    y guarda un marcador en _build para no repetir la verificación
+    durante DEPS_CACHE_TTL segundos.
+    
+    Args:
+        docs_dir: Directorio de documentación
+        
     Returns:
         True si todos los requisitos están instalados
     """
@@ -65,13 +98,25 @@ def verify_requirements() -> bool:
         "myst-parser"
     ]
     
+    key = hashlib.sha1(
+        repr((sorted(requirements), sys.version)).encode()
+    ).hexdigest()
+    marker = docs_dir / "_build" / f".deps-ok-{key}"
+    
+    if marker.exists() and time.time() - marker.stat().st_mtime < DEPS_CACHE_TTL:
+        print("✓ Todas las dependencias están instaladas (caché)")
+        return True
+    
     for req in requirements:
         try:
-            __import__(req.replace("-", "_"))
-        except ImportError:
+            version(req)
+        except PackageNotFoundError:
             print(f"✗ Falta dependencia: {req}")
             return False
     
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    
     print("✓ Todas las dependencias están instaladas")
     return True
 
@@ -119,8 +164,9 @@ def build_html(docs_dir: Path) -> bool:
     command = [
         "sphinx-build",
         "-b", "html",           # Formato HTML
+        "-j", SPHINX_JOBS,       # Lectura/escritura en paralelo
         "-d", "_build/doctrees", # Directorio para doctrees
-        "-W",                    # Warnings como errores
+        *shlex.split(os.environ.get("SPHINXOPTS", "")),  # p. ej. "-W"
         ".",                     # Directorio fuente
         "_build/html"            # Directorio destino
     ]
@@ -143,6 +189,7 @@ def build_pdf(docs_dir: Path) -> bool:
     command = [
         "sphinx-build",
         "-b", "latex",          # Formato LaTeX
+        "-j", SPHINX_JOBS,       # Lectura/escritura en paralelo
         "-d", "_build/doctrees", # Directorio para doctrees
         ".",                     # Directorio fuente
         "_build/latex"           # Directorio destino
@@ -151,9 +198,18 @@ def build_pdf(docs_dir: Path) -> bool:
     if not run_command(command, docs_dir):
         return False
     
-    # Construir PDF
+    # Construir PDF; latexmk solo repite las pasadas necesarias
     latex_dir = docs_dir / "_build" / "latex"
-    command = ["make"]
+    if shutil.which("latexmk"):
+        command = [
+            "latexmk",
+            "-pdf",
+            "-interaction=nonstopmode",
+            "-synctex=0",
+            "nuevabiblioteca.tex"
+        ]
+    else:
+        command = ["make"]
     
     if run_command(command, latex_dir):
         print("✓ Documentación PDF generada")
@@ -164,6 +220,21 @@ def build_pdf(docs_dir: Path) -> bool:
         return True
     return False
 
+def parse_args() -> argparse.Namespace:
+    """
+    Parsea los argumentos de línea de comandos.
+    
+    Returns:
+        Argumentos parseados
+    """
+    parser = argparse.ArgumentParser(description="Genera la documentación")
+    parser.add_argument(
+        "-c", "--clean",
+        action="store_true",
+        help="Eliminar _build antes de construir (fuerza reconstrucción completa)"
+    )
+    return parser.parse_args()
+
 def main() -> int:
     """
     Función principal.
@@ -171,17 +242,20 @@ def main() -> int:
     Returns:
         0 si todo fue exitoso, otro valor en caso de error
     """
+    args = parse_args()
     project_dir = Path(__file__).parent.parent
     docs_dir = project_dir / "docs"
     
     print("=== Generando documentación ===")
     
     # Verificar requisitos
-    if not verify_requirements():
+    if not verify_requirements(docs_dir):
         return 1
     
-    # Limpiar directorio
-    clean_build_directory(docs_dir)
+    # Limpiar directorio solo si se pide; así Sphinx reutiliza
+    # _build/doctrees en construcciones incrementales
+    if args.clean:
+        clean_build_directory(docs_dir)
     
     # Generar documentación
     if not generate_api_docs(project_dir, docs_dir):
@@ -8,10 +8,15 @@ y tipos del código.
 
 from typing import List, Set, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import threading
 import sys
 import os
 
+# Evita que la salida de Ruff y MyPy se intercale
+_print_lock = threading.Lock()
+
 def run_command(command: List[str], capture: bool = True) -> Tuple[int, str, str]:
     """
     Ejecuta un comando del sistema.
@@ -38,6 +43,10 @@ def find_python_files(directory: Path, exclude: Set[str]) -> List[Path]:
     """
     Encuentra archivos Python en un directorio.
     
+    Usa una sola llamada a ``git ls-files`` para listar solo archivos
+    versionados; si el directorio no está en un repositorio git se
+    recorre el árbol con rglob.
+    
     Args:
         directory: Directorio a buscar
         exclude: Conjunto de patrones a excluir
@@ -45,9 +54,24 @@ def find_python_files(directory: Path, exclude: Set[str]) -> List[Path]:
     Returns:
         Lista de rutas a archivos Python
     """
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--", "*.py"],
+            cwd=directory,
+            capture_output=True,
+            check=True
+        )
+        candidates = [
+            directory / name
+            for name in result.stdout.decode().split("\0")
+            if name
+        ]
+    except (OSError, subprocess.CalledProcessError):
+        candidates = list(directory.rglob("*.py"))
+    
     python_files = []
     
-    for path in directory.rglob("*.py"):
+    for path in candidates:
         # Verificar exclusiones
         if any(excl in str(path) for excl in exclude):
             continue
@@ -55,62 +79,77 @@ def find_python_files(directory: Path, exclude: Set[str]) -> List[Path]:
     
     return sorted(python_files)
 
-def run_ruff(files: List[Path]) -> bool:
+def _flush(lines: List[str]) -> None:
+    """
+    Imprime un bloque de salida sin intercalarlo con otros hilos.
+    
+    Args:
+        lines: Líneas a imprimir
+    """
+    with _print_lock:
+        print("\n".join(lines))
+
+def run_ruff(roots: List[Path]) -> bool:
     """
     Ejecuta Ruff para linting y formato.
     
     Args:
-        files: Lista de archivos a verificar
+        roots: Directorios raíz a verificar
         
     Returns:
         True si no hubo errores
     """
-    print("\n=== Ejecutando Ruff ===")
+    lines = ["\n=== Ejecutando Ruff ==="]
     
     # Verificar estilo
-    print("\nVerificando estilo...")
-    code, out, err = run_command(["ruff", "check"] + [str(f) for f in files])
+    lines.append("\nVerificando estilo...")
+    code, out, err = run_command(["ruff", "check", *map(str, roots)])
     
     if code != 0:
-        print("⚠ Problemas de estilo encontrados:")
-        print(out)
+        lines.append("⚠ Problemas de estilo encontrados:")
+        lines.append(out)
+        _flush(lines)
         return False
     
-    print("✓ Verificación de estilo exitosa")
+    lines.append("✓ Verificación de estilo exitosa")
     
     # Verificar formato
-    print("\nVerificando formato...")
-    code, out, err = run_command(["ruff", "format", "--check"] + [str(f) for f in files])
+    lines.append("\nVerificando formato...")
+    code, out, err = run_command(["ruff", "format", "--check", *map(str, roots)])
     
     if code != 0:
-        print("⚠ Problemas de formato encontrados")
-        print(out)
-        print("\nPara corregir automáticamente ejecuta: ruff format")
+        lines.append("⚠ Problemas de formato encontrados")
+        lines.append(out)
+        lines.append("\nPara corregir automáticamente ejecuta: ruff format")
+        _flush(lines)
         return False
     
-    print("✓ Verificación de formato exitosa")
+    lines.append("✓ Verificación de formato exitosa")
+    _flush(lines)
     return True
 
-def run_mypy(files: List[Path]) -> bool:
+def run_mypy(roots: List[Path]) -> bool:
     """
     Ejecuta MyPy para verificación de tipos.
     
     Args:
-        files: Lista de archivos a verificar
+        roots: Directorios raíz a verificar
         
     Returns:
         True si no hubo errores
     """
-    print("\n=== Ejecutando MyPy ===")
+    lines = ["\n=== Ejecutando MyPy ==="]
     
-    code, out, err = run_command(["mypy"] + [str(f) for f in files])
+    code, out, err = run_command(["mypy", *map(str, roots)])
     
     if code != 0:
-        print("⚠ Problemas de tipos encontrados:")
-        print(out)
+        lines.append("⚠ Problemas de tipos encontrados:")
+        lines.append(out)
+        _flush(lines)
         return False
     
-    print("✓ Verificación de tipos exitosa")
+    lines.append("✓ Verificación de tipos exitosa")
+    _flush(lines)
     return True
 
 def main() -> int:
@@ -145,14 +184,19 @@ def main() -> int:
     
     print(f"Verificando {len(python_files)} archivos...")
     
-    # Ejecutar verificaciones
-    success = True
-    
-    if not run_ruff(python_files):
-        success = False
-    
-    if not run_mypy(python_files):
-        success = False
+    # Ejecutar verificaciones en paralelo; son procesos independientes.
+    # Se pasan los directorios raíz para que cada herramienta recorra el
+    # árbol y use su propia caché incremental.
+    roots = [src_dir, tests_dir]
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(run_ruff, roots),
+            executor.submit(run_mypy, roots)
+        ]
+        # Esperar a ambas, aunque una falle
+        results = [future.result() for future in futures]
+    success = all(results)
     
     if success:
         print("\n✨ Todas las verificaciones pasaron exitosamente")
@@ -10,54 +10,220 @@ Optimiza el rendimiento del proyecto mediante varias técnicas:
 - Perfilado de código crítico
 """
 
+import argparse
 import cProfile
+import importlib
 import io
+import json
+import os
 import pstats
+import re
+import subprocess
+import sys
+import tempfile
 import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import psutil
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Directorio con el código fuente del paquete
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Línea de salida de ``python -X importtime``: tiempo propio y acumulado
+# en microsegundos seguidos del nombre del módulo, separados por barras
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s+(.*)")
+
+# Módulos del paquete a analizar (tupla generada por _gen_module_list.py)
+MODULE_LIST_FILE = Path(__file__).parent / "_module_list.py"
+
+# Frames guardados por tracemalloc para cada asignación
+TRACEMALLOC_FRAMES = 25
+
+# Tests marcados perf_sample que se perfilan con cProfile
+WORKLOAD_DIR = Path(__file__).parent.parent / "tests" / "perf"
+
+# Filas del perfil incluidas en los reportes
+PROFILE_TOP_N = 30
+
+# Factor sobre la referencia a partir del cual una métrica es regresión
+REGRESSION_THRESHOLD = 1.2
+
+# Resultados que se comparan con la referencia (el desglose por paquete
+# de import_self_times es demasiado ruidoso para usarlo como umbral)
+COMPARED_METRICS = ('import_times', 'db_operations', 'memory')
+
+# Consultas SQL admitidas por listado antes de sospechar un patrón N+1
+MAX_QUERIES_PER_LISTING = 3
+
+# Filas insertadas al comparar inserción ORM y por lotes
+BULK_INSERT_ROWS = 100
+
+# Importaciones en frío promediadas por módulo
+IMPORT_RUNS = 3
+
+# Tiempo máximo de cada importación en frío (segundos)
+IMPORT_TIMEOUT = 30
+
+# Importaciones en frío simultáneas: la mitad de los núcleos, para que los
+# tiempos (que usa --compare) no dependan de la carga de la máquina
+IMPORT_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+
+# Reloj monotónico de alta resolución para todas las mediciones
+_t = time.perf_counter_ns
+
+
+def load_module_list() -> tuple[str, ...]:
+    """
+    Lee la lista de módulos generada por _gen_module_list.py.
+    
+    Returns:
+        Nombres completos de los módulos del paquete
+        
+    Raises:
+        FileNotFoundError: Si la lista no se ha generado todavía
+    """
+    try:
+        from _module_list import MODULES
+    except ImportError:
+        raise FileNotFoundError(
+            f"No existe scripts/{MODULE_LIST_FILE.name}; genérela con "
+            "python scripts/optimize_performance.py --refresh-modules"
+        ) from None
+    return MODULES
 
 
 class PerformanceOptimizer:
     """Optimizador de rendimiento para Nueva Biblioteca."""
     
-    def __init__(self):
-        """Inicializa el optimizador."""
+    def __init__(self, modules: tuple[str, ...] | None = None):
+        """
+        Inicializa el optimizador.
+        
+        Args:
+            modules: Módulos del paquete a analizar o None para leer la
+                lista generada en MODULE_LIST_FILE
+        """
+        self.modules = load_module_list() if modules is None else modules
         self.results: Dict[str, Any] = {}
-        self.start_time = time.time()
+        self._start_ns = _t()
+    
+    def _run_importtime(
+        self,
+        module: str
+    ) -> Tuple[Optional[List[Tuple[str, int, int]]], str]:
+        """
+        Importa un módulo en un intérprete nuevo con ``-X importtime``.
+        
+        Args:
+            module: Nombre del módulo a importar
+            
+        Returns:
+            Tupla con (lista de (módulo, self_us, cumulative_us) o None si
+            falló la importación, mensaje de error)
+        """
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+        )
+        
+        try:
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                text=True,
+                check=False,
+                env=env,
+                timeout=IMPORT_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            return None, f"tiempo agotado ({IMPORT_TIMEOUT}s)"
+        
+        entries = []
+        errors = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match:
+                self_us, cumulative_us, name = match.groups()
+                entries.append((name.strip(), int(self_us), int(cumulative_us)))
+            else:
+                errors.append(line)
+        
+        if result.returncode != 0:
+            return None, errors[-1] if errors else f"código {result.returncode}"
+        return entries, ""
     
     def analyze_imports(self) -> Dict[str, float]:
         """
         Analiza el tiempo de importación de módulos.
         
+        Cada módulo se importa en un intérprete nuevo para que las
+        dependencias ya cargadas por otro módulo no falseen la medición.
+        
         Returns:
-            Diccionario con tiempos de importación
+            Diccionario con tiempos de importación acumulados
         """
         print("🔍 Analizando tiempos de importación...")
         
-        import_times = {}
-        modules_to_test = [
-            'nueva_biblioteca.data.models',
-            'nueva_biblioteca.data.repository',
-            'nueva_biblioteca.utils.config',
-            'nueva_biblioteca.utils.logger',
-            'nueva_biblioteca.core.metadata',
-            'nueva_biblioteca.core.audio_analyzer',
-            'nueva_biblioteca.ui.main_window',
-        ]
+        # Línea base: módulos que el intérprete carga siempre al arrancar
+        baseline, _ = self._run_importtime("sys")
+        baseline_modules = {name for name, _, _ in baseline or []}
+        self.results['import_baseline'] = sum(
+            self_us for _, self_us, _ in baseline or []
+        ) / 1e6
         
-        for module in modules_to_test:
-            start = time.time()
-            try:
-                __import__(module)
-                import_time = time.time() - start
-                import_times[module] = import_time
-                print(f"  ✓ {module}: {import_time:.3f}s")
-            except ImportError as e:
-                print(f"  ✗ {module}: Error - {e}")
+        import_times = {}
+        self_times: Dict[str, Dict[str, float]] = {}
+        
+        # Cada importación es un intérprete aislado: se lanzan en paralelo,
+        # hasta IMPORT_WORKERS a la vez, y los hilos solo esperan a los
+        # subprocesos
+        jobs = [module for module in self.modules for _ in range(IMPORT_RUNS)]
+        with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+            outcomes = list(executor.map(self._run_importtime, jobs))
+        
+        by_module: Dict[str, List[Tuple[Any, str]]] = defaultdict(list)
+        for module, outcome in zip(jobs, outcomes, strict=True):
+            by_module[module].append(outcome)
+        
+        for module in self.modules:
+            runs = [entries for entries, _ in by_module[module] if entries]
+            error = next((err for entries, err in by_module[module] if err), "")
+            
+            if not runs:
+                print(f"  ✗ {module}: Error - {error}")
                 import_times[module] = -1
+                continue
+            
+            # Tiempo acumulado del módulo pedido, promediado entre corridas
+            import_time = sum(
+                next((cum for name, _, cum in entries if name == module), 0)
+                for entries in runs
+            ) / len(runs) / 1e6
+            import_times[module] = import_time
+            
+            # Tiempo propio agregado por paquete de primer nivel
+            per_package: Dict[str, float] = defaultdict(float)
+            for entries in runs:
+                for name, self_us, _ in entries:
+                    if name not in baseline_modules:
+                        per_package[name.split('.')[0]] += self_us / len(runs) / 1e6
+            self_times[module] = dict(
+                sorted(per_package.items(), key=lambda x: x[1], reverse=True)
+            )
+            
+            print(f"  ✓ {module}: {import_time:.3f}s")
         
         # Ordenar por tiempo
         sorted_times = sorted(
@@ -68,9 +234,12 @@ class PerformanceOptimizer:
         
         print(f"\n📊 Módulos más lentos:")
         for module, time_taken in sorted_times[:5]:
-            print(f"  {module}: {time_taken:.3f}s")
+            heaviest = list(self_times[module].items())[:3]
+            detail = ", ".join(f"{pkg} {t:.3f}s" for pkg, t in heaviest)
+            print(f"  {module}: {time_taken:.3f}s ({detail})")
         
         self.results['import_times'] = import_times
+        self.results['import_self_times'] = self_times
         return import_times
     
     def profile_database_operations(self) -> Dict[str, float]:
@@ -82,53 +251,137 @@ class PerformanceOptimizer:
         """
         print("\n🗄️ Perfilando operaciones de base de datos...")
         
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+        
         try:
+            from sqlalchemy import event
             from nueva_biblioteca.data.repository import Repository
             from nueva_biblioteca.data.models import Track, Playlist
             
             repo = Repository()
             operation_times = {}
             
-            # Test de creación de track
-            start = time.time()
-            track_data = {
-                "file_path": "/test/performance_test.mp3",
-                "title": "Performance Test Track",
-                "artist": "Test Artist",
-                "duration": 180.0
-            }
-            saved_track = repo.add_track(track_data)
-            operation_times['save_track'] = time.time() - start
+            # Contador de SELECT para detectar patrones N+1
+            statements = [0]
             
-            # Test de búsqueda
-            start = time.time()
-            found_tracks = repo.search_tracks("Performance")
-            operation_times['search_tracks'] = time.time() - start
+            def count_statement(conn, cursor, statement, *args) -> None:
+                if statement.lstrip().upper().startswith("SELECT"):
+                    statements[0] += 1
             
-            # Test de obtener todos los tracks
-            start = time.time()
-            all_tracks = repo.get_all_tracks()
-            operation_times['get_all_tracks'] = time.time() - start
+            event.listen(repo.engine, "before_cursor_execute", count_statement)
             
-            # Test de creación de playlist
-            start = time.time()
-            saved_playlist = repo.create_playlist(
-                name="Performance Test Playlist",
-                description="Test playlist for performance"
-            )
-            if saved_track and saved_playlist:
-                repo.add_track_to_playlist(saved_playlist.id, saved_track.id)
-            operation_times['save_playlist'] = time.time() - start
+            # Todas las operaciones comparten una transacción (un solo
+            # COMMIT); cada una se cronometra por separado
+            with repo.transaction():
+                # Test de creación de track
+                start = _t()
+                track_data = {
+                    "file_path": "/test/performance_test.mp3",
+                    "title": "Performance Test Track",
+                    "artist": "Test Artist",
+                    "duration": 180.0
+                }
+                saved_track = repo.add_track(track_data)
+                operation_times['save_track'] = (_t() - start) / 1e9
+                
+                # Test de búsqueda (índice FTS5 y, para comparar, LIKE)
+                start = _t()
+                found_tracks = repo.search_tracks("Performance")
+                operation_times['search_tracks'] = (_t() - start) / 1e9
+                
+                if repo.fts_enabled:
+                    repo.fts_enabled = False
+                    try:
+                        start = _t()
+                        repo.search_tracks("Performance")
+                        operation_times['search_tracks_like'] = (_t() - start) / 1e9
+                    finally:
+                        repo.fts_enabled = True
+                
+                # Test de obtener todos los tracks
+                start = _t()
+                all_tracks = repo.get_all_tracks()
+                operation_times['get_all_tracks'] = (_t() - start) / 1e9
+                
+                # Test de creación de playlist
+                start = _t()
+                saved_playlist = repo.create_playlist(
+                    name="Performance Test Playlist",
+                    description="Test playlist for performance"
+                )
+                if saved_track and saved_playlist:
+                    repo.add_track_to_playlist(saved_playlist.id, saved_track.id)
+                operation_times['save_playlist'] = (_t() - start) / 1e9
+                
+                # Listados con relaciones: el número de consultas no debe
+                # crecer con el número de filas
+                query_counts = {}
+                for name, operation in [
+                    ('get_all_playlists', repo.get_all_playlists),
+                    (
+                        'get_all_tracks_with_playlists',
+                        lambda: repo.get_all_tracks(include_playlists=True)
+                    ),
+                ]:
+                    before = statements[0]
+                    start = _t()
+                    operation()
+                    operation_times[name] = (_t() - start) / 1e9
+                    query_counts[name] = statements[0] - before
+                
+                # Limpiar datos de test
+                if saved_playlist:
+                    repo.delete_playlist(saved_playlist.id)
+                if saved_track:
+                    repo.delete_track(saved_track.id)
             
-            # Limpiar datos de test
-            if saved_playlist:
-                repo.delete_playlist(saved_playlist.id)
-            if saved_track:
-                repo.delete_track(saved_track.id)
+            event.remove(repo.engine, "before_cursor_execute", count_statement)
+            
+            # Inserción por objeto ORM frente a INSERT por lotes (Core), en
+            # una base temporal para no tocar la biblioteca del usuario
+            rows = [
+                {
+                    "file_path": f"/test/track_{i}.mp3",
+                    "title": f"Track {i}",
+                    "artist": "Test Artist"
+                }
+                for i in range(BULK_INSERT_ROWS)
+            ]
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                bench = Repository(str(Path(tmp_dir) / "orm.db"))
+                start = _t()
+                with bench.transaction():
+                    for row in rows:
+                        bench.add_track(row)
+                operation_times['insert_orm'] = (_t() - start) / 1e9
+                bench.engine.dispose()
+                
+                bench = Repository(str(Path(tmp_dir) / "bulk.db"))
+                start = _t()
+                bench.add_tracks(rows)
+                operation_times['insert_bulk'] = (_t() - start) / 1e9
+                bench.engine.dispose()
             
             for operation, time_taken in operation_times.items():
                 print(f"  ✓ {operation}: {time_taken:.3f}s")
             
+            for operation, count in query_counts.items():
+                if count > MAX_QUERIES_PER_LISTING:
+                    print(f"  ⚠ {operation}: {count} consultas (posible N+1)")
+                else:
+                    print(f"  ✓ {operation}: {count} consultas")
+            self.results['db_query_counts'] = query_counts
+            
+            # Verificar la configuración efectiva de SQLite
+            pragmas = repo.get_pragmas()
+            print(f"  📊 journal_mode: {pragmas['journal_mode']}")
+            self.results['db_pragmas'] = pragmas
+            
+            pool_status = repo.get_pool_status()
+            print(f"  📊 Pool: {pool_status}")
+            self.results['db_pool_status'] = pool_status
+            
             self.results['db_operations'] = operation_times
             return operation_times
             
@@ -136,79 +389,150 @@ class PerformanceOptimizer:
             print(f"  ✗ Error en operaciones de DB: {e}")
             return {}
     
-    def analyze_memory_usage(self) -> Dict[str, float]:
+    def _memory_workload(self) -> None:
+        """Carga los módulos del paquete en este proceso."""
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+        
+        for module in self.modules:
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                print(f"  ⚠ {module}: {e}")
+    
+    def analyze_memory_usage(
+        self,
+        workload: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
         """
         Analiza el uso de memoria.
         
+        Mide con tracemalloc las asignaciones del heap de Python hechas
+        por ``workload`` (por defecto, cargar los módulos del paquete).
+        Las instantáneas se toman solo al inicio y al final para no
+        ralentizar la ejecución medida. El RSS del sistema operativo se
+        conserva como métrica secundaria.
+        
+        Args:
+            workload: Función cuyo consumo de memoria se mide
+            
         Returns:
             Diccionario con métricas de memoria
         """
         print("\n🧠 Analizando uso de memoria...")
         
-        process = psutil.Process()
-        memory_info = process.memory_info()
+        workload = workload or self._memory_workload
+        
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        
+        try:
+            workload()
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            if started:
+                tracemalloc.stop()
+        
+        top_allocations = [
+            str(stat)
+            for stat in snapshot.compare_to(baseline, 'lineno')[:20]
+        ]
         
         memory_metrics = {
-            'rss_mb': memory_info.rss / 1024 / 1024,  # Resident Set Size
-            'vms_mb': memory_info.vms / 1024 / 1024,  # Virtual Memory Size
-            'percent': process.memory_percent(),
+            'traced_current_mb': current / 1024 / 1024,
+            'traced_peak_mb': peak / 1024 / 1024,
+            'top_allocations': top_allocations,
         }
         
-        print(f"  📊 Memoria RSS: {memory_metrics['rss_mb']:.1f} MB")
-        print(f"  📊 Memoria Virtual: {memory_metrics['vms_mb']:.1f} MB")
-        print(f"  📊 Porcentaje del sistema: {memory_metrics['percent']:.1f}%")
+        # Pico de RSS del proceso según el SO (proxy de la memoria real);
+        # ru_maxrss está en KiB en Linux y en bytes en macOS
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == 'darwin':
+                max_rss /= 1024
+            memory_metrics['max_rss_mb'] = max_rss / 1024
+        
+        # Métricas adicionales solo si psutil está instalado
+        if psutil is not None:
+            process = psutil.Process()
+            memory_info = process.memory_info()
+            memory_metrics['rss_mb'] = memory_info.rss / 1024 / 1024
+            memory_metrics['vms_mb'] = memory_info.vms / 1024 / 1024
+            memory_metrics['percent'] = process.memory_percent()
+        
+        print(f"  📊 Memoria asignada (tracemalloc): {memory_metrics['traced_current_mb']:.1f} MB")
+        print(f"  📊 Pico de memoria (tracemalloc): {memory_metrics['traced_peak_mb']:.1f} MB")
+        if 'max_rss_mb' in memory_metrics:
+            print(f"  📊 Pico RSS del SO (proxy): {memory_metrics['max_rss_mb']:.1f} MB")
+        if 'rss_mb' in memory_metrics:
+            print(f"  📊 OS RSS (proxy): {memory_metrics['rss_mb']:.1f} MB")
+            print(f"  📊 Memoria Virtual: {memory_metrics['vms_mb']:.1f} MB")
+            print(f"  📊 Porcentaje del sistema: {memory_metrics['percent']:.1f}%")
         
         self.results['memory'] = memory_metrics
         return memory_metrics
     
-    def profile_critical_functions(self) -> str:
+    def profile_critical_functions(self, workload: Optional[str] = None) -> str:
         """
-        Perfila funciones críticas usando cProfile.
+        Perfila una carga de trabajo real usando cProfile.
+        
+        Ejecuta con pytest los tests marcados ``perf_sample`` (consultas
+        reales a la base de datos) en lugar de microbenchmarks sintéticos.
         
+        Args:
+            workload: Ruta de tests a ejecutar o None para usar WORKLOAD_DIR
+            
         Returns:
             Reporte de perfilado
         """
         print("\n⚡ Perfilando funciones críticas...")
         
-        def test_critical_operations():
-            """Función que ejecuta operaciones críticas para perfilar."""
-            try:
-                # Test de configuración
-                from nueva_biblioteca.utils.config import get_config
-                config = get_config()
-                
-                # Test de logging
-                from nueva_biblioteca.utils.logger import get_logger
-                logger = get_logger(__name__)
-                logger.info("Test de rendimiento")
-                
-                # Test de modelos
-                from nueva_biblioteca.data.models import Track
-                for i in range(100):
-                    track = Track(
-                        file_path=f"/test/track_{i}.mp3",
-                        title=f"Track {i}",
-                        artist="Test Artist"
-                    )
-                
-            except Exception as e:
-                print(f"Error en operaciones críticas: {e}")
+        import pytest
+        
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+        
+        args = [
+            "-q",
+            "-m", "perf_sample",
+            "-o", "addopts=",        # Sin cobertura: distorsiona el perfil
+            "-p", "no:cacheprovider",
+            workload or str(WORKLOAD_DIR)
+        ]
         
         # Ejecutar perfilado
         profiler = cProfile.Profile()
-        profiler.enable()
-        test_critical_operations()
-        profiler.disable()
+        exit_code = profiler.runcall(pytest.main, args)
+        if exit_code != 0:
+            print(f"  ⚠ La carga de trabajo terminó con código {exit_code}")
         
-        # Generar reporte
+        # Generar reporte; tottime destaca las funciones hoja costosas
         stream = io.StringIO()
         stats = pstats.Stats(profiler, stream=stream)
-        stats.sort_stats('cumulative')
-        stats.print_stats(20)  # Top 20 funciones
+        stats.sort_stats('tottime')
+        stats.print_stats(PROFILE_TOP_N)
         
         profile_report = stream.getvalue()
         print("  ✓ Perfilado completado")
         
+        # Filas principales en formato estructurado para el reporte JSON
+        functions = stats.get_stats_profile().func_profiles
+        self.results['profile_top'] = [
+            {
+                'function': name,
+                'location': f"{func.file_name}:{func.line_number}",
+                'ncalls': func.ncalls,
+                'tottime': func.tottime,
+                'cumtime': func.cumtime,
+            }
+            for name, func in sorted(
+                functions.items(), key=lambda x: x[1].tottime, reverse=True
+            )[:PROFILE_TOP_N]
+        ]
         self.results['profile_report'] = profile_report
         return profile_report
     
@@ -245,20 +569,29 @@ class PerformanceOptimizer:
                     f"🗄️ Optimizar operaciones de DB: {', '.join([k for k, v in slow_ops])}"
                 )
         
+        # Detectar listados con consultas por fila (N+1)
+        if 'db_query_counts' in self.results:
+            n_plus_one = [
+                k for k, v in self.results['db_query_counts'].items()
+                if v > MAX_QUERIES_PER_LISTING
+            ]
+            if n_plus_one:
+                recommendations.append(
+                    f"🔁 Cargar relaciones con selectinload (N+1): {', '.join(n_plus_one)}"
+                )
+        
         # Analizar memoria
         if 'memory' in self.results:
-            if self.results['memory']['rss_mb'] > 100:
+            if self.results['memory']['traced_peak_mb'] > 100:
                 recommendations.append(
-                    "🧠 Considerar optimización de memoria (>100MB en uso)"
+                    "🧠 Considerar optimización de memoria (>100MB asignados)"
                 )
         
         # Recomendaciones generales
         recommendations.extend([
             "⚡ Implementar lazy loading para módulos pesados",
             "🔄 Agregar caché para operaciones repetitivas",
-            "📦 Considerar usar SQLite con WAL mode para mejor concurrencia",
-            "🎯 Implementar índices en columnas de búsqueda frecuente",
-            "🚀 Usar connection pooling para operaciones de DB intensivas"
+            "🎯 Implementar índices en columnas de búsqueda frecuente"
         ])
         
         for i, rec in enumerate(recommendations, 1):
@@ -274,9 +607,10 @@ class PerformanceOptimizer:
         Args:
             output_file: Archivo donde guardar el reporte
         """
-        total_time = time.time() - self.start_time
+        total_time = (_t() - self._start_ns) / 1e9
         
-        report = f"""# Reporte de Rendimiento - Nueva Biblioteca
+        buf = io.StringIO()
+        buf.write(f"""# Reporte de Rendimiento - Nueva Biblioteca
 
 ## Resumen Ejecutivo
 - **Tiempo total de análisis:** {total_time:.2f}s
@@ -285,56 +619,218 @@ class PerformanceOptimizer:
 ## Métricas de Rendimiento
 
 ### Tiempos de Importación
-"""
+""")
         
         if 'import_times' in self.results:
             for module, time_taken in self.results['import_times'].items():
                 if time_taken > 0:
-                    report += f"- `{module}`: {time_taken:.3f}s\n"
+                    buf.write(f"- `{module}`: {time_taken:.3f}s\n")
         
-        report += "\n### Operaciones de Base de Datos\n"
+        buf.write("\n### Operaciones de Base de Datos\n")
         if 'db_operations' in self.results:
             for operation, time_taken in self.results['db_operations'].items():
-                report += f"- `{operation}`: {time_taken:.3f}s\n"
+                buf.write(f"- `{operation}`: {time_taken:.3f}s\n")
         
-        report += "\n### Uso de Memoria\n"
+        if 'db_query_counts' in self.results:
+            for operation, count in self.results['db_query_counts'].items():
+                buf.write(f"- `{operation}`: {count} consultas SQL\n")
+        
+        if 'db_pragmas' in self.results:
+            pragmas = ", ".join(
+                f"{k}={v}" for k, v in self.results['db_pragmas'].items()
+            )
+            buf.write(f"- **PRAGMAs SQLite:** {pragmas}\n")
+        
+        if 'db_pool_status' in self.results:
+            buf.write(f"- **Pool de conexiones:** {self.results['db_pool_status']}\n")
+        
+        buf.write("\n### Uso de Memoria\n")
         if 'memory' in self.results:
             memory = self.results['memory']
-            report += f"- **RSS:** {memory['rss_mb']:.1f} MB\n"
-            report += f"- **Virtual:** {memory['vms_mb']:.1f} MB\n"
-            report += f"- **Porcentaje del sistema:** {memory['percent']:.1f}%\n"
-        
-        report += "\n## Recomendaciones de Optimización\n"
+            buf.write(f"- **Asignada (tracemalloc):** {memory['traced_current_mb']:.1f} MB\n")
+            buf.write(f"- **Pico (tracemalloc):** {memory['traced_peak_mb']:.1f} MB\n")
+            if 'max_rss_mb' in memory:
+                buf.write(f"- **Pico RSS del SO (proxy):** {memory['max_rss_mb']:.1f} MB\n")
+            if 'rss_mb' in memory:
+                buf.write(f"- **OS RSS (proxy):** {memory['rss_mb']:.1f} MB\n")
+                buf.write(f"- **Virtual:** {memory['vms_mb']:.1f} MB\n")
+                buf.write(f"- **Porcentaje del sistema:** {memory['percent']:.1f}%\n")
+            if memory['top_allocations']:
+                buf.write("\n#### Mayores asignaciones\n```\n")
+                buf.write("\n".join(memory['top_allocations']))
+                buf.write("\n```\n")
+        
+        buf.write("\n## Recomendaciones de Optimización\n")
         if 'recommendations' in self.results:
             for i, rec in enumerate(self.results['recommendations'], 1):
-                report += f"{i}. {rec}\n"
+                buf.write(f"{i}. {rec}\n")
         
         if 'profile_report' in self.results:
-            report += f"\n## Reporte de Perfilado\n```\n{self.results['profile_report']}\n```\n"
+            buf.write(f"\n## Reporte de Perfilado\n```\n{self.results['profile_report']}\n```\n")
         
-        Path(output_file).write_text(report)
+        Path(output_file).write_text(buf.getvalue())
         print(f"\n📄 Reporte guardado en: {output_file}")
+        
+        # Resultados legibles por máquina para comparar ejecuciones en CI;
+        # el perfil en texto ya está resumido en profile_top
+        json_file = Path(output_file).with_suffix('.json')
+        results = {k: v for k, v in self.results.items() if k != 'profile_report'}
+        json_file.write_text(json.dumps(results, default=str, indent=2))
+        print(f"📄 Resultados guardados en: {json_file}")
     
-    def run_full_analysis(self) -> None:
-        """Ejecuta análisis completo de rendimiento."""
+    def run_full_analysis(
+        self,
+        workload: Optional[str] = None,
+        output_file: str = "performance_report.md"
+    ) -> None:
+        """
+        Ejecuta análisis completo de rendimiento.
+        
+        Args:
+            workload: Ruta de tests a perfilar o None para usar WORKLOAD_DIR
+            output_file: Archivo donde guardar el reporte
+        """
         print("🚀 Iniciando análisis completo de rendimiento...\n")
         
         self.analyze_imports()
         self.profile_database_operations()
         self.analyze_memory_usage()
-        self.profile_critical_functions()
+        self.profile_critical_functions(workload)
         self.generate_optimization_recommendations()
-        self.save_report()
+        self.save_report(output_file)
         
-        total_time = time.time() - self.start_time
+        total_time = (_t() - self._start_ns) / 1e9
         print(f"\n✅ Análisis completado en {total_time:.2f}s")
 
 
-def main():
-    """Función principal."""
-    optimizer = PerformanceOptimizer()
-    optimizer.run_full_analysis()
+def _flatten_metrics(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """
+    Aplana los resultados a métricas numéricas con claves punteadas.
+    
+    Args:
+        data: Diccionario de resultados
+        prefix: Prefijo de las claves
+        
+    Returns:
+        Diccionario {métrica: valor}
+    """
+    metrics = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(_flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = float(value)
+    return metrics
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline_file: str,
+    threshold: float = REGRESSION_THRESHOLD
+) -> bool:
+    """
+    Compara los resultados actuales con un reporte JSON anterior.
+    
+    Args:
+        current: Resultados de la ejecución actual
+        baseline_file: Reporte JSON de referencia
+        threshold: Factor máximo admitido respecto a la referencia
+        
+    Returns:
+        True si ninguna métrica supera la referencia por el factor dado
+    """
+    reference_results = json.loads(Path(baseline_file).read_text())
+    baseline = _flatten_metrics(
+        {k: v for k, v in reference_results.items() if k in COMPARED_METRICS}
+    )
+    metrics = _flatten_metrics(
+        {k: v for k, v in current.items() if k in COMPARED_METRICS}
+    )
+    
+    print(f"\n📈 Comparación con {baseline_file}:")
+    regressions = 0
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if reference is None or reference <= 0 or value < 0:
+            continue
+        
+        delta = (value - reference) / reference * 100
+        if value > reference * threshold:
+            regressions += 1
+            print(f"  ⚠ {name}: {reference:.3f} → {value:.3f} ({delta:+.1f}%)")
+        else:
+            print(f"  ✓ {name}: {reference:.3f} → {value:.3f} ({delta:+.1f}%)")
+    
+    if regressions:
+        print(f"\n✗ {regressions} métricas empeoraron más de {threshold:.2f}x")
+    return regressions == 0
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parsea los argumentos de línea de comandos.
+    
+    Returns:
+        Argumentos parseados
+    """
+    parser = argparse.ArgumentParser(description="Analiza el rendimiento")
+    parser.add_argument(
+        "--workload",
+        help="Ruta de tests perf_sample a perfilar (por defecto tests/perf)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="performance_report.md",
+        help="Reporte Markdown; los resultados JSON se guardan junto a él"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE_JSON",
+        help="Reporte JSON anterior con el que comparar las métricas"
+    )
+    parser.add_argument(
+        "--refresh-modules",
+        action="store_true",
+        help="Regenerar la lista de módulos del paquete antes de analizar"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="Factor que se considera regresión al comparar (por defecto 1.2)"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """
+    Función principal.
+    
+    Returns:
+        0 si todo fue exitoso, 1 si hay regresiones respecto a la referencia
+        o falta la lista de módulos
+    """
+    args = parse_args()
+    if args.refresh_modules:
+        from _gen_module_list import generate_module_list
+        modules = generate_module_list()
+    else:
+        try:
+            modules = load_module_list()
+        except FileNotFoundError as e:
+            print(f"✗ {e}")
+            return 1
+    
+    optimizer = PerformanceOptimizer(modules)
+    optimizer.run_full_analysis(args.workload, args.output)
+    
+    if args.compare and not compare_results(
+        optimizer.results, args.compare, args.threshold
+    ):
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
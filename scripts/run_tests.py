@@ -8,15 +8,28 @@ usando pytest, generando reportes de cobertura y resultados.
 
 from typing import List, Optional, Dict, Any
 from pathlib import Path
+import importlib.util
 import subprocess
 import json
 import sys
 import os
 
+# Entorno del proceso, copiado una sola vez al cargar el módulo
+_BASE_ENV = os.environ.copy()
+
+# Nombre de importación de las distribuciones cuyo nombre no coincide
+IMPORT_NAMES = {
+    "pytest-cov": "pytest_cov",
+    "pytest-mock": "pytest_mock",
+    "pytest-asyncio": "pytest_asyncio",
+}
+
 def run_command(command: List[str], env: Optional[Dict[str, str]] = None) -> bool:
     """
     Ejecuta un comando del sistema.
     
+    La salida se muestra en tiempo real, línea a línea.
+    
     Args:
         command: Lista con el comando y sus argumentos
         env: Variables de entorno adicionales
@@ -24,21 +37,26 @@ def run_command(command: List[str], env: Optional[Dict[str, str]] = None) -> boo
     Returns:
         True si el comando fue exitoso
     """
-    try:
-        full_env = os.environ.copy()
-        if env:
-            full_env.update(env)
-        
-        subprocess.run(
-            command,
-            env=full_env,
-            check=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
+    full_env = {**_BASE_ENV, **env} if env else _BASE_ENV
+    
+    with subprocess.Popen(
+        command,
+        env=full_env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            sys.stdout.write(line)
+        returncode = process.wait()
+    
+    if returncode != 0:
         print(f"Error ejecutando {' '.join(command)}:", file=sys.stderr)
-        print(f"Código de salida: {e.returncode}", file=sys.stderr)
+        print(f"Código de salida: {returncode}", file=sys.stderr)
         return False
+    return True
 
 def create_test_env() -> Dict[str, str]:
     """
@@ -148,12 +166,12 @@ def check_dependencies() -> bool:
     ]
     
     for package in required:
-        try:
-            __import__(package.replace("-", "_"))
-            print(f"✓ {package}")
-        except ImportError:
+        # Solo se localiza el módulo, sin ejecutar su código
+        module = IMPORT_NAMES.get(package, package.replace("-", "_"))
+        if importlib.util.find_spec(module) is None:
             print(f"✗ Falta {package}")
             return False
+        print(f"✓ {package}")
     
     return True
 
@@ -3,11 +3,13 @@
 Script de configuración para Nueva Biblioteca.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from pathlib import Path
+import functools
 import os
 import re
 
+from packaging.markers import InvalidMarker, Marker
 from setuptools import setup, find_packages
 
 def read(fname: str) -> str:
@@ -22,7 +24,8 @@ def get_version() -> str:
         return version_match.group(1)
     raise RuntimeError("Versión no encontrada")
 
-def parse_requirements(filename: str) -> List[str]:
+@functools.lru_cache(maxsize=None)
+def parse_requirements(filename: str) -> Tuple[List[str], Dict[str, List[str]]]:
     """
     Parsea un archivo de requerimientos.
     
@@ -30,7 +33,7 @@ def parse_requirements(filename: str) -> List[str]:
         filename: Nombre del archivo
         
     Returns:
-        Lista de requerimientos
+        Tupla (requerimientos base, requerimientos por extra)
     """
     requirements = []
     extras: Dict[str, List[str]] = {}
@@ -63,11 +66,12 @@ def parse_requirements(filename: str) -> List[str]:
         else:
             requirements.append(line)
     
-    return requirements
+    return requirements, extras
 
+@functools.lru_cache(maxsize=None)
 def _evaluate_marker(marker: str) -> bool:
     """
-    Evalúa un marcador de ambiente.
+    Evalúa un marcador de ambiente según PEP 508.
     
     Args:
         marker: Marcador a evaluar
@@ -75,19 +79,17 @@ def _evaluate_marker(marker: str) -> bool:
     Returns:
         True si el marcador se cumple
     """
-    import platform
-    
-    env = {
-        'sys_platform': platform.system().lower(),
-        'python_version': platform.python_version(),
-        'platform_machine': platform.machine().lower()
-    }
-    
     try:
-        return eval(marker, {'__builtins__': {}}, env)
-    except:
+        return Marker(marker).evaluate()
+    except InvalidMarker:
         return False
 
+# Extras publicados; "full" agrupa todos
+EXTRAS = ["dev", "docs", "performance", "gui", "audio"]
+
+# Parsear requirements.txt una sola vez
+_requirements, _extras = parse_requirements('requirements.txt')
+
 setup(
     name="nueva-biblioteca",
     version=get_version(),
@@ -124,17 +126,10 @@ setup(
     
     # Requerimientos
     python_requires=">=3.11",
-    install_requires=parse_requirements('requirements.txt'),
+    install_requires=_requirements,
     extras_require={
-        "dev": parse_requirements('requirements.txt')["dev"],
-        "docs": parse_requirements('requirements.txt')["docs"],
-        "performance": parse_requirements('requirements.txt')["performance"],
-        "gui": parse_requirements('requirements.txt')["gui"],
-        "audio": parse_requirements('requirements.txt')["audio"],
-        "full": [
-            dep for extra in ["dev", "docs", "performance", "gui", "audio"]
-            for dep in parse_requirements('requirements.txt')[extra]
-        ]
+        **{extra: _extras.get(extra, []) for extra in EXTRAS},
+        "full": [dep for extra in EXTRAS for dep in _extras.get(extra, [])]
     },
     
     # Metadatos
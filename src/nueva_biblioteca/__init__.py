@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Nueva Biblioteca
+=============
+
+Sistema de biblioteca musical con playlists inteligentes.
+
+Los componentes principales se exponen en el nivel superior del paquete
+pero se importan bajo demanda (PEP 562), de modo que ``import
+nueva_biblioteca`` no carga Qt, SQLAlchemy ni las librerías de audio.
+"""
+
+import importlib
+from typing import Any
+
+__version__ = "1.0.0"
+
+# Nombre público -> módulo que lo define
+_lazy_imports = {
+    "AudioAnalyzer": "nueva_biblioteca.core.audio_analyzer",
+    "FileScanner": "nueva_biblioteca.core.file_scanner",
+    "MetaDesigner": "nueva_biblioteca.core.meta_designer",
+    "MetadataManager": "nueva_biblioteca.core.metadata",
+    "PlayQueue": "nueva_biblioteca.core.play_queue",
+    "Player": "nueva_biblioteca.core.player",
+    "Recommender": "nueva_biblioteca.core.recommender",
+    "Track": "nueva_biblioteca.data.models",
+    "Playlist": "nueva_biblioteca.data.models",
+    "Repository": "nueva_biblioteca.data.repository",
+    "get_repository": "nueva_biblioteca.data.repository",
+    "AppConfig": "nueva_biblioteca.utils.config",
+    "get_config": "nueva_biblioteca.utils.config",
+    "get_logger": "nueva_biblioteca.utils.logger",
+    "MainWindow": "nueva_biblioteca.ui.main_window",
+}
+
+# Literal para que las herramientas estáticas vean los nombres; debe
+# coincidir con las claves de _lazy_imports
+__all__ = [
+    "AppConfig",
+    "AudioAnalyzer",
+    "FileScanner",
+    "MainWindow",
+    "MetaDesigner",
+    "MetadataManager",
+    "PlayQueue",
+    "Player",
+    "Playlist",
+    "Recommender",
+    "Repository",
+    "Track",
+    "__version__",
+    "get_config",
+    "get_logger",
+    "get_repository",
+]
+
+def __getattr__(name: str) -> Any:
+    """
+    Importa un componente público en el primer acceso.
+    
+    Args:
+        name: Nombre del atributo solicitado
+        
+    Returns:
+        Objeto exportado por el submódulo correspondiente
+    """
+    module_name = _lazy_imports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Accesos siguientes sin pasar por __getattr__
+    return value
+
+def __dir__() -> list[str]:
+    """Incluye los componentes diferidos en ``dir(nueva_biblioteca)``."""
+    return sorted([*globals(), *_lazy_imports])
@@ -7,25 +7,93 @@ Sistema para analizar características musicales de archivos de audio
 como BPM, energía, key, segmentos, etc.
 """
 
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import importlib.util
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from typing import Any
 
-try:
-    import essentia
-    import essentia.standard as es
-    ESSENTIA_AVAILABLE = True
-except ImportError:
-    ESSENTIA_AVAILABLE = False
-    essentia = None
-    es = None
 import numpy as np
 
 from nueva_biblioteca.utils.cache_manager import get_cache
+from nueva_biblioteca.utils.config import get_config
 from nueva_biblioteca.utils.logger import get_logger
 from nueva_biblioteca.utils.task_queue import get_task_queue
 
+# essentia es una extensión C pesada: solo se comprueba que esté instalada
+# y se importa al crear el primer AudioAnalyzer
+ESSENTIA_AVAILABLE = importlib.util.find_spec("essentia") is not None
+essentia = None
+es = None
+
 logger = get_logger(__name__)
 
+# Prefijos de los descriptores de tonalidad de MusicExtractor
+# (essentia >= 2.1b5 y versiones anteriores)
+_MUSIC_EXTRACTOR_KEY_PREFIXES = ('tonal.key_edma.', 'tonal.key_')
+
+# Notas ordenadas según el círculo de quintas
+_CIRCLE_OF_FIFTHS = (
+    'C', 'G', 'D', 'A', 'E', 'B', 'F#', 'C#', 'G#', 'D#', 'A#', 'F'
+)
+
+# Posición de cada nota en el círculo de quintas
+_CIRCLE_POSITION = {note: pos for pos, note in enumerate(_CIRCLE_OF_FIFTHS)}
+
+# Las 24 tonalidades ("C major", "C minor", "G major", ...) y su índice
+_KEY_NAMES = tuple(
+    f"{note} {scale}" for note in _CIRCLE_OF_FIFTHS for scale in ('major', 'minor')
+)
+_KEY_INDEX = {name: i for i, name in enumerate(_KEY_NAMES)}
+
+def _build_key_distances() -> np.ndarray:
+    """
+    Precalcula la distancia entre todas las parejas de tonalidades.
+    
+    Returns:
+        Matriz 24x24 con la distancia en el círculo de quintas más una
+        penalización de 3 por cambio de escala
+    """
+    positions = np.repeat(np.arange(12), 2)
+    scales = np.tile([0, 1], 12)
+    
+    steps = np.abs(positions[:, None] - positions[None, :])
+    distances = np.minimum(steps, 12 - steps)
+    distances += 3 * (scales[:, None] != scales[None, :])
+    return distances.astype(np.int8)
+
+_KEY_DISTANCES = _build_key_distances()
+
+# Frecuencia a la que MonoLoader remuestrea el audio a analizar
+ANALYSIS_SAMPLE_RATE = 44100
+
+# Huellas de contenido en memoria (las menos usadas se descartan)
+FINGERPRINT_CACHE_SIZE = 4096
+
+def _load_essentia() -> bool:
+    """
+    Importa essentia bajo demanda.
+    
+    Returns:
+        True si essentia quedó disponible
+    """
+    global essentia, es, ESSENTIA_AVAILABLE
+    if es is None and ESSENTIA_AVAILABLE:
+        try:
+            import essentia as _essentia
+            import essentia.standard as _es
+            essentia, es = _essentia, _es
+        except ImportError:
+            ESSENTIA_AVAILABLE = False
+    return ESSENTIA_AVAILABLE
+
 class AudioAnalyzer:
     """
     Analizador de características musicales.
@@ -38,19 +106,49 @@ class AudioAnalyzer:
     - Características espectrales
     """
     
-    def __init__(self, max_workers: int = 2):
+    def __init__(
+        self,
+        max_workers: int = 2,
+        use_cache: bool = True,
+        use_music_extractor: bool = False
+    ):
         """
         Inicializa el analizador.
         
         Args:
             max_workers: Máximo de workers concurrentes
+            use_cache: Consultar y guardar análisis en la caché. Los procesos
+                trabajadores de batch_analyze no la usan: lo hace el padre
+            use_music_extractor: Obtener BPM, tonalidad y bailabilidad de una
+                pasada de MusicExtractor. Calcula además todos sus demás
+                descriptores y no se ha medido frente a los algoritmos
+                específicos, que se usan por defecto
         """
         self.max_workers = max_workers
-        self.cache = get_cache()
-        self.task_queue = get_task_queue()
+        self.use_music_extractor = use_music_extractor
+        self.cache = get_cache() if use_cache else None
+        self.task_queue = get_task_queue() if use_cache else None
+        
+        # Algoritmos de essentia reutilizados entre archivos; no son
+        # thread-safe, así que cada hilo trabajador tiene los suyos
+        self._algorithms = threading.local()
+        
+        # Búfer de energías por hilo, reutilizado entre archivos
+        self._buffers = threading.local()
+        
+        # Executor y semáforo de analyze_async; se crean al primer uso
+        self._async_executor: ThreadPoolExecutor | None = None
+        self._async_semaphore: asyncio.Semaphore | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        
+        # Huellas de contenido por (ruta, tamaño, mtime_ns), como LRU acotada;
+        # batch_analyze calcula desde varios hilos, así que se usa con lock
+        self.fingerprint_chunk_size = get_config().files.fingerprint_chunk_size
+        self._fingerprints: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._fingerprints_lock = threading.Lock()
         
         # Configurar essentia si está disponible
-        if ESSENTIA_AVAILABLE:
+        if _load_essentia():
             essentia.init()
         else:
             logger.warning(
@@ -78,14 +176,14 @@ class AudioAnalyzer:
                 logger.warning("Essentia no disponible, retornando análisis vacío")
                 return {}
             
-            # Verificar caché
-            cache_key = f"analysis:{file_path}"
-            cached = self.cache.get(cache_key)
-            if cached:
-                return cached
-            
-            # Cargar archivo
-            audio = es.MonoLoader(filename=file_path)()
+            # Verificar caché (por contenido: sobrevive a renombrados y se
+            # invalida al editar el archivo)
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._fingerprint(file_path)
+                cached = self.cache.get(cache_key, namespace="analysis")
+                if cached:
+                    return cached
             
             # Características por defecto
             if features is None:
@@ -97,27 +195,41 @@ class AudioAnalyzer:
                     'segments'
                 ]
             
-            # Resultados
-            results = {}
+            # Resultados: primero, si se pidió, las características que
+            # MusicExtractor calcula en una sola pasada
+            results = (
+                self._extract_combined(file_path, features)
+                if self.use_music_extractor else {}
+            )
+            
+            # Cargar archivo solo si queda algo por calcular
+            pending = [f for f in features if f not in results]
+            audio = (
+                es.MonoLoader(filename=file_path, sampleRate=ANALYSIS_SAMPLE_RATE)()
+                if pending else None
+            )
             
             # Extraer cada característica solicitada
-            if 'bpm' in features:
+            if 'bpm' in pending:
                 results['bpm'] = self._extract_bpm(audio)
             
-            if 'key' in features:
+            if 'key' in pending:
                 results['key'] = self._extract_key(audio)
             
-            if 'energy' in features:
+            if 'energy' in pending:
                 results['energy'] = self._extract_energy(audio)
             
-            if 'danceability' in features:
+            if 'danceability' in pending:
                 results['danceability'] = self._extract_danceability(audio)
             
-            if 'segments' in features:
+            if 'segments' in pending:
                 results['segments'] = self._extract_segments(audio)
             
             # Cachear resultados
-            self.cache.set(cache_key, results, ttl=3600*24)  # 24 horas
+            if cache_key is not None:
+                self.cache.set(
+                    cache_key, results, ttl=3600*24, namespace="analysis"
+                )  # 24 horas
             
             return results
             
@@ -125,11 +237,117 @@ class AudioAnalyzer:
             logger.error(f"Error analizando {file_path}: {e}")
             return {}
     
+    def _extract_combined(
+        self,
+        file_path: str,
+        features: list[str]
+    ) -> dict[str, Any]:
+        """
+        Extrae BPM, tonalidad y bailabilidad con una pasada de MusicExtractor.
+        
+        Solo se usa si se piden al menos dos de ellas; las que no se puedan
+        leer del resultado se calculan después por separado.
+        
+        Args:
+            file_path: Ruta al archivo
+            features: Lista de características solicitadas
+            
+        Returns:
+            Diccionario con las características obtenidas
+        """
+        if sum(f in features for f in ('bpm', 'key', 'danceability')) < 2:
+            return {}
+        
+        try:
+            pool, _ = self._algorithm('MusicExtractor')(file_path)
+        except Exception as e:
+            logger.debug(f"MusicExtractor falló en {file_path}: {e}")
+            return {}
+        
+        results = {}
+        
+        if 'bpm' in features and pool.containsKey('rhythm.bpm'):
+            results['bpm'] = float(pool['rhythm.bpm'])
+        
+        if 'danceability' in features and pool.containsKey('rhythm.danceability'):
+            results['danceability'] = float(pool['rhythm.danceability'])
+        
+        if 'key' in features:
+            # El nombre de los descriptores cambia entre versiones
+            for prefix in _MUSIC_EXTRACTOR_KEY_PREFIXES:
+                if pool.containsKey(f"{prefix}key"):
+                    results['key'] = (
+                        f"{pool[f'{prefix}key']} {pool[f'{prefix}scale']}",
+                        float(pool[f'{prefix}strength'])
+                    )
+                    break
+        
+        return results
+    
+    def _algorithm(self, name: str) -> Any:
+        """
+        Obtiene un algoritmo de essentia.standard del hilo actual.
+        
+        Se construye la primera vez que el hilo lo pide y se reutiliza
+        en los archivos siguientes.
+        
+        Args:
+            name: Nombre del algoritmo (ej: "KeyExtractor")
+            
+        Returns:
+            Instancia del algoritmo
+        """
+        algorithm = getattr(self._algorithms, name, None)
+        if algorithm is None:
+            algorithm = getattr(es, name)()
+            setattr(self._algorithms, name, algorithm)
+        return algorithm
+    
+    def _fingerprint(self, file_path: str) -> str:
+        """
+        Calcula una huella del contenido de un archivo.
+        
+        Se resume el tamaño más el inicio y el final del archivo con
+        BLAKE2b, sin leerlo entero. Mientras tamaño y fecha de
+        modificación no cambien se reutiliza la huella ya calculada.
+        
+        Args:
+            file_path: Ruta al archivo
+            
+        Returns:
+            Huella hexadecimal
+        """
+        stat = os.stat(file_path)
+        stat_key = (file_path, stat.st_size, stat.st_mtime_ns)
+        
+        with self._fingerprints_lock:
+            fingerprint = self._fingerprints.get(stat_key)
+            if fingerprint is not None:
+                self._fingerprints.move_to_end(stat_key)
+                return fingerprint
+        
+        chunk = self.fingerprint_chunk_size
+        digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(chunk))
+            if stat.st_size > chunk:
+                f.seek(max(chunk, stat.st_size - chunk))
+                digest.update(f.read(chunk))
+        
+        fingerprint = digest.hexdigest()
+        with self._fingerprints_lock:
+            self._fingerprints[stat_key] = fingerprint
+            self._fingerprints.move_to_end(stat_key)
+            if len(self._fingerprints) > FINGERPRINT_CACHE_SIZE:
+                self._fingerprints.popitem(last=False)
+        return fingerprint
+    
     def batch_analyze(
         self,
         files: list[str],
         features: list[str] | None = None,
-        on_progress = None
+        on_progress = None,
+        use_processes: bool = False
     ) -> dict[str, dict[str, Any]]:
         """
         Analiza múltiples archivos en paralelo.
@@ -138,34 +356,155 @@ class AudioAnalyzer:
             files: Lista de archivos
             features: Lista de características
             on_progress: Callback de progreso
+            use_processes: Repartir el trabajo entre procesos en lugar de hilos.
+                Si el pool de procesos se rompe, el resto se analiza con hilos
             
         Returns:
             Diccionario con resultados por archivo
         """
         results = {}
         total = len(files)
+        done = 0
+        
+        def store(file_path: str, result: dict[str, Any]) -> None:
+            nonlocal done
+            results[file_path] = result
+            done += 1
+            
+            # Reportar progreso
+            if on_progress:
+                percentage = (done / total) * 100
+                on_progress(percentage, f"Analizando {done}/{total}")
+        
+        if use_processes:
+            try:
+                self._analyze_in_processes(files, features, store)
+                return results
+            except BrokenProcessPool as e:
+                # Los resultados llegan en orden: faltan los posteriores
+                logger.error(f"Pool de procesos roto, se sigue con hilos: {e}")
+                files = files[done:]
+        
+        # Repartir los archivos en lotes: una tarea por lote en lugar de
+        # una por archivo (ThreadPoolExecutor.map ignora chunksize)
+        chunksize = max(1, len(files) // (self.max_workers * 4))
+        chunks = [files[i:i + chunksize] for i in range(0, len(files), chunksize)]
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Crear tareas
-            futures = []
-            for file_path in files:
-                future = executor.submit(self.analyze_file, file_path, features)
-                futures.append((file_path, future))
-            
-            # Procesar resultados
-            for i, (file_path, future) in enumerate(futures, 1):
-                try:
-                    result = future.result()
-                    results[file_path] = result
-                except Exception as e:
-                    logger.error(f"Error en análisis de {file_path}: {e}")
-                    results[file_path] = {}
+            chunk_results = executor.map(
+                partial(self._analyze_chunk, features=features), chunks
+            )
+            
+            # Procesar resultados en orden
+            for chunk, analyses in zip(chunks, chunk_results, strict=True):
+                for file_path, result in zip(chunk, analyses, strict=True):
+                    store(file_path, result)
+        
+        return results
+    
+    def _analyze_in_processes(
+        self,
+        files: list[str],
+        features: list[str] | None,
+        store: Callable[[str, dict[str, Any]], None]
+    ) -> None:
+        """
+        Analiza archivos repartidos entre procesos trabajadores.
+        
+        Los trabajadores solo calculan; la caché se consulta y actualiza
+        aquí. Se arrancan con "spawn" para no heredar por fork los hilos
+        vivos del proceso padre.
+        
+        Args:
+            files: Lista de archivos
+            features: Lista de características
+            store: Recibe cada (archivo, resultado) en el orden de files
+            
+        Raises:
+            BrokenProcessPool: Si un proceso trabajador termina abruptamente
+        """
+        lookups = [self._lookup_cache(file_path) for file_path in files]
+        misses = [
+            file_path
+            for file_path, (_, cached) in zip(files, lookups, strict=True)
+            if not cached
+        ]
+        
+        # Repartir los archivos en lotes: una tarea por lote en lugar de
+        # una por archivo
+        chunksize = max(1, len(misses) // (self.max_workers * 4))
+        
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.use_music_extractor,)
+        ) as executor:
+            analyses = executor.map(
+                partial(_analyze_worker, features=features),
+                misses,
+                chunksize=chunksize
+            )
+            
+            # Procesar resultados en orden
+            for file_path, (cache_key, cached) in zip(files, lookups, strict=True):
+                if cached:
+                    store(file_path, cached)
+                    continue
                 
-                # Reportar progreso
-                if on_progress:
-                    percentage = (i / total) * 100
-                    on_progress(percentage, f"Analizando {i}/{total}")
+                result = next(analyses)
+                if result and cache_key is not None:
+                    self.cache.set(
+                        cache_key, result, ttl=3600*24, namespace="analysis"
+                    )  # 24 horas
+                store(file_path, result)
+    
+    def _lookup_cache(
+        self,
+        file_path: str
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        """
+        Busca el análisis de un archivo en la caché.
         
+        Args:
+            file_path: Ruta al archivo
+            
+        Returns:
+            Tupla (clave de caché o None si no se pudo leer, análisis o None)
+        """
+        if self.cache is None:
+            return None, None
+        
+        try:
+            cache_key = self._fingerprint(file_path)
+        except OSError as e:
+            logger.error(f"Error leyendo {file_path}: {e}")
+            return None, None
+        
+        return cache_key, self.cache.get(cache_key, namespace="analysis")
+    
+    def _analyze_chunk(
+        self,
+        files: list[str],
+        features: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Analiza un lote de archivos en el hilo actual.
+        
+        Args:
+            files: Lista de archivos
+            features: Lista de características
+            
+        Returns:
+            Resultados en el mismo orden que los archivos
+        """
+        results = []
+        for file_path in files:
+            try:
+                results.append(self.analyze_file(file_path, features))
+            except Exception as e:
+                logger.error(f"Error en análisis de {file_path}: {e}")
+                results.append({})
         return results
     
     def _extract_bpm(self, audio: np.ndarray) -> float:
@@ -178,7 +517,7 @@ class AudioAnalyzer:
         Returns:
             BPM detectado
         """
-        rhythm_extractor = es.RhythmExtractor2013()
+        rhythm_extractor = self._algorithm('RhythmExtractor2013')
         bpm, beats, confidence, _, _ = rhythm_extractor(audio)
         return float(bpm)
     
@@ -192,7 +531,7 @@ class AudioAnalyzer:
         Returns:
             Tupla (key, confianza)
         """
-        key_extractor = es.KeyExtractor()
+        key_extractor = self._algorithm('KeyExtractor')
         key, scale, confidence = key_extractor(audio)
         return f"{key} {scale}", float(confidence)
     
@@ -206,20 +545,47 @@ class AudioAnalyzer:
         Returns:
             Nivel de energía normalizado (0-1)
         """
-        energy = es.Energy()
         frame_size = 2048
         hop_size = 1024
         
-        energies = []
-        for frame in es.FrameGenerator(audio, frameSize=frame_size, hopSize=hop_size):
-            energies.append(energy(frame))
+        # MonoLoader ya entrega float32; solo se convierte si llega otro tipo
+        audio = np.asarray(audio, dtype=np.float32)
+        
+        # Señales más cortas que un frame se completan con ceros
+        if len(audio) < frame_size:
+            audio = np.pad(audio, (0, frame_size - len(audio)))
+        
+        # Vista de frames solapados sin copiar la señal; la energía de cada
+        # frame (suma de cuadrados) se calcula en una sola operación
+        frames = np.lib.stride_tricks.sliding_window_view(audio, frame_size)[::hop_size]
+        energies = self._energy_buffer(len(frames))
+        np.einsum('ij,ij->i', frames, frames, out=energies)
         
         # Normalizar a 0-1
-        energies = np.array(energies)
-        if len(energies) > 0:
-            return float(np.mean(energies) / np.max(energies))
+        peak = energies.max()
+        if peak > 0:
+            return float(energies.mean(dtype=np.float64) / peak)
         return 0.0
     
+    def _energy_buffer(self, size: int) -> np.ndarray:
+        """
+        Obtiene un búfer float32 de al menos size elementos del hilo actual.
+        
+        Solo se reserva memoria de nuevo cuando un archivo necesita más
+        frames que los anteriores.
+        
+        Args:
+            size: Número de elementos necesarios
+            
+        Returns:
+            Vista del búfer con exactamente size elementos
+        """
+        buffer = getattr(self._buffers, 'energy', None)
+        if buffer is None or len(buffer) < size:
+            buffer = np.empty(size, dtype=np.float32)
+            self._buffers.energy = buffer
+        return buffer[:size]
+    
     def _extract_danceability(self, audio: np.ndarray) -> float:
         """
         Estima la bailabilidad.
@@ -230,13 +596,14 @@ class AudioAnalyzer:
         Returns:
             Score de bailabilidad (0-1)
         """
-        danceability = es.Danceability()
+        danceability = self._algorithm('Danceability')
         return float(danceability(audio))
     
     def _extract_segments(
         self,
         audio: np.ndarray,
-        min_duration: float = 1.0
+        min_duration: float = 1.0,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE
     ) -> list[dict[str, Any]]:
         """
         Detecta segmentos musicales.
@@ -244,43 +611,42 @@ class AudioAnalyzer:
         Args:
             audio: Señal de audio
             min_duration: Duración mínima de segmento
+            sample_rate: Frecuencia de muestreo de la señal
             
         Returns:
             Lista de segmentos con timestamps
         """
         # Detector de novedades
-        novelty = es.NoveltyCurve()
+        novelty = self._algorithm('NoveltyCurve')
         novelty_curve = novelty(audio)
         
         # Detector de picos
-        peaks = es.PeakDetection()
+        peaks = self._algorithm('PeakDetection')
         peak_positions, peak_values = peaks(novelty_curve)
         
-        # Convertir a timestamps
-        sample_rate = 44100  # TODO: Obtener del archivo
-        segments = []
-        
-        for i, (pos, val) in enumerate(zip(peak_positions, peak_values, strict=False)):
-            start = float(pos) / sample_rate
-            
-            # Fin del segmento
-            if i < len(peak_positions) - 1:
-                end = float(peak_positions[i + 1]) / sample_rate
-            else:
-                end = float(len(audio)) / sample_rate
-            
-            duration = end - start
-            
-            # Filtrar segmentos muy cortos
-            if duration >= min_duration:
-                segments.append({
-                    'start': start,
-                    'end': end,
-                    'duration': duration,
-                    'confidence': float(val)
-                })
-        
-        return segments
+        # Convertir a timestamps de una vez: cada segmento termina donde
+        # empieza el siguiente y el último al final del audio
+        starts = np.asarray(peak_positions, dtype=np.float64) / sample_rate
+        if starts.size == 0:
+            return []
+        ends = np.append(starts[1:], len(audio) / sample_rate)
+        durations = ends - starts
+        confidences = np.asarray(peak_values, dtype=np.float64)
+        
+        # Filtrar segmentos muy cortos con una sola máscara sobre las cuatro
+        # columnas y pasar a floats de Python de una vez
+        rows = np.column_stack((starts, ends, durations, confidences))
+        rows = rows[durations >= min_duration].tolist()
+        
+        return [
+            {
+                'start': start,
+                'end': end,
+                'duration': duration,
+                'confidence': confidence
+            }
+            for start, end, duration, confidence in rows
+        ]
     
     def get_key_distance(self, key1: str, key2: str) -> int:
         """
@@ -293,19 +659,19 @@ class AudioAnalyzer:
         Returns:
             Distancia en pasos
         """
-        # Mapeo de notas a posiciones en círculo de quintas
-        circle = {
-            'C': 0, 'G': 1, 'D': 2, 'A': 3, 'E': 4, 'B': 5, 'F#': 6,
-            'C#': 7, 'G#': 8, 'D#': 9, 'A#': 10, 'F': 11
-        }
+        # Tonalidades estándar: consulta directa en la tabla precalculada
+        i = _KEY_INDEX.get(key1)
+        j = _KEY_INDEX.get(key2)
+        if i is not None and j is not None:
+            return int(_KEY_DISTANCES[i, j])
         
         # Extraer nota y escala
         note1, scale1 = key1.split()
         note2, scale2 = key2.split()
         
         # Convertir a posición en círculo
-        pos1 = circle.get(note1, 0)
-        pos2 = circle.get(note2, 0)
+        pos1 = _CIRCLE_POSITION.get(note1, 0)
+        pos2 = _CIRCLE_POSITION.get(note2, 0)
         
         # Calcular distancia menor
         distance = min(
@@ -334,21 +700,19 @@ class AudioAnalyzer:
         Returns:
             Lista de tonalidades compatibles
         """
-        result = []
-        
-        # Todas las posibles tonalidades
-        notes = ['C', 'G', 'D', 'A', 'E', 'B', 'F#', 'C#', 'G#', 'D#', 'A#', 'F']
-        scales = ['major', 'minor']
-        
-        for note in notes:
-            for scale in scales:
-                test_key = f"{note} {scale}"
-                distance = self.get_key_distance(key, test_key)
-                
-                if distance <= max_distance:
-                    result.append(test_key)
-        
-        return result
+        # Tonalidad estándar: filtrar su fila de la tabla de distancias
+        i = _KEY_INDEX.get(key)
+        if i is not None:
+            return [
+                _KEY_NAMES[j]
+                for j in np.flatnonzero(_KEY_DISTANCES[i] <= max_distance)
+            ]
+        
+        return [
+            test_key
+            for test_key in _KEY_NAMES
+            if self.get_key_distance(key, test_key) <= max_distance
+        ]
     
     def estimate_sections(
         self,
@@ -415,22 +779,77 @@ class AudioAnalyzer:
         Returns:
             Diccionario con resultados del análisis
         """
-        import asyncio
-        
-        # Ejecutar análisis en un thread pool
-        loop = asyncio.get_event_loop()
-        
         if hasattr(track, 'file_path'):
             file_path = track.file_path
         else:
             file_path = str(track)
         
-        return await loop.run_in_executor(
-            None, 
-            self.analyze_file, 
-            file_path, 
-            features
-        )
+        # Un executor propio acotado a max_workers en lugar del executor por
+        # defecto del loop, y un semáforo para que las llamadas concurrentes
+        # esperen turno sin acumular tareas en la cola del executor
+        loop = asyncio.get_running_loop()
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='audio-analyzer'
+            )
+        if self._async_loop is not loop:
+            # asyncio.Semaphore queda ligado al loop en el que se usa
+            self._async_semaphore = asyncio.Semaphore(self.max_workers)
+            self._async_loop = loop
+        
+        async with self._async_semaphore:
+            return await loop.run_in_executor(
+                self._async_executor,
+                self.analyze_file,
+                file_path,
+                features
+            )
+    
+    def close(self) -> None:
+        """Libera el executor usado por analyze_async."""
+        if self._async_executor is not None:
+            self._async_executor.shutdown(wait=True)
+            self._async_executor = None
+        self._async_semaphore = None
+        self._async_loop = None
+
+# Analizador propio de cada proceso trabajador de batch_analyze
+_worker_analyzer: AudioAnalyzer | None = None
+
+def _init_worker(use_music_extractor: bool = False) -> None:
+    """
+    Crea el analizador del proceso trabajador, sin caché ni cola de tareas.
+    
+    Args:
+        use_music_extractor: Opción del analizador del proceso padre
+    """
+    global _worker_analyzer
+    _worker_analyzer = AudioAnalyzer(
+        max_workers=1,
+        use_cache=False,
+        use_music_extractor=use_music_extractor
+    )
+
+def _analyze_worker(
+    file_path: str,
+    features: list[str] | None = None
+) -> dict[str, Any]:
+    """
+    Analiza un archivo dentro de un proceso trabajador.
+    
+    Args:
+        file_path: Ruta al archivo
+        features: Lista de características
+        
+    Returns:
+        Diccionario con resultados del análisis
+    """
+    try:
+        return _worker_analyzer.analyze_file(file_path, features)
+    except Exception as e:
+        logger.error(f"Error en análisis de {file_path}: {e}")
+        return {}
 
 # Instancia global
 _analyzer: AudioAnalyzer | None = None
@@ -9,8 +9,11 @@ y gestión optimizada de memoria.
 
 import logging
 import os
+import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 
 from nueva_biblioteca.utils.batch_processor import BatchProcessor, BatchProgress
@@ -18,6 +21,46 @@ from nueva_biblioteca.utils.config import get_config
 
 from .metadata import AudioMetadata, MetadataManager
 
+# Patrones de nombre de archivo, probados en orden (gana el primero):
+# "número - artista - título", "número - título", "artista - título"
+_FILENAME_RE = re.compile(
+    r'^(?:(?P<n1>\d+)\s*-\s*(?P<a1>.+?)\s*-\s*(?P<t1>.+)'
+    r'|(?P<n2>\d+)\s*-\s*(?P<t2>.+)'
+    r'|(?P<a3>.+?)\s*-\s*(?P<t3>.+))$'
+)
+
+@lru_cache(maxsize=65536)
+def _parse_stem(name: str) -> tuple[tuple[str, str], ...]:
+    """
+    Extrae número de pista, artista y título de un nombre sin extensión.
+    
+    Args:
+        name: Nombre del archivo sin extensión
+        
+    Returns:
+        Pares (campo, valor); se devuelve una tupla para poder cachearla
+    """
+    match = _FILENAME_RE.match(name)
+    if match is None:
+        # Si no coincide con ningún patrón, usar como título
+        return (('title', name),)
+    
+    groups = match.groupdict()
+    if groups['t1'] is not None:
+        return (
+            ('track_number', groups['n1']),
+            ('artist', groups['a1'].strip()),
+            ('title', groups['t1'].strip()),
+        )
+    if groups['t2'] is not None:
+        return (
+            ('track_number', groups['n2']),
+            ('title', groups['t2'].strip()),
+        )
+    return (
+        ('artist', groups['a3'].strip()),
+        ('title', groups['t3'].strip()),
+    )
 
 @dataclass
 class ScanProgress:
@@ -59,8 +102,10 @@ class FileScanner:
         
         self.repository = repository
         self.config = config or get_config()
-        self.metadata_manager = MetadataManager()
-        self._supported_formats = set(self.config.files.supported_formats)
+        self.metadata_manager = MetadataManager(
+            cache_path=getattr(self.config.files, 'metadata_cache', None)
+        )
+        self._extensions = self.config.files.extensions
         self._processed_files: set[str] = set()
         self._current_progress = ScanProgress()
         
@@ -72,7 +117,7 @@ class FileScanner:
         )
     
     async def scan_directory(
-        self, directory: str, recursive: bool = True
+        self, directory: str | Path, recursive: bool = True
     ) -> list[AudioMetadata]:
         """
         Escanea un directorio en busca de archivos de música.
@@ -89,22 +134,25 @@ class FileScanner:
             self._current_progress = ScanProgress()
             self._processed_files.clear()
             
-            # Obtener lista de archivos
-            music_files = self._find_music_files(directory, recursive)
-            total_files = len(music_files)
-            self._current_progress.total_files = total_files
-            
-            if total_files == 0:
-                logging.info(f"No se encontraron archivos de música en {directory}")
-                return []
+            # El raíz se lee ya aquí: un error dentro del generador lo
+            # consumiría BatchProcessor y el escaneo parecería vacío
+            files = self._iter_music_files(os.fspath(directory), recursive)
             
-            # Procesar archivos usando BatchProcessor
+            # Procesar archivos usando BatchProcessor a medida que se
+            # encuentran, sin materializar la lista completa
             results = await self.batch_processor.process_items(
-                items=music_files,
+                items=files,
                 process_func=self._process_file,
                 on_progress=self._update_progress
             )
             
+            self._current_progress.total_files = (
+                self.batch_processor.progress.total_items
+            )
+            if self._current_progress.total_files == 0:
+                logging.info(f"No se encontraron archivos de música en {directory}")
+                return []
+            
             # Filtrar None results
             valid_results = [r for r in results if r is not None]
             
@@ -119,39 +167,87 @@ class FileScanner:
             self._current_progress.errors.append(str(e))
             return []
     
-    def _find_music_files(self, directory: str, recursive: bool) -> list[str]:
-        """Encuentra todos los archivos de música en el directorio."""
-        music_files = []
+    def _iter_music_files(self, directory: str, recursive: bool) -> Iterator[str]:
+        """
+        Recorre el directorio en profundidad con os.scandir.
         
-        try:
-            if recursive:
-                for root, _, files in os.walk(directory):
-                    for file in files:
-                        if self._is_supported_file(file):
-                            music_files.append(os.path.join(root, file))
-            else:
-                for entry in os.scandir(directory):
-                    if entry.is_file() and self._is_supported_file(entry.name):
-                        music_files.append(entry.path)
-                        
-            return sorted(music_files)  # Ordenar para procesamiento predecible
+        Dentro de cada directorio las entradas se visitan ordenadas por
+        nombre, así el orden de procesamiento es predecible sin ordenar la
+        lista completa. Como os.walk, no se sigue enlaces simbólicos a
+        directorios y se omiten los subdirectorios ilegibles.
+        
+        El raíz se lee al llamar, no al empezar a iterar, para que su
+        error llegue al llamador.
+        
+        Args:
+            directory: Directorio raíz
+            recursive: Si debe entrar en subdirectorios
             
-        except Exception as e:
-            logging.error(f"Error buscando archivos: {e}")
-            self._current_progress.errors.append(str(e))
-            return []
+        Returns:
+            Iterador con la ruta de cada archivo de música encontrado
+            
+        Raises:
+            OSError: Si el directorio raíz no puede leerse
+        """
+        with os.scandir(directory) as it:
+            root = sorted(it, key=lambda e: e.name, reverse=True)
+        return self._walk_music_files(root, recursive)
+    
+    def _walk_music_files(
+        self,
+        root: list[os.DirEntry],
+        recursive: bool
+    ) -> Iterator[str]:
+        """
+        Genera los archivos de música a partir de las entradas del raíz.
+        
+        Args:
+            root: Entradas del raíz en orden inverso de nombre
+            recursive: Si debe entrar en subdirectorios
+            
+        Yields:
+            Ruta de cada archivo de música encontrado
+        """
+        # Pila de directorios pendientes
+        stack = [root]
+        
+        while stack:
+            entries = stack[-1]
+            if not entries:
+                stack.pop()
+                continue
+            
+            entry = entries.pop()
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            
+            if not is_dir:
+                if self._is_supported_file(entry.name):
+                    yield entry.path
+            elif recursive and not entry.is_symlink():
+                try:
+                    with os.scandir(entry.path) as it:
+                        stack.append(sorted(it, key=lambda e: e.name, reverse=True))
+                except OSError:
+                    continue
     
     def _is_supported_file(self, filename: str) -> bool:
         """Verifica si un archivo tiene una extensión soportada."""
-        return Path(filename).suffix.lower() in self._supported_formats
+        # Mismo criterio que Path.suffix (un nombre que empieza por el punto
+        # no tiene extensión), sin construir un Path por archivo
+        stem, _, ext = filename.rpartition('.')
+        return bool(stem) and ext.lower() in self._extensions
     
-    async def _process_file(self, file_path: str) -> AudioMetadata | None:
+    def _process_file(self, file_path: str) -> AudioMetadata | None:
         """Procesa un archivo individual."""
         try:
             self._current_progress.current_file = file_path
             
-            # Extraer metadatos
-            metadata = self.metadata_manager.extract_metadata(file_path)
+            # Un solo stat por archivo; sirve también de clave de la caché
+            st = os.stat(file_path)
+            metadata = self.metadata_manager.extract_metadata(file_path, st)
             
             if metadata:
                 self._processed_files.add(file_path)
@@ -165,6 +261,8 @@ class FileScanner:
     
     def _update_progress(self, batch_progress: BatchProgress) -> None:
         """Actualiza el progreso del escaneo desde el progreso del batch."""
+        # El total crece mientras se recorre el directorio
+        self._current_progress.total_files = batch_progress.total_items
         self._current_progress.processed_files = batch_progress.processed_items
         if batch_progress.current_item:
             self._current_progress.current_file = batch_progress.current_item
@@ -194,13 +292,11 @@ class FileScanner:
         Returns:
             Lista de rutas de archivos de audio
         """
-        audio_files = []
         try:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if self._is_supported_file(file):
-                        audio_files.append(Path(root) / file)
-            return sorted(audio_files)
+            return sorted(
+                Path(file_path)
+                for file_path in self._iter_music_files(os.fspath(directory), True)
+            )
         except Exception as e:
             logging.error(f"Error buscando archivos de audio: {e}")
             return []
@@ -215,44 +311,17 @@ class FileScanner:
         Returns:
             Diccionario con información extraída
         """
-        import re
-        
-        # Remover extensión
-        name = Path(filename).stem
-        info = {}
-        
-        # Patrón: número - artista - título
-        pattern1 = r'^(\d+)\s*-\s*(.+?)\s*-\s*(.+)$'
-        match = re.match(pattern1, name)
-        if match:
-            info['track_number'] = match.group(1)
-            info['artist'] = match.group(2).strip()
-            info['title'] = match.group(3).strip()
-            return info
-        
-        # Patrón: número - título
-        pattern2 = r'^(\d+)\s*-\s*(.+)$'
-        match = re.match(pattern2, name)
-        if match:
-            info['track_number'] = match.group(1)
-            info['title'] = match.group(2).strip()
-            return info
-        
-        # Patrón: artista - título
-        pattern3 = r'^(.+?)\s*-\s*(.+)$'
-        match = re.match(pattern3, name)
-        if match:
-            info['artist'] = match.group(1).strip()
-            info['title'] = match.group(2).strip()
-            return info
-        
-        # Si no coincide con ningún patrón, usar como título
-        info['title'] = name
-        return info
+        # Se parsea el nombre sin extensión; copia para no mutar la caché
+        return dict(_parse_stem(Path(filename).stem))
     
-    def scan_directory(self, directory: Path, recursive: bool = True) -> list:
+    def scan_directory_sync(
+        self, directory: str | Path, recursive: bool = True
+    ) -> list:
         """
-        Escanea directorio y retorna lista de tracks (versión síncrona para tests).
+        Escanea un directorio y retorna la lista de tracks (versión síncrona).
+        
+        Recorre el árbol una sola vez con el mismo generador que
+        scan_directory, sin construir antes la lista de archivos.
         
         Args:
             directory: Directorio a escanear
@@ -265,17 +334,20 @@ class FileScanner:
         
         tracks = []
         try:
-            audio_files = self.find_audio_files(directory)
-            
-            for file_path in audio_files:
+            for file_path in self._iter_music_files(os.fspath(directory), recursive):
                 try:
-                    # Extraer metadatos
-                    metadata = self.metadata_manager.extract_metadata(str(file_path))
+                    # Extraer metadatos (un solo stat, reutilizado por la caché)
+                    metadata = self.metadata_manager.extract_metadata(
+                        file_path, os.stat(file_path)
+                    )
                     if metadata:
                         # Crear track desde metadatos
                         track = Track(
-                            file_path=str(file_path),
-                            title=metadata.title or self.parse_filename(file_path.name)['title'],
+                            file_path=file_path,
+                            title=(
+                                metadata.title
+                                or self.parse_filename(os.path.basename(file_path))['title']
+                            ),
                             artist=metadata.artist,
                             album=metadata.album,
                             year=metadata.year,
@@ -287,13 +359,12 @@ class FileScanner:
                             channels=metadata.channels,
                             bpm=metadata.bpm,
                             key=metadata.key,
-                            energy=metadata.energy,
                             file_size=metadata.file_size
                         )
                         
                         # Inferir artista desde la estructura de directorios si no está disponible
                         if not track.artist:
-                            parts = file_path.parts
+                            parts = Path(file_path).parts
                             if len(parts) >= 2:
                                 track.artist = parts[-3]  # Directorio del artista
                         
@@ -319,16 +390,18 @@ class FileScanner:
             on_finished: Callback de finalización
         """
         try:
-            tracks = self.scan_directory(directory)
+            tracks = self.scan_directory_sync(directory)
             
             if self.repository:
-                for i, track in enumerate(tracks):
-                    try:
-                        self.repository.save_track(track)
-                        if on_progress:
-                            on_progress(i + 1, len(tracks), track.file_path)
-                    except Exception as e:
-                        logging.error(f"Error guardando track {track.file_path}: {e}")
+                # Guardar por lotes; el progreso se reporta tras cada lote
+                def on_batch(processed: int, batch: list) -> None:
+                    if on_progress:
+                        on_progress(processed, len(tracks), batch[-1].file_path)
+                
+                try:
+                    self.repository.save_tracks(tracks, on_batch=on_batch)
+                except Exception as e:
+                    logging.error(f"Error guardando tracks: {e}")
             
             if on_finished:
                 on_finished(len(tracks))
@@ -9,9 +9,13 @@ con templates y transformaciones automáticas.
 
 import contextlib
 import re
-from collections.abc import Callable
-from dataclasses import dataclass
+import time
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from functools import lru_cache, partial
+from itertools import count
 from typing import Any
 
 from nueva_biblioteca.utils.cache_manager import get_cache
@@ -21,7 +25,78 @@ from .metadata import MetadataManager
 
 logger = get_logger(__name__)
 
-@dataclass
+# Cambios conservados en el historial; los más antiguos se descartan
+HISTORY_SIZE = 1000
+
+# Selecciones de reglas compiladas en caché (las menos usadas se descartan)
+COMPILED_RULES_CACHE_SIZE = 64
+
+# Centinela para claves ausentes (distinto de cualquier valor, incluido None)
+_MISSING = object()
+
+# Condiciones y acciones admitidas en MetaRule
+_VALID_CONDITIONS = frozenset({"any", "equals", "contains"})
+_VALID_ACTIONS = frozenset({"normalize", "replace", "format"})
+
+# Paréntesis y su contenido, ej: "(Remastered 2011)"
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+
+# Grupos con nombre y referencias a ellos en los patrones de los templates
+_GROUP_NAME_RE = re.compile(r"\(\?P(<|=)(\w+)")
+
+# Construcciones que no sobreviven a la combinación de patrones: referencias
+# numéricas (los números cambian) y flags globales (solo valen al inicio)
+_UNCOMBINABLE_RE = re.compile(r"\\[1-9]|^\(\?[aiLmsux]+\)")
+
+# Siglas que la capitalización conserva tal cual; el resto de palabras en
+# mayúsculas se normaliza ("LED ZEPPELIN" -> "Led Zeppelin")
+_ACRONYMS = frozenset({
+    "ABBA", "AC/DC", "BB", "DJ", "EP", "II", "III", "INXS", "IV", "KISS",
+    "LP", "MC", "MGMT", "R.E.M.", "REM", "TV", "UB40", "UK", "USA", "VI"
+})
+
+# Separadores dentro de una palabra ("jay-z", "ac/dc"), conservados al dividir
+_WORD_PART_RE = re.compile(r"([-/])")
+
+# Textos capitalizados en caché: artistas y álbumes se repiten mucho
+CAPITALIZE_CACHE_SIZE = 4096
+
+def _capitalize_part(part: str) -> str:
+    # Saltar la puntuación inicial ("(live" -> "(Live"); si lo primero es
+    # un dígito no hay inicial que capitalizar ("80s" queda "80s")
+    for i, char in enumerate(part):
+        if char.isalnum():
+            if not char.isalpha():
+                return part.lower()
+            return part[:i] + part[i:].capitalize()
+    return part
+
+def _capitalize_word(word: str) -> str:
+    if word in _ACRONYMS:
+        return word
+    if word.isalpha():
+        return word.capitalize()
+    if "-" in word or "/" in word:
+        return "".join(map(_capitalize_part, _WORD_PART_RE.split(word)))
+    return _capitalize_part(word)
+
+@lru_cache(maxsize=CAPITALIZE_CACHE_SIZE)
+def _capitalize_words(text: str) -> str:
+    """
+    Pone en mayúscula la primera letra de cada palabra y el resto en minúscula.
+    
+    A diferencia de str.title(), solo los espacios, "-" y "/" separan
+    palabras: "don't" queda "Don't" (no "Don'T") y "80s" no pasa a "80S".
+    La puntuación inicial se salta ("(live)" -> "(Live)", "jay-z" ->
+    "Jay-Z") y las siglas de _ACRONYMS ("AC/DC") no se modifican.
+    """
+    # Solo letras y espacios, sin siglas posibles (todo en minúsculas o ya
+    # capitalizado): str.title() da el mismo resultado, sin bucle en Python
+    if text.replace(" ", "").isalpha() and (text.islower() or text.istitle()):
+        return text.title()
+    return " ".join([_capitalize_word(word) for word in text.split(" ")])
+
+@dataclass(slots=True)
 class MetaTemplate:
     """Template para transformación de metadatos."""
     name: str
@@ -29,8 +104,13 @@ class MetaTemplate:
     fields: dict[str, str]  # Mapeo de grupos a campos
     transformers: dict[str, Callable]  # Funciones de transformación por campo
     enabled: bool = True
+    compiled: re.Pattern = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Compilar una vez; apply_template usa el patrón compilado
+        self.compiled = re.compile(self.pattern)
 
-@dataclass
+@dataclass(slots=True)
 class MetaRule:
     """Regla de transformación de metadatos."""
     field: str
@@ -61,8 +141,31 @@ class MetaDesigner:
         self.templates: dict[str, MetaTemplate] = self._load_default_templates()
         self.rules: dict[str, MetaRule] = self._load_default_rules()
         
-        # Historial de cambios
-        self.history: list[dict[str, Any]] = []
+        # Reglas compiladas por selección de nombres (None = todas), junto a
+        # la versión de las reglas con la que se compilaron. add_rule,
+        # update_rule y remove_rule incrementan la versión; los cambios hechos
+        # a mano en self.rules no se detectan
+        self._rules_version = 0
+        self._compiled_rules: OrderedDict[
+            frozenset[str] | None,
+            tuple[int, tuple[tuple[str, Callable[[Any], Any]], ...]]
+        ] = OrderedDict()
+        
+        # Templates habilitados combinados en un único patrón, junto a los
+        # templates con los que se construyó: se reconstruye en cuanto cambia
+        # cuáles están habilitados o su patrón, aunque sea a mano
+        self._template_db_key: tuple | None = None
+        self._template_db: tuple[
+            re.Pattern | None,
+            dict[str, tuple[str, MetaTemplate]],
+            tuple[tuple[str, MetaTemplate], ...]
+        ] | None = None
+        
+        # Historial de cambios (búfer circular de los últimos HISTORY_SIZE)
+        self.history: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+        
+        # Secuencia para los IDs de las reglas agregadas con add_rule
+        self._rule_ids = count()
     
     def _load_default_templates(self) -> dict[str, MetaTemplate]:
         """Carga los templates predefinidos."""
@@ -155,26 +258,136 @@ class MetaDesigner:
                 return None
             
             # Aplicar regex
-            match = re.match(template.pattern, filename)
+            match = template.compiled.match(filename)
             if not match:
                 return None
             
-            # Extraer y transformar campos
-            result = {}
+            return self._extract_fields(template, match)
+            
+        except Exception as e:
+            logger.error(f"Error aplicando template {template_name}: {e}")
+            return None
+    
+    def apply_any_template(
+        self,
+        filename: str
+    ) -> tuple[str, dict[str, Any]] | None:
+        """
+        Aplica el primer template habilitado que coincida con el nombre.
+        
+        Equivale a llamar a apply_template con cada template en orden, pero
+        los patrones se prueban en una sola llamada al motor de regex sobre
+        una alternancia precompilada.
+        
+        Args:
+            filename: Nombre del archivo
             
-            for group, field in template.fields.items():
-                value = match.group(group)
-                if value and group in template.transformers:
-                    with contextlib.suppress(Exception):
-                        value = template.transformers[group](value)
-                result[field] = value
+        Returns:
+            Tupla (nombre del template, metadatos extraídos) o None
+        """
+        try:
+            combined, branches, sequential = self._get_template_db()
             
-            return result
+            if combined is not None:
+                match = combined.match(filename)
+                if match:
+                    # El grupo externo de la rama es el último en cerrarse
+                    name, template = branches[match.lastgroup]
+                    return name, self._extract_fields(
+                        template, match, prefix=f"{match.lastgroup}_"
+                    )
+            
+            for name, template in sequential:
+                match = template.compiled.match(filename)
+                if match:
+                    return name, self._extract_fields(template, match)
+            
+            return None
             
         except Exception as e:
-            logger.error(f"Error aplicando template {template_name}: {e}")
+            logger.error(f"Error aplicando templates a {filename}: {e}")
             return None
     
+    def _get_template_db(self) -> tuple[
+        re.Pattern | None,
+        dict[str, tuple[str, MetaTemplate]],
+        tuple[tuple[str, MetaTemplate], ...]
+    ]:
+        """
+        Combina los templates habilitados en un único patrón compilado.
+        
+        Cada template pasa a ser una rama "(?P<tN>...)" con sus grupos
+        renombrados a "tN_<grupo>". La alternancia prueba las ramas en el
+        orden de self.templates, igual que hacerlo template a template.
+        Los templates que no pueden combinarse se prueban aparte.
+        
+        Returns:
+            Tupla (patrón combinado o None, rama -> (nombre, template),
+            templates a probar uno a uno)
+        """
+        enabled = [
+            (name, template) for name, template in self.templates.items()
+            if template.enabled
+        ]
+        key = tuple(
+            (name, id(template), template.pattern) for name, template in enabled
+        )
+        if self._template_db is not None and key == self._template_db_key:
+            return self._template_db
+        
+        parts = []
+        branches = {}
+        sequential = []
+        
+        for name, template in enabled:
+            # Los que no se combinan van después, así que a partir del
+            # primero también el resto, para respetar el orden
+            if sequential or _UNCOMBINABLE_RE.search(template.pattern):
+                sequential.append((name, template))
+                continue
+            
+            branch = f"t{len(parts)}"
+            pattern = _GROUP_NAME_RE.sub(
+                lambda m, b=branch: f"(?P{m.group(1)}{b}_{m.group(2)}",
+                template.pattern
+            )
+            parts.append(f"(?P<{branch}>{pattern})")
+            branches[branch] = (name, template)
+        
+        combined = re.compile("|".join(parts)) if parts else None
+        
+        self._template_db_key = key
+        self._template_db = (combined, branches, tuple(sequential))
+        return self._template_db
+    
+    def _extract_fields(
+        self,
+        template: MetaTemplate,
+        match: re.Match,
+        prefix: str = ""
+    ) -> dict[str, Any]:
+        """
+        Extrae y transforma los campos de un template ya coincidente.
+        
+        Args:
+            template: Template aplicado
+            match: Coincidencia del patrón
+            prefix: Prefijo de los grupos en un patrón combinado
+            
+        Returns:
+            Diccionario con metadatos extraídos
+        """
+        result = {}
+        
+        for group, field_name in template.fields.items():
+            value = match.group(prefix + group)
+            if value and group in template.transformers:
+                with contextlib.suppress(Exception):
+                    value = template.transformers[group](value)
+            result[field_name] = value
+        
+        return result
+    
     def apply_rules(
         self,
         metadata: dict[str, Any],
@@ -193,48 +406,9 @@ class MetaDesigner:
         try:
             result = metadata.copy()
             
-            # Filtrar reglas a aplicar
-            rules_to_apply = []
-            for name, rule in self.rules.items():
-                if rule.enabled and (
-                    not rule_names or name in rule_names
-                ):
-                    rules_to_apply.append(rule)
-            
-            # Aplicar cada regla
-            for rule in rules_to_apply:
-                if rule.field not in result:
-                    continue
-                
-                value = result[rule.field]
-                
-                # Verificar condición
-                if rule.condition == "any" or (
-                    rule.condition == "equals" and value == rule.value
-                ) or (
-                    rule.condition == "contains" and 
-                    isinstance(value, str) and
-                    str(rule.value) in value
-                ):
-                    # Aplicar acción
-                    if rule.action == "normalize":
-                        value = self._normalize_value(
-                            value,
-                            **rule.parameters
-                        )
-                    
-                    elif rule.action == "replace":
-                        if isinstance(value, str):
-                            value = value.replace(
-                                rule.parameters.get("old", ""),
-                                rule.parameters.get("new", "")
-                            )
-                    
-                    elif rule.action == "format":
-                        if isinstance(value, int | float):
-                            value = rule.parameters.get("format", "{}").format(value)
-                    
-                    result[rule.field] = value
+            for field_name, apply in self._get_compiled_rules(rule_names):
+                if field_name in result:
+                    result[field_name] = apply(result[field_name])
             
             return result
             
@@ -242,16 +416,160 @@ class MetaDesigner:
             logger.error(f"Error aplicando reglas: {e}")
             return metadata
     
+    def apply_rules_batch(
+        self,
+        metadata_list: list[dict[str, Any]],
+        rule_names: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Aplica reglas de transformación a muchos metadatos a la vez.
+        
+        Equivale a llamar a apply_rules con cada elemento, pero procesa
+        columna a columna y transforma cada valor distinto una sola vez:
+        en una biblioteca los artistas (y muchos títulos) se repiten.
+        
+        Args:
+            metadata_list: Lista de metadatos originales
+            rule_names: Lista de reglas a aplicar o None para todas
+            
+        Returns:
+            Lista de metadatos transformados, en el mismo orden
+        """
+        try:
+            results = [metadata.copy() for metadata in metadata_list]
+            
+            for field_name, apply in self._get_compiled_rules(rule_names):
+                # Resultados por valor de entrada dentro de esta regla; el tipo
+                # forma parte de la clave porque 1, 1.0 y True son iguales
+                memo: dict[tuple[type, Any], Any] = {}
+                
+                for result in results:
+                    if field_name not in result:
+                        continue
+                    
+                    value = result[field_name]
+                    key = (type(value), value)
+                    try:
+                        transformed = memo[key]
+                    except KeyError:
+                        transformed = memo[key] = apply(value)
+                    except TypeError:
+                        # Valor no hashable (ej: lista de géneros)
+                        transformed = apply(value)
+                    result[field_name] = transformed
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error aplicando reglas en lote: {e}")
+            return [
+                self.apply_rules(metadata, rule_names) for metadata in metadata_list
+            ]
+    
+    def _get_compiled_rules(
+        self,
+        rule_names: list[str] | None
+    ) -> tuple[tuple[str, Callable[[Any], Any]], ...]:
+        """
+        Obtiene las reglas activas a aplicar, ya compiladas.
+        
+        Args:
+            rule_names: Lista de reglas a aplicar o None para todas
+            
+        Returns:
+            Pares (campo, función) en el orden de definición de las reglas
+        """
+        key = frozenset(rule_names) if rule_names else None
+        
+        cached = self._compiled_rules.get(key)
+        if cached is not None and cached[0] == self._rules_version:
+            self._compiled_rules.move_to_end(key)
+            return cached[1]
+        
+        compiled = tuple(
+            (rule.field, self._compile_rule(rule))
+            for name, rule in self.rules.items()
+            if rule.enabled and (key is None or name in key)
+        )
+        self._compiled_rules[key] = (self._rules_version, compiled)
+        self._compiled_rules.move_to_end(key)
+        if len(self._compiled_rules) > COMPILED_RULES_CACHE_SIZE:
+            self._compiled_rules.popitem(last=False)
+        return compiled
+    
+    def _compile_rule(self, rule: MetaRule) -> Callable[[Any], Any]:
+        """
+        Convierte una regla en una función valor -> valor transformado.
+        
+        La condición y la acción se resuelven una sola vez aquí, no en
+        cada llamada a apply_rules.
+        
+        Args:
+            rule: Regla a compilar
+            
+        Returns:
+            Función que aplica la regla a un valor
+        """
+        # Acción
+        if rule.action == "normalize":
+            # Listas de prefijos/sufijos como tuplas para startswith/endswith
+            parameters = {
+                name: tuple(value) if isinstance(value, list) else value
+                for name, value in rule.parameters.items()
+            }
+            action = partial(self._normalize_value, **parameters)
+        
+        elif rule.action == "replace":
+            old = rule.parameters.get("old", "")
+            new = rule.parameters.get("new", "")
+            
+            def action(value: Any) -> Any:
+                return value.replace(old, new) if isinstance(value, str) else value
+        
+        elif rule.action == "format":
+            template = rule.parameters.get("format", "{}")
+            
+            def action(value: Any) -> Any:
+                if isinstance(value, int | float):
+                    return template.format(value)
+                return value
+        
+        else:
+            def action(value: Any) -> Any:
+                return value
+        
+        # Condición
+        if rule.condition == "any":
+            return action
+        
+        if rule.condition == "equals":
+            expected = rule.value
+            return lambda value: action(value) if value == expected else value
+        
+        if rule.condition == "contains":
+            needle = str(rule.value)
+            return lambda value: (
+                action(value) if isinstance(value, str) and needle in value else value
+            )
+        
+        return lambda value: value
+    
     def _normalize_value(
         self,
         value: Any,
         capitalize: bool = False,
-        remove_prefixes: list[str] | None = None,
-        remove_suffixes: list[str] | None = None,
+        remove_prefixes: Sequence[str] | None = None,
+        remove_suffixes: Sequence[str] | None = None,
         remove_parentheses: bool = False,
         clean_spaces: bool = False
     ) -> Any:
-        """Normaliza un valor según parámetros."""
+        """
+        Normaliza un valor según parámetros.
+        
+        Cada paso usa métodos de str o regex (implementados en C); recorrer
+        el texto carácter a carácter en Python para hacerlo en una sola
+        pasada resulta más lento.
+        """
         if not isinstance(value, str):
             return value
         
@@ -261,27 +579,33 @@ class MetaDesigner:
         if clean_spaces:
             result = " ".join(result.split())
         
-        # Remover prefijos
+        # Remover prefijos; startswith con una tupla descarta en una sola
+        # llamada los valores sin ninguno (tuple() no copia si ya es tupla)
         if remove_prefixes:
-            for prefix in remove_prefixes:
-                if result.startswith(prefix):
-                    result = result[len(prefix):]
-                    break
+            prefixes = tuple(remove_prefixes)
+            if result.startswith(prefixes):
+                for prefix in prefixes:
+                    if result.startswith(prefix):
+                        result = result[len(prefix):]
+                        break
         
         # Remover sufijos
         if remove_suffixes:
-            for suffix in remove_suffixes:
-                if result.endswith(suffix):
-                    result = result[:-len(suffix)]
-                    break
+            suffixes = tuple(remove_suffixes)
+            if result.endswith(suffixes):
+                for suffix in suffixes:
+                    if result.endswith(suffix):
+                        result = result[:-len(suffix)]
+                        break
         
-        # Remover paréntesis y contenido
-        if remove_parentheses:
-            result = re.sub(r"\([^)]*\)", "", result)
+        # Remover paréntesis y contenido (la mayoría de valores no tiene:
+        # la comprobación con "in" evita entrar en el motor de regex)
+        if remove_parentheses and "(" in result:
+            result = _PARENTHESES_RE.sub("", result)
         
         # Capitalizar
         if capitalize:
-            result = result.title()
+            result = _capitalize_words(result)
         
         return result.strip()
     
@@ -299,8 +623,8 @@ class MetaDesigner:
             if not template.name:
                 return False
             
-            # Validar regex
-            re.compile(template.pattern)
+            # Validar regex (y recompilar por si pattern cambió tras crearlo)
+            template.compiled = re.compile(template.pattern)
             
             # Validar campos y transformers
             for group in template.fields.values():
@@ -333,23 +657,76 @@ class MetaDesigner:
                 return False
             
             # Validar condición
-            if rule.condition not in ["any", "equals", "contains"]:
+            if rule.condition not in _VALID_CONDITIONS:
                 return False
             
             # Validar acción
-            if rule.action not in ["normalize", "replace", "format"]:
+            if rule.action not in _VALID_ACTIONS:
                 return False
             
             # Generar ID único
-            rule_id = f"{rule.field}_{rule.action}_{datetime.now(tz=UTC).timestamp()}"
+            rule_id = f"{rule.field}_{rule.action}_{next(self._rule_ids)}"
             
             self.rules[rule_id] = rule
+            self._rules_version += 1
             return True
             
         except Exception as e:
             logger.error(f"Error agregando regla: {e}")
             return False
     
+    def update_rule(self, rule_id: str, **changes: Any) -> bool:
+        """
+        Modifica los campos de una regla existente.
+        
+        Args:
+            rule_id: ID de la regla
+            **changes: Nuevos valores por campo (ej: enabled=False)
+            
+        Returns:
+            True si se modificó correctamente
+        """
+        try:
+            rule = self.rules.get(rule_id)
+            if rule is None:
+                return False
+            
+            # Validar campos, condición y acción antes de modificar nada
+            if not changes.keys() <= set(MetaRule.__dataclass_fields__):
+                return False
+            
+            if changes.get("condition", rule.condition) not in _VALID_CONDITIONS:
+                return False
+            
+            if changes.get("action", rule.action) not in _VALID_ACTIONS:
+                return False
+            
+            for name, value in changes.items():
+                setattr(rule, name, value)
+            
+            self._rules_version += 1
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error modificando regla {rule_id}: {e}")
+            return False
+    
+    def remove_rule(self, rule_id: str) -> bool:
+        """
+        Elimina una regla.
+        
+        Args:
+            rule_id: ID de la regla
+            
+        Returns:
+            True si se eliminó
+        """
+        if self.rules.pop(rule_id, None) is None:
+            return False
+        
+        self._rules_version += 1
+        return True
+    
     def analyze_consistency(
         self,
         metadata_list: list[dict[str, Any]]
@@ -357,6 +734,11 @@ class MetaDesigner:
         """
         Analiza la consistencia de metadatos.
         
+        Se recorre la lista fila a fila una sola vez. Pasarla antes a
+        columnas (arrays de NumPy de tipo object) no compensa: construir
+        las columnas ya exige una pasada Python por cada campo, y vacío /
+        único dependen de str(valor), que no se vectoriza.
+        
         Args:
             metadata_list: Lista de metadatos a analizar
             
@@ -370,48 +752,47 @@ class MetaDesigner:
                 "problems": []
             }
             
-            # Analizar cada campo
-            all_fields = set()
-            for metadata in metadata_list:
-                all_fields.update(metadata.keys())
+            # Una sola pasada: contadores por campo según aparecen
+            field_stats: dict[str, dict[str, Any]] = defaultdict(
+                lambda: {"present": 0, "empty": 0, "values": set()}
+            )
             
-            for field in all_fields:
-                field_stats = {
-                    "present": 0,
-                    "empty": 0,
-                    "values": set()
-                }
-                
-                for metadata in metadata_list:
-                    value = metadata.get(field)
+            for metadata in metadata_list:
+                for field, value in metadata.items():
+                    current = field_stats[field]
                     
                     if value is not None:
-                        field_stats["present"] += 1
-                        if str(value).strip():
-                            field_stats["values"].add(str(value))
+                        current["present"] += 1
+                        text = str(value)
+                        if text.strip():
+                            # Solo interesa cuántos hay: guardar el hash
+                            # (64 bits) en lugar de retener cada texto
+                            current["values"].add(hash(text))
                         else:
-                            field_stats["empty"] += 1
-                
+                            current["empty"] += 1
+            
+            total = len(metadata_list)
+            for field, current in field_stats.items():
                 stats["fields"][field] = {
-                    "present": field_stats["present"],
-                    "empty": field_stats["empty"],
-                    "unique_values": len(field_stats["values"]),
-                    "completeness": field_stats["present"] / len(metadata_list)
+                    "present": current["present"],
+                    "empty": current["empty"],
+                    "unique_values": len(current["values"]),
+                    "completeness": current["present"] / total
                 }
                 
                 # Detectar problemas
-                if field_stats["empty"] > 0:
+                if current["empty"] > 0:
                     stats["problems"].append({
                         "type": "empty_values",
                         "field": field,
-                        "count": field_stats["empty"]
+                        "count": current["empty"]
                     })
                 
-                if field_stats["present"] < len(metadata_list):
+                if current["present"] < total:
                     stats["problems"].append({
                         "type": "missing_field",
                         "field": field,
-                        "count": len(metadata_list) - field_stats["present"]
+                        "count": total - current["present"]
                     })
             
             return stats
@@ -439,24 +820,49 @@ class MetaDesigner:
             source: Fuente del cambio
         """
         try:
+            # Una sola búsqueda por clave; las ausentes comparan con _MISSING
+            original_get = original.get
+            changes = {
+                k: v for k, v in modified.items()
+                if original_get(k, _MISSING) != v
+            }
+            
+            # Se copian los diccionarios: el llamador puede seguir modificándolos
             self.history.append({
-                "timestamp": datetime.now(tz=UTC).isoformat(),
+                # Entero en ns; get_history lo formatea solo al leerlo
+                "timestamp_ns": time.time_ns(),
                 "source": source,
                 "original": original.copy(),
                 "modified": modified.copy(),
-                "changes": {
-                    k: modified[k]
-                    for k in modified
-                    if k not in original or original[k] != modified[k]
-                }
+                "changes": changes
             })
             
-            # Limitar tamaño del historial
-            if len(self.history) > 1000:
-                self.history = self.history[-1000:]
-                
         except Exception as e:
             logger.error(f"Error guardando historial: {e}")
+    
+    def get_history(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        Obtiene el historial con la fecha de cada cambio en formato ISO.
+        
+        Args:
+            limit: Número máximo de cambios, los más recientes (None = todos)
+            
+        Returns:
+            Lista de cambios, del más antiguo al más reciente
+        """
+        entries = list(self.history)
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        
+        return [
+            {
+                **entry,
+                "timestamp": datetime.fromtimestamp(
+                    entry["timestamp_ns"] / 1e9, tz=UTC
+                ).isoformat()
+            }
+            for entry in entries
+        ]
 
 # Instancia global
 _meta_designer: MetaDesigner | None = None
@@ -9,10 +9,15 @@ usando mutagen y otras bibliotecas especializadas.
 
 import contextlib
 import logging
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from pathlib import Path
-from typing import ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import mutagen
 from mutagen.easyid3 import EasyID3
@@ -20,8 +25,30 @@ from mutagen.flac import FLAC
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
-@dataclass
+# Entradas de metadatos que cada MetadataManager mantiene en memoria; las
+# menos usadas se descartan (siguen en la caché persistente si la hay)
+METADATA_CACHE_SIZE = 4096
+
+# Máximo de hilos de batch_update
+BATCH_UPDATE_WORKERS = 32
+
+# Versión del formato de la caché persistente (PRAGMA user_version); se
+# incrementa al cambiar AudioMetadata para descartar entradas antiguas
+METADATA_CACHE_VERSION = 2
+
+def _suffix(file_path: str) -> str:
+    """
+    Obtiene la extensión en minúsculas de una ruta (ej: ".mp3").
+    
+    Equivale a Path(file_path).suffix.lower() para las extensiones
+    soportadas, sin construir un Path por archivo.
+    """
+    return os.path.splitext(file_path)[1].lower()
+
+@dataclass(slots=True)
 class AudioMetadata:
     """Representa los metadatos de un archivo de audio."""
     # Información básica
@@ -66,35 +93,182 @@ class MetadataManager:
         '.ogg': (mutagen.File, None)
     }
     
-    def __init__(self):
-        """Inicializa el gestor de metadatos."""
-        self._cached_metadata = {}
+    def __init__(self, cache_path: str | None = None):
+        """
+        Inicializa el gestor de metadatos.
+        
+        Args:
+            cache_path: Ruta a la base SQLite donde persistir los metadatos
+                extraídos entre ejecuciones. Si es None, la caché es solo en memoria.
+        """
+        # file_path -> (st_size, st_mtime_ns, metadata), en orden de uso (LRU)
+        self._cached_metadata: OrderedDict[str, tuple[int, int, AudioMetadata]] = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+        self._cache_db: sqlite3.Connection | None = None
+        
+        if cache_path:
+            try:
+                self._cache_db = self._open_cache_db(cache_path)
+            except sqlite3.Error as e:
+                logging.warning(f"Caché de metadatos no disponible: {e}")
+        
+        # Lectores y escritores de tags por extensión, enlazados una sola vez;
+        # los formatos sin entrada solo aportan la información técnica
+        self._tag_extractors: dict[str, Callable[[Any, AudioMetadata], None]] = {
+            '.mp3': self._extract_mp3_tags,
+            '.flac': self._extract_flac_tags,
+            '.m4a': self._extract_mp4_tags,
+            '.mp4': self._extract_mp4_tags
+        }
+        self._tag_writers: dict[str, Callable[..., bool]] = {
+            '.mp3': self._update_mp3_tags,
+            '.flac': self._update_flac_tags,
+            '.m4a': self._update_mp4_tags,
+            '.mp4': self._update_mp4_tags
+        }
+    
+    @staticmethod
+    def _open_cache_db(cache_path: str) -> sqlite3.Connection:
+        """Abre (y crea si hace falta) la caché persistente de metadatos."""
+        cache_path = os.path.expanduser(cache_path)
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        
+        # El escaneo extrae desde varios hilos; el acceso se serializa con _cache_lock
+        conn = sqlite3.connect(cache_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        # Entradas serializadas con otra versión de AudioMetadata no se reutilizan
+        if conn.execute("PRAGMA user_version").fetchone()[0] != METADATA_CACHE_VERSION:
+            conn.execute("DROP TABLE IF EXISTS metadata_cache")
+            conn.execute(f"PRAGMA user_version={METADATA_CACHE_VERSION}")
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata_cache (
+                file_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        conn.commit()
+        return conn
+    
+    def _get_cached(self, file_path: str, st: os.stat_result) -> AudioMetadata | None:
+        """Devuelve los metadatos cacheados si el archivo no cambió desde entonces."""
+        with self._cache_lock:
+            entry = self._cached_metadata.get(file_path)
+            if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+                self._cached_metadata.move_to_end(file_path)
+                return entry[2]
+            
+            if self._cache_db is None:
+                return None
+            
+            try:
+                row = self._cache_db.execute(
+                    "SELECT data FROM metadata_cache "
+                    "WHERE file_path = ? AND file_size = ? AND mtime_ns = ?",
+                    (file_path, st.st_size, st.st_mtime_ns)
+                ).fetchone()
+                if row is None:
+                    return None
+                metadata = pickle.loads(row[0])
+            except Exception as e:
+                logging.warning(f"Error leyendo caché de metadatos: {e}")
+                return None
+            
+            self._remember(file_path, st, metadata)
+            return metadata
+    
+    def _remember(
+        self,
+        file_path: str,
+        st: os.stat_result,
+        metadata: AudioMetadata
+    ) -> None:
+        """Guarda una entrada en la caché en memoria (llamar con _cache_lock)."""
+        self._cached_metadata[file_path] = (st.st_size, st.st_mtime_ns, metadata)
+        self._cached_metadata.move_to_end(file_path)
+        if len(self._cached_metadata) > METADATA_CACHE_SIZE:
+            self._cached_metadata.popitem(last=False)
+    
+    def _set_cached(
+        self,
+        file_path: str,
+        st: os.stat_result,
+        metadata: AudioMetadata
+    ) -> None:
+        """Guarda los metadatos junto con el tamaño y mtime del archivo."""
+        with self._cache_lock:
+            self._remember(file_path, st, metadata)
+            
+            if self._cache_db is None:
+                return
+            
+            try:
+                self._cache_db.execute(
+                    "INSERT OR REPLACE INTO metadata_cache "
+                    "(file_path, file_size, mtime_ns, data) VALUES (?, ?, ?, ?)",
+                    (file_path, st.st_size, st.st_mtime_ns, pickle.dumps(metadata))
+                )
+                self._cache_db.commit()
+            except Exception as e:
+                logging.warning(f"Error guardando caché de metadatos: {e}")
+    
+    def _invalidate_cached(self, file_path: str) -> None:
+        """Descarta los metadatos cacheados de un archivo modificado."""
+        with self._cache_lock:
+            self._cached_metadata.pop(file_path, None)
+            
+            if self._cache_db is None:
+                return
+            
+            try:
+                self._cache_db.execute(
+                    "DELETE FROM metadata_cache WHERE file_path = ?", (file_path,)
+                )
+                self._cache_db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Error invalidando caché de metadatos: {e}")
     
-    def extract_metadata(self, file_path: str) -> AudioMetadata | None:
+    def extract_metadata(
+        self,
+        file_path: str,
+        stat_result: os.stat_result | None = None
+    ) -> AudioMetadata | None:
         """
         Extrae los metadatos de un archivo de audio.
         
+        El resultado se cachea por (ruta, tamaño, mtime_ns): mientras el archivo
+        no cambie no se vuelve a leer con mutagen.
+        
         Args:
             file_path: Ruta al archivo de audio.
+            stat_result: Resultado de os.stat ya obtenido por el llamador (opcional).
             
         Returns:
             AudioMetadata si se pudo extraer la información, None si hubo error.
         """
         try:
-            # Verificar si ya está en caché
-            if file_path in self._cached_metadata:
-                return self._cached_metadata[file_path]
+            # Obtener el formato antes del stat: los no soportados no tocan disco
+            ext = _suffix(file_path)
+            if ext not in self.SUPPORTED_FORMATS:
+                logging.error(f"Formato no soportado: {ext}")
+                return None
             
-            path = Path(file_path)
-            if not path.exists():
+            try:
+                st = stat_result or os.stat(file_path)
+            except FileNotFoundError:
                 logging.error(f"Archivo no encontrado: {file_path}")
                 return None
             
-            # Obtener el formato correcto para el archivo
-            ext = path.suffix.lower()
-            if ext not in self.SUPPORTED_FORMATS:
-                logging.error(f"Formato no soportado: {ext}")
-                return None
+            # Verificar si ya está en caché
+            cached = self._get_cached(file_path, st)
+            if cached is not None:
+                return cached
             
             # Cargar archivo con mutagen
             audio_class, easy_class = self.SUPPORTED_FORMATS[ext]
@@ -104,8 +278,8 @@ class MetadataManager:
             # Extraer metadatos básicos
             metadata = AudioMetadata(
                 file_path=file_path,
-                file_size=path.stat().st_size,
-                date_modified=datetime.fromtimestamp(path.stat().st_mtime, tz=UTC),
+                file_size=st.st_size,
+                date_modified=datetime.fromtimestamp(st.st_mtime, tz=UTC),
                 format=ext[1:].upper()  # Remover el punto
             )
             
@@ -119,16 +293,13 @@ class MetadataManager:
             if hasattr(audio.info, 'channels'):
                 metadata.channels = audio.info.channels
             
-            # Extraer tags según el formato
-            if ext == '.mp3' and easy:
-                self._extract_mp3_tags(easy, metadata)
-            elif ext == '.flac':
-                self._extract_flac_tags(audio, metadata)
-            elif ext in ['.m4a', '.mp4']:
-                self._extract_mp4_tags(audio, metadata)
+            # Extraer tags según el formato (MP3 los lee de la vista EasyID3)
+            extract_tags = self._tag_extractors.get(ext)
+            if extract_tags is not None:
+                extract_tags(audio if easy is None else easy, metadata)
             
             # Guardar en caché
-            self._cached_metadata[file_path] = metadata
+            self._set_cached(file_path, st, metadata)
             return metadata
             
         except Exception as e:
@@ -189,8 +360,15 @@ class MetadataManager:
                 metadata.track_number = tags['trkn'][0][0]
     
     def clear_cache(self) -> None:
-        """Limpia la caché de metadatos."""
-        self._cached_metadata.clear()
+        """Limpia la caché de metadatos, incluida la persistente."""
+        with self._cache_lock:
+            self._cached_metadata.clear()
+            if self._cache_db is not None:
+                try:
+                    self._cache_db.execute("DELETE FROM metadata_cache")
+                    self._cache_db.commit()
+                except sqlite3.Error as e:
+                    logging.warning(f"Error limpiando caché de metadatos: {e}")
     
     def update_metadata(self, file_path: str, **kwargs) -> bool:
         """
@@ -204,25 +382,20 @@ class MetadataManager:
             bool: True si se actualizó correctamente, False en caso contrario.
         """
         try:
-            path = Path(file_path)
-            if not path.exists():
+            if not os.path.exists(file_path):
                 logging.error(f"Archivo no encontrado: {file_path}")
                 return False
             
-            ext = path.suffix.lower()
+            ext = _suffix(file_path)
             if ext not in self.SUPPORTED_FORMATS:
                 logging.error(f"Formato no soportado: {ext}")
                 return False
             
             # Actualizar según el formato
-            if ext == '.mp3':
-                return self._update_mp3_tags(file_path, **kwargs)
-            elif ext == '.flac':
-                return self._update_flac_tags(file_path, **kwargs)
-            elif ext in ['.m4a', '.mp4']:
-                return self._update_mp4_tags(file_path, **kwargs)
-            
-            return False
+            update_tags = self._tag_writers.get(ext)
+            if update_tags is None:
+                return False
+            return update_tags(file_path, **kwargs)
             
         except Exception as e:
             logging.error(f"Error actualizando metadatos de {file_path}: {e}")
@@ -239,9 +412,8 @@ class MetadataManager:
             
             audio.save()
             
-            # Actualizar caché
-            if file_path in self._cached_metadata:
-                self.extract_metadata(file_path)
+            # Invalidar caché; se vuelve a leer en la próxima extracción
+            self._invalidate_cached(file_path)
                 
             return True
             
@@ -259,9 +431,8 @@ class MetadataManager:
             
             audio.save()
             
-            # Actualizar caché
-            if file_path in self._cached_metadata:
-                self.extract_metadata(file_path)
+            # Invalidar caché; se vuelve a leer en la próxima extracción
+            self._invalidate_cached(file_path)
                 
             return True
             
@@ -289,9 +460,8 @@ class MetadataManager:
             
             audio.save()
             
-            # Actualizar caché
-            if file_path in self._cached_metadata:
-                self.extract_metadata(file_path)
+            # Invalidar caché; se vuelve a leer en la próxima extracción
+            self._invalidate_cached(file_path)
                 
             return True
             
@@ -334,8 +504,7 @@ class MetadataManager:
         Returns:
             bool: True si el formato es soportado
         """
-        ext = Path(file_path).suffix.lower()
-        return ext in self.SUPPORTED_FORMATS
+        return _suffix(file_path) in self.SUPPORTED_FORMATS
     
     def extract_cover(self, file_path: str) -> bytes | None:
         """
@@ -351,8 +520,7 @@ class MetadataManager:
             from PIL import Image
             import io
             
-            path = Path(file_path)
-            ext = path.suffix.lower()
+            ext = _suffix(file_path)
             
             if ext == '.mp3':
                 audio = MP3(file_path)
@@ -377,23 +545,41 @@ class MetadataManager:
             logging.error(f"Error extrayendo portada de {file_path}: {e}")
             return None
     
-    def batch_update(self, files_metadata: dict[str, dict]) -> dict[str, bool]:
+    def batch_update(
+        self,
+        files_metadata: dict[str, dict],
+        *,
+        max_workers: int | None = None
+    ) -> dict[str, bool]:
         """
         Actualiza metadatos de múltiples archivos.
         
+        Los archivos se escriben en paralelo con un pool de hilos: el
+        tiempo se va en E/S de disco, que no retiene el GIL.
+        
         Args:
             files_metadata: Diccionario {file_path: metadata_dict}
+            max_workers: Hilos a usar (por defecto, hasta BATCH_UPDATE_WORKERS)
             
         Returns:
             Diccionario con resultados {file_path: success}
         """
-        results = {}
+        if not files_metadata:
+            return {}
         
-        for file_path, metadata in files_metadata.items():
+        def update(item: tuple[str, dict]) -> bool:
+            file_path, metadata = item
             try:
-                results[file_path] = self.update_metadata(file_path, **metadata)
+                return self.update_metadata(file_path, **metadata)
             except Exception as e:
                 logging.error(f"Error en batch update para {file_path}: {e}")
-                results[file_path] = False
+                return False
         
-        return results
+        workers = max_workers or min(BATCH_UPDATE_WORKERS, len(files_metadata))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map conserva el orden de entrada
+            return dict(zip(
+                files_metadata,
+                executor.map(update, files_metadata.items()),
+                strict=True
+            ))
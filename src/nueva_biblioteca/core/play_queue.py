@@ -7,11 +7,13 @@ Sistema de cola y historial de reproducción con soporte para múltiples
 modos de reproducción (normal, shuffle, repeat).
 """
 
-import random
 from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
 from typing import Any, Optional
 
+import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from nueva_biblioteca.data.models import Track
@@ -19,6 +21,9 @@ from nueva_biblioteca.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Generador para las permutaciones del modo shuffle
+_rng = np.random.default_rng()
+
 
 class RepeatMode(Enum):
     """Modos de repetición."""
@@ -33,6 +38,32 @@ class ShuffleMode(Enum):
     ON = "on"
 
 
+# Siguiente modo de repetición al alternar (none -> one -> all -> none)
+_REPEAT_CYCLE = {
+    RepeatMode.NONE: RepeatMode.ONE,
+    RepeatMode.ONE: RepeatMode.ALL,
+    RepeatMode.ALL: RepeatMode.NONE
+}
+
+
+def _moved_index(index: int, from_index: int, to_index: int) -> int:
+    """
+    Calcula la nueva posición de un elemento tras mover otro de la lista.
+    
+    Args:
+        index: Posición del elemento antes del movimiento
+        from_index: Posición origen del elemento movido
+        to_index: Posición destino del elemento movido
+        
+    Returns:
+        Posición del elemento después del movimiento
+    """
+    if index == from_index:
+        return to_index
+    # Los elementos entre origen y destino se desplazan un lugar
+    return index - (from_index < index <= to_index) + (to_index <= index < from_index)
+
+
 class PlayQueue(QObject):
     """
     Sistema de cola de reproducción con historial.
@@ -59,24 +90,32 @@ class PlayQueue(QObject):
         """
         super().__init__()
         
-        # Cola principal
-        self._queue: deque[Track] = deque()
-        self._original_queue: list[Track] = []  # Para shuffle
+        # Cola principal (lista: se indexa en cada avance, no solo por los extremos)
+        self._queue: list[Track] = []
         
         # Historial
         self._history: deque[Track] = deque(maxlen=max_history)
+        self._last_history_id: Optional[int] = None  # ID del último del historial
         
         # Estado actual
         self._current_index: int = -1
         self._current_track: Optional[Track] = None
         
-        # Modos de reproducción
+        # Modos de reproducción; los bool los reflejan para las rutas
+        # calientes (comparar miembros de Enum cuesta una búsqueda de clase)
         self._repeat_mode = RepeatMode.NONE
         self._shuffle_mode = ShuffleMode.OFF
+        self._repeat_one = False
+        self._repeat_all = False
+        self._shuffle_on = False
         
         # Estado de shuffle
         self._shuffle_indices: list[int] = []
         self._shuffle_position: int = -1
+        
+        # Notificaciones aplazadas por batch_update
+        self._batch_depth = 0
+        self._queue_dirty = False
     
     def add_track(self, track: Track, position: Optional[int] = None) -> None:
         """
@@ -88,21 +127,22 @@ class PlayQueue(QObject):
         """
         try:
             if position is None:
+                index = len(self._queue)
                 self._queue.append(track)
-                self._original_queue.append(track)
             else:
-                # Insertar en posición específica
-                queue_list = list(self._queue)
-                queue_list.insert(position, track)
-                self._queue = deque(queue_list)
+                # Insertar en posición específica (normalizada como list.insert)
+                index = slice(position, None).indices(len(self._queue))[0]
+                self._queue.insert(index, track)
                 
-                self._original_queue.insert(position, track)
+                # Ajustar índice actual si el track quedó antes
+                if index <= self._current_index:
+                    self._current_index += 1
             
-            # Regenerar shuffle si está activo
-            if self._shuffle_mode == ShuffleMode.ON:
-                self._regenerate_shuffle()
+            # Actualizar shuffle si está activo
+            if self._shuffle_on:
+                self._insert_shuffle_index(index)
             
-            self.queue_changed.emit()
+            self._notify_queue_changed()
             logger.debug(f"Track añadido a la cola: {track.title}")
             
         except Exception as e:
@@ -117,18 +157,19 @@ class PlayQueue(QObject):
             clear_first: Si limpiar la cola primero
         """
         try:
-            if clear_first:
-                self.clear()
-            
-            for track in tracks:
-                self._queue.append(track)
-                self._original_queue.append(track)
-            
-            # Regenerar shuffle si está activo
-            if self._shuffle_mode == ShuffleMode.ON:
-                self._regenerate_shuffle()
+            # Limpiar y añadir se notifican con una sola señal
+            with self.batch_update():
+                if clear_first:
+                    self.clear()
+                
+                self._queue.extend(tracks)
+                
+                # Regenerar shuffle si está activo
+                if self._shuffle_on:
+                    self._regenerate_shuffle()
+                
+                self._notify_queue_changed()
             
-            self.queue_changed.emit()
             logger.info(f"{len(tracks)} tracks añadidos a la cola")
             
         except Exception as e:
@@ -146,23 +187,16 @@ class PlayQueue(QObject):
         """
         try:
             if 0 <= index < len(self._queue):
-                queue_list = list(self._queue)
-                removed_track = queue_list.pop(index)
-                self._queue = deque(queue_list)
-                
-                # Eliminar de la cola original también
-                if removed_track in self._original_queue:
-                    self._original_queue.remove(removed_track)
+                removed_track = self._queue.pop(index)
                 
                 # Ajustar índice actual si es necesario
-                if index <= self._current_index:
-                    self._current_index -= 1
+                self._current_index -= index <= self._current_index
                 
-                # Regenerar shuffle si está activo
-                if self._shuffle_mode == ShuffleMode.ON:
-                    self._regenerate_shuffle()
+                # Actualizar shuffle si está activo
+                if self._shuffle_on:
+                    self._remove_shuffle_index(index)
                 
-                self.queue_changed.emit()
+                self._notify_queue_changed()
                 logger.debug(f"Track eliminado de la cola: {removed_track.title}")
                 return True
             
@@ -184,23 +218,23 @@ class PlayQueue(QObject):
             True si se movió correctamente
         """
         try:
-            if (0 <= from_index < len(self._queue) and 
-                0 <= to_index < len(self._queue)):
-                
-                queue_list = list(self._queue)
-                track = queue_list.pop(from_index)
-                queue_list.insert(to_index, track)
-                self._queue = deque(queue_list)
+            n = len(self._queue)
+            if 0 <= from_index < n and 0 <= to_index < n:
+                track = self._queue.pop(from_index)
+                self._queue.insert(to_index, track)
                 
-                # Ajustar índice actual
-                if from_index == self._current_index:
-                    self._current_index = to_index
-                elif from_index < self._current_index <= to_index:
-                    self._current_index -= 1
-                elif to_index <= self._current_index < from_index:
-                    self._current_index += 1
+                # Ajustar índice actual (y el orden de shuffle, que también
+                # se refiere a posiciones de la cola)
+                self._current_index = _moved_index(
+                    self._current_index, from_index, to_index
+                )
+                if self._shuffle_on:
+                    self._shuffle_indices = [
+                        _moved_index(i, from_index, to_index)
+                        for i in self._shuffle_indices
+                    ]
                 
-                self.queue_changed.emit()
+                self._notify_queue_changed()
                 return True
             
             return False
@@ -212,15 +246,39 @@ class PlayQueue(QObject):
     def clear(self) -> None:
         """Limpia la cola de reproducción."""
         self._queue.clear()
-        self._original_queue.clear()
         self._current_index = -1
         self._current_track = None
         self._shuffle_indices.clear()
         self._shuffle_position = -1
         
-        self.queue_changed.emit()
+        self._notify_queue_changed()
         logger.info("Cola de reproducción limpiada")
     
+    @contextmanager
+    def batch_update(self) -> Iterator[None]:
+        """
+        Agrupa varias modificaciones de la cola en una sola notificación.
+        
+        Dentro del bloque queue_changed se aplaza y, si la cola cambió, se
+        emite una sola vez al salir del bloque más externo. El resto de
+        señales (current_changed, mode_changed) se emiten con normalidad.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._queue_dirty:
+                self._queue_dirty = False
+                self.queue_changed.emit()
+    
+    def _notify_queue_changed(self) -> None:
+        """Emite queue_changed, o lo aplaza si hay un batch_update activo."""
+        if self._batch_depth:
+            self._queue_dirty = True
+        else:
+            self.queue_changed.emit()
+    
     def next_track(self) -> Optional[Track]:
         """
         Obtiene el siguiente track según el modo actual.
@@ -238,7 +296,7 @@ class PlayQueue(QObject):
             
             next_track = None
             
-            if self._shuffle_mode == ShuffleMode.ON:
+            if self._shuffle_on:
                 next_track = self._next_shuffle_track()
             else:
                 next_track = self._next_normal_track()
@@ -265,13 +323,14 @@ class PlayQueue(QObject):
             # Primero intentar del historial
             if self._history:
                 previous = self._history.pop()
+                self._last_history_id = self._history[-1].id if self._history else None
                 self._current_track = previous
                 self.current_changed.emit(previous)
                 logger.debug(f"Track anterior del historial: {previous.title}")
                 return previous
             
             # Si no hay historial, ir al track anterior en la cola
-            if self._shuffle_mode == ShuffleMode.ON:
+            if self._shuffle_on:
                 return self._previous_shuffle_track()
             else:
                 return self._previous_normal_track()
@@ -296,12 +355,12 @@ class PlayQueue(QObject):
                 if self._current_track:
                     self._add_to_history(self._current_track)
                 
-                track = list(self._queue)[index]
+                track = self._queue[index]
                 self._current_index = index
                 self._current_track = track
                 
                 # Ajustar posición de shuffle si está activo
-                if self._shuffle_mode == ShuffleMode.ON:
+                if self._shuffle_on:
                     try:
                         self._shuffle_position = self._shuffle_indices.index(index)
                     except ValueError:
@@ -327,6 +386,8 @@ class PlayQueue(QObject):
         """
         if self._repeat_mode != mode:
             self._repeat_mode = mode
+            self._repeat_one = mode is RepeatMode.ONE
+            self._repeat_all = mode is RepeatMode.ALL
             self.mode_changed.emit()
             logger.info(f"Modo de repetición cambiado a: {mode.value}")
     
@@ -339,8 +400,9 @@ class PlayQueue(QObject):
         """
         if self._shuffle_mode != mode:
             self._shuffle_mode = mode
+            self._shuffle_on = mode is ShuffleMode.ON
             
-            if mode == ShuffleMode.ON:
+            if self._shuffle_on:
                 self._regenerate_shuffle()
             else:
                 self._shuffle_indices.clear()
@@ -356,9 +418,7 @@ class PlayQueue(QObject):
         Returns:
             Nuevo modo de repetición
         """
-        modes = [RepeatMode.NONE, RepeatMode.ONE, RepeatMode.ALL]
-        current_index = modes.index(self._repeat_mode)
-        new_mode = modes[(current_index + 1) % len(modes)]
+        new_mode = _REPEAT_CYCLE[self._repeat_mode]
         self.set_repeat_mode(new_mode)
         return new_mode
     
@@ -369,24 +429,23 @@ class PlayQueue(QObject):
         Returns:
             Nuevo modo shuffle
         """
-        new_mode = (ShuffleMode.ON if self._shuffle_mode == ShuffleMode.OFF 
-                   else ShuffleMode.OFF)
+        new_mode = ShuffleMode.OFF if self._shuffle_on else ShuffleMode.ON
         self.set_shuffle_mode(new_mode)
         return new_mode
     
     def _next_normal_track(self) -> Optional[Track]:
         """Obtiene el siguiente track en modo normal."""
-        if self._repeat_mode == RepeatMode.ONE and self._current_track:
+        if self._repeat_one and self._current_track:
             return self._current_track
         
         next_index = self._current_index + 1
         
         if next_index < len(self._queue):
             self._current_index = next_index
-            return list(self._queue)[next_index]
-        elif self._repeat_mode == RepeatMode.ALL and self._queue:
+            return self._queue[next_index]
+        elif self._repeat_all and self._queue:
             self._current_index = 0
-            return list(self._queue)[0]
+            return self._queue[0]
         
         return None
     
@@ -394,22 +453,19 @@ class PlayQueue(QObject):
         """Obtiene el track anterior en modo normal."""
         if self._current_index > 0:
             self._current_index -= 1
-            track = list(self._queue)[self._current_index]
-            self._current_track = track
-            self.current_changed.emit(track)
-            return track
-        elif self._repeat_mode == RepeatMode.ALL and self._queue:
+        elif self._repeat_all and self._queue:
             self._current_index = len(self._queue) - 1
-            track = list(self._queue)[self._current_index]
-            self._current_track = track
-            self.current_changed.emit(track)
-            return track
+        else:
+            return None
         
-        return None
+        track = self._queue[self._current_index]
+        self._current_track = track
+        self.current_changed.emit(track)
+        return track
     
     def _next_shuffle_track(self) -> Optional[Track]:
         """Obtiene el siguiente track en modo shuffle."""
-        if self._repeat_mode == RepeatMode.ONE and self._current_track:
+        if self._repeat_one and self._current_track:
             return self._current_track
         
         if not self._shuffle_indices:
@@ -421,14 +477,14 @@ class PlayQueue(QObject):
             self._shuffle_position = next_position
             index = self._shuffle_indices[next_position]
             self._current_index = index
-            return list(self._queue)[index]
-        elif self._repeat_mode == RepeatMode.ALL and self._shuffle_indices:
+            return self._queue[index]
+        elif self._repeat_all and self._shuffle_indices:
             # Regenerar shuffle para evitar repetir el mismo orden
             self._regenerate_shuffle()
             self._shuffle_position = 0
             index = self._shuffle_indices[0]
             self._current_index = index
-            return list(self._queue)[index]
+            return self._queue[index]
         
         return None
     
@@ -438,7 +494,7 @@ class PlayQueue(QObject):
             self._shuffle_position -= 1
             index = self._shuffle_indices[self._shuffle_position]
             self._current_index = index
-            track = list(self._queue)[index]
+            track = self._queue[index]
             self._current_track = track
             self.current_changed.emit(track)
             return track
@@ -447,38 +503,71 @@ class PlayQueue(QObject):
     
     def _regenerate_shuffle(self) -> None:
         """Regenera los índices de shuffle."""
-        if not self._queue:
+        n = len(self._queue)
+        if not n:
             self._shuffle_indices.clear()
             self._shuffle_position = -1
             return
         
-        # Crear lista de índices
-        indices = list(range(len(self._queue)))
-        
-        # Mezclar evitando que el track actual sea el primero
-        if self._current_index >= 0 and len(indices) > 1:
-            # Remover índice actual temporalmente
-            current = indices.pop(self._current_index)
-            random.shuffle(indices)
-            # Insertar en posición aleatoria que no sea la primera
-            if indices:
-                pos = random.randint(1, len(indices))
-                indices.insert(pos, current)
-            else:
-                indices.append(current)
-        else:
-            random.shuffle(indices)
+        current = self._current_index
+        if not 0 <= current < n:
+            # Sin track actual: permutación completa en C (Fisher-Yates de numpy)
+            self._shuffle_indices = _rng.permutation(n).tolist()
+            self._shuffle_position = -1
+            return
         
-        self._shuffle_indices = indices
+        # El track actual va a una posición al azar que no sea la primera
+        # (salvo que sea el único) y el resto se permuta alrededor, así su
+        # posición se conoce sin buscarla ni recolocarla después
+        position = int(_rng.integers(1, n)) if n > 1 else 0
+        others = _rng.permutation(n - 1)
+        others[others >= current] += 1
         
-        # Encontrar posición actual en shuffle
-        if self._current_index >= 0:
-            try:
-                self._shuffle_position = self._shuffle_indices.index(self._current_index)
-            except ValueError:
-                self._shuffle_position = -1
-        else:
-            self._shuffle_position = -1
+        self._shuffle_indices = np.insert(others, position, current).tolist()
+        self._shuffle_position = position
+    
+    def _insert_shuffle_index(self, index: int) -> None:
+        """
+        Incorpora al shuffle un track recién insertado en la cola.
+        
+        Los índices posteriores se desplazan y el nuevo se coloca al azar
+        entre los pendientes, sin alterar el orden ya establecido.
+        
+        Args:
+            index: Índice del track en la cola
+        """
+        indices = self._shuffle_indices
+        if len(indices) != len(self._queue) - 1:
+            # Shuffle desincronizado con la cola: regenerar por completo
+            self._regenerate_shuffle()
+            return
+        
+        if index < len(indices):
+            indices[:] = [i + 1 if i >= index else i for i in indices]
+        
+        position = int(_rng.integers(self._shuffle_position + 1, len(indices) + 1))
+        indices.insert(position, index)
+    
+    def _remove_shuffle_index(self, index: int) -> None:
+        """
+        Quita del shuffle un track eliminado de la cola.
+        
+        Args:
+            index: Índice que tenía el track en la cola
+        """
+        indices = self._shuffle_indices
+        if len(indices) != len(self._queue) + 1:
+            # Shuffle desincronizado con la cola: regenerar por completo
+            self._regenerate_shuffle()
+            return
+        
+        position = indices.index(index)
+        del indices[position]
+        indices[:] = [i - 1 if i > index else i for i in indices]
+        
+        # Seguir desde el mismo punto del orden aleatorio
+        if position <= self._shuffle_position:
+            self._shuffle_position -= 1
     
     def _add_to_history(self, track: Track) -> None:
         """
@@ -488,15 +577,16 @@ class PlayQueue(QObject):
             track: Track a añadir
         """
         # Evitar duplicados consecutivos
-        if not self._history or self._history[-1].id != track.id:
+        if not self._history or self._last_history_id != track.id:
             self._history.append(track)
+            self._last_history_id = track.id
     
     # Propiedades
     
     @property
     def queue(self) -> list[Track]:
-        """Obtiene la cola actual como lista."""
-        return list(self._queue)
+        """Obtiene una copia de la cola actual."""
+        return self._queue.copy()
     
     @property
     def history(self) -> list[Track]:
@@ -526,7 +616,7 @@ class PlayQueue(QObject):
     @property
     def is_empty(self) -> bool:
         """Verifica si la cola está vacía."""
-        return len(self._queue) == 0
+        return not self._queue
     
     @property
     def size(self) -> int:
@@ -558,38 +648,45 @@ class PlayQueue(QObject):
             track_lookup: Diccionario para buscar tracks por ID
         """
         try:
-            # Restaurar cola
-            self._queue.clear()
-            self._original_queue.clear()
-            
-            for track_id in state.get('queue', []):
-                if track_id in track_lookup:
-                    track = track_lookup[track_id]
-                    self._queue.append(track)
-                    self._original_queue.append(track)
-            
-            # Restaurar índice y track actual
-            self._current_index = state.get('current_index', -1)
-            current_track_id = state.get('current_track_id')
-            if current_track_id and current_track_id in track_lookup:
-                self._current_track = track_lookup[current_track_id]
-            
-            # Restaurar modos
-            repeat_value = state.get('repeat_mode', RepeatMode.NONE.value)
-            self._repeat_mode = RepeatMode(repeat_value)
-            
-            shuffle_value = state.get('shuffle_mode', ShuffleMode.OFF.value)
-            self._shuffle_mode = ShuffleMode(shuffle_value)
-            
-            # Restaurar historial
-            self._history.clear()
-            for track_id in state.get('history', []):
-                if track_id in track_lookup:
-                    self._history.append(track_lookup[track_id])
-            
-            # Regenerar shuffle si está activo
-            if self._shuffle_mode == ShuffleMode.ON:
-                self._regenerate_shuffle()
+            # Toda la restauración se notifica con una sola señal
+            with self.batch_update():
+                # Restaurar cola
+                self._queue.clear()
+                
+                self._queue.extend(
+                    track_lookup[track_id] for track_id in state.get('queue', [])
+                    if track_id in track_lookup
+                )
+                
+                # Restaurar índice y track actual
+                self._current_index = state.get('current_index', -1)
+                current_track_id = state.get('current_track_id')
+                if current_track_id and current_track_id in track_lookup:
+                    self._current_track = track_lookup[current_track_id]
+                
+                # Restaurar modos
+                repeat_value = state.get('repeat_mode', RepeatMode.NONE.value)
+                self._repeat_mode = RepeatMode(repeat_value)
+                self._repeat_one = self._repeat_mode is RepeatMode.ONE
+                self._repeat_all = self._repeat_mode is RepeatMode.ALL
+                
+                shuffle_value = state.get('shuffle_mode', ShuffleMode.OFF.value)
+                self._shuffle_mode = ShuffleMode(shuffle_value)
+                self._shuffle_on = self._shuffle_mode is ShuffleMode.ON
+                
+                # Restaurar historial
+                self._history.clear()
+                self._history.extend(
+                    track_lookup[track_id] for track_id in state.get('history', [])
+                    if track_id in track_lookup
+                )
+                self._last_history_id = self._history[-1].id if self._history else None
+                
+                # Regenerar shuffle si está activo
+                if self._shuffle_on:
+                    self._regenerate_shuffle()
+                
+                self._notify_queue_changed()
             
             logger.info("Estado de cola restaurado correctamente")
             
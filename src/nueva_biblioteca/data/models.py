@@ -88,9 +88,11 @@ class Playlist(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relaciones
+    # Relaciones; duration y track_count recorren los tracks, así que se
+    # cargan con una única consulta IN (...) para todas las playlists
     tracks = relationship(
-        'Track', secondary=playlist_tracks, back_populates='playlists'
+        'Track', secondary=playlist_tracks, back_populates='playlists',
+        lazy='selectin'
     )
     
     @hybrid_property
@@ -8,16 +8,131 @@ y realizar operaciones CRUD sobre los modelos.
 """
 
 import logging
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import create_engine, desc
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import column, create_engine, desc, event, insert, table, text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session, SessionTransaction, selectinload, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from .models import Base, PlayHistory, Playlist, Track, TrackComment
 
+# PRAGMAs aplicados a cada conexión SQLite
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",        # Lectores concurrentes con un escritor
+    "synchronous": "NORMAL",      # Seguro con WAL, menos fsync
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,       # 256 MB
+    "cache_size": -64000,         # ~64 MB (negativo = KiB)
+    "foreign_keys": "ON",
+}
+
+# Conexiones SQLite mantenidas abiertas por el pool
+POOL_SIZE = 5
+
+# Sentencias compiladas que SQLAlchemy conserva en caché
+QUERY_CACHE_SIZE = 1200
+
+# Tracks confirmados por transacción en save_tracks
+SAVE_BATCH_SIZE = 500
+
+# Índice de texto completo sobre tracks (tabla FTS5 de contenido externo);
+# los triggers lo mantienen sincronizado con cada INSERT/UPDATE/DELETE
+TRACKS_FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+        title, artist, album,
+        content='tracks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_fts_ai AFTER INSERT ON tracks BEGIN
+        INSERT INTO tracks_fts(rowid, title, artist, album)
+        VALUES (new.id, new.title, new.artist, new.album);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_fts_ad AFTER DELETE ON tracks BEGIN
+        INSERT INTO tracks_fts(tracks_fts, rowid, title, artist, album)
+        VALUES ('delete', old.id, old.title, old.artist, old.album);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_fts_au
+    AFTER UPDATE OF title, artist, album ON tracks BEGIN
+        INSERT INTO tracks_fts(tracks_fts, rowid, title, artist, album)
+        VALUES ('delete', old.id, old.title, old.artist, old.album);
+        INSERT INTO tracks_fts(rowid, title, artist, album)
+        VALUES (new.id, new.title, new.artist, new.album);
+    END
+    """,
+]
+
+# Columnas de tracks_fts usadas en las consultas
+_tracks_fts = table("tracks_fts", column("rowid"), column("tracks_fts"))
+
+
+def _fts_match_query(query: str) -> str:
+    """
+    Convierte texto libre en una consulta MATCH de FTS5.
+    
+    Cada palabra se busca como prefijo y se escapa como cadena para que
+    la sintaxis de FTS5 (comillas, operadores) no se interprete.
+    
+    Args:
+        query: Texto a buscar
+        
+    Returns:
+        Expresión MATCH
+    """
+    return " ".join(
+        '"{}"*'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+class _TransactionSession:
+    """
+    Sesión compartida por las operaciones dentro de Repository.transaction().
+    
+    Cada operación corre en un SAVEPOINT propio y ``commit()`` solo hace
+    flush, de modo que el COMMIT real ocurre una única vez al cerrar la
+    transacción. Si una operación falla, solo se deshace su SAVEPOINT.
+    """
+    
+    def __init__(self, session: Session):
+        """
+        Inicializa la sesión compartida.
+        
+        Args:
+            session: Sesión de la transacción en curso
+        """
+        self._session = session
+        self._savepoint: SessionTransaction | None = None
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+    
+    def __enter__(self) -> "_TransactionSession":
+        self._savepoint = self._session.begin_nested()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._savepoint.commit()
+        else:
+            self._savepoint.rollback()
+    
+    def commit(self) -> None:
+        """Envía los cambios pendientes sin cerrar la transacción."""
+        self._session.flush()
+
 
 class Repository:
     """Repositorio principal para acceso a datos."""
@@ -33,19 +148,145 @@ class Repository:
             db_path = str(Path.home() / ".nueva-biblioteca" / "library.db")
             
         # Crear directorio si no existe
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Inicializar engine y session
-        self.engine = create_engine(f'sqlite:///{db_path}')
-        self.Session = sessionmaker(bind=self.engine)
+        # Inicializar engine y session; las conexiones se reutilizan y las
+        # sentencias compiladas se cachean entre llamadas
+        if db_path == ":memory:":
+            # Cada conexión tendría su propia base vacía: compartir una
+            pool_options: dict[str, Any] = {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        else:
+            pool_options = {
+                "poolclass": QueuePool,
+                "pool_size": POOL_SIZE,
+            }
+        self.engine = create_engine(
+            f'sqlite:///{db_path}',
+            query_cache_size=QUERY_CACHE_SIZE,
+            **pool_options
+        )
+        self._configure_engine()
+        # Los objetos devueltos se usan fuera de la sesión: no expirarlos
+        # evita recargarlos (o fallar) al leer sus atributos
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        
+        # Transacción activa por hilo (ver transaction())
+        self._local = threading.local()
         
         # Crear tablas si no existen
         Base.metadata.create_all(self.engine)
+        
+        # Búsqueda de texto con FTS5; si SQLite no lo incluye se usa LIKE
+        self.fts_enabled = self._create_search_index()
+    
+    def _configure_engine(self) -> None:
+        """
+        Configura las conexiones SQLite.
+        
+        Aplica SQLITE_PRAGMAS a cada conexión nueva. Además, pysqlite abre
+        las transacciones por su cuenta y no soporta bien SAVEPOINT; se
+        desactiva y se deja que SQLAlchemy emita BEGIN.
+        """
+        @event.listens_for(self.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record) -> None:
+            dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            for pragma, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+        
+        @event.listens_for(self.engine, "begin")
+        def _on_begin(connection) -> None:
+            connection.exec_driver_sql("BEGIN")
+    
+    def _create_search_index(self) -> bool:
+        """
+        Crea el índice FTS5 de tracks y lo puebla si es nuevo.
+        
+        Returns:
+            True si el índice está disponible
+        """
+        try:
+            with self.engine.begin() as connection:
+                exists = connection.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'tracks_fts'"
+                ).scalar()
+                for statement in TRACKS_FTS_SCHEMA:
+                    connection.exec_driver_sql(statement)
+                if not exists:
+                    # Base de datos previa al índice: indexar lo existente
+                    connection.exec_driver_sql(
+                        "INSERT INTO tracks_fts(tracks_fts) VALUES ('rebuild')"
+                    )
+            return True
+        except OperationalError as e:
+            logging.warning(f"FTS5 no disponible, búsqueda con LIKE: {e}")
+            return False
     
     def _session(self) -> Session:
-        """Crea una nueva sesión de base de datos."""
+        """
+        Crea una nueva sesión de base de datos.
+        
+        Dentro de transaction() devuelve la sesión compartida.
+        """
+        active = getattr(self._local, "session", None)
+        if active is not None:
+            return _TransactionSession(active)
         return self.Session()
     
+    def get_pragmas(self) -> dict[str, Any]:
+        """
+        Obtiene el valor efectivo de los PRAGMAs configurados.
+        
+        Returns:
+            Diccionario PRAGMA -> valor
+        """
+        with self.engine.connect() as connection:
+            return {
+                pragma: connection.execute(text(f"PRAGMA {pragma}")).scalar()
+                for pragma in SQLITE_PRAGMAS
+            }
+    
+    def get_pool_status(self) -> str:
+        """
+        Describe el estado del pool de conexiones.
+        
+        Returns:
+            Resumen de conexiones abiertas, en uso y en espera
+        """
+        return self.engine.pool.status()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """
+        Agrupa varias operaciones del repositorio en una sola transacción.
+        
+        Las operaciones llamadas dentro del bloque comparten la sesión y se
+        confirman con un único COMMIT al salir; si el bloque lanza una
+        excepción se deshacen todas.
+        
+        Yields:
+            Sesión de la transacción
+        """
+        active = getattr(self._local, "session", None)
+        if active is not None:
+            # Transacción anidada: reutilizar la exterior
+            yield active
+            return
+        
+        session = self.Session()
+        self._local.session = session
+        try:
+            with session.begin():
+                yield session
+        finally:
+            self._local.session = None
+            session.close()
+    
     # Operaciones de Track
     
     def add_track(self, track_data: dict[str, Any]) -> Track | None:
@@ -68,6 +309,42 @@ class Repository:
             logging.error(f"Error agregando track: {e}")
             return None
     
+    def add_tracks(self, tracks_data: list[dict[str, Any]]) -> int:
+        """
+        Agrega varios tracks con un único INSERT por lotes.
+        
+        Usa la ruta Core de SQLAlchemy (sin instanciar objetos Track), por
+        lo que es la opción adecuada para importaciones masivas. Los tracks
+        cuya ruta ya existe se omiten.
+        
+        Args:
+            tracks_data: Lista de diccionarios con datos de tracks
+            
+        Returns:
+            Número de tracks insertados
+        """
+        if not tracks_data:
+            return 0
+        
+        # executemany exige las mismas columnas en cada fila: agrupar por
+        # columnas presentes para no pisar los valores por defecto con NULL
+        batches: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for data in tracks_data:
+            batches.setdefault(frozenset(data), []).append(data)
+        
+        statement = insert(Track.__table__).prefix_with("OR IGNORE")
+        try:
+            with self._session() as session:
+                inserted = sum(
+                    session.execute(statement, batch).rowcount
+                    for batch in batches.values()
+                )
+                session.commit()
+                return inserted
+        except SQLAlchemyError as e:
+            logging.error(f"Error agregando tracks: {e}")
+            return 0
+    
     def save_track(self, track: Track) -> Track | None:
         """
         Guarda un track (nuevo o existente) en la biblioteca.
@@ -92,6 +369,53 @@ class Repository:
             logging.error(f"Error guardando track: {e}")
             return None
     
+    def save_tracks(
+        self,
+        tracks: Iterable[Track],
+        batch_size: int = SAVE_BATCH_SIZE,
+        on_batch: Callable[[int, list[Track]], None] | None = None
+    ) -> int:
+        """
+        Guarda varios tracks (nuevos o existentes) confirmando por lotes.
+        
+        Cada lote se envía en un único flush y un único COMMIT en lugar de
+        uno por track. Si un lote falla (por ejemplo, una ruta duplicada),
+        se reintenta track a track con save_track para no perder el resto.
+        
+        Args:
+            tracks: Tracks a guardar
+            batch_size: Tracks por transacción
+            on_batch: Callback (tracks procesados, lote) tras cada lote
+            
+        Returns:
+            Número de tracks guardados
+        """
+        saved = 0
+        processed = 0
+        iterator = iter(tracks)
+        
+        while batch := list(islice(iterator, batch_size)):
+            try:
+                with self._session() as session:
+                    for track in batch:
+                        if track.id:
+                            # Track existente - merge
+                            session.merge(track)
+                        else:
+                            # Track nuevo - add
+                            session.add(track)
+                    session.commit()
+                saved += len(batch)
+            except SQLAlchemyError as e:
+                logging.warning(f"Lote de tracks con errores, guardando uno a uno: {e}")
+                saved += sum(self.save_track(track) is not None for track in batch)
+            
+            processed += len(batch)
+            if on_batch:
+                on_batch(processed, batch)
+        
+        return saved
+    
     def get_track(self, track_id: int) -> Track | None:
         """Obtiene un track por su ID."""
         try:
@@ -131,6 +455,9 @@ class Repository:
             with self._session() as session:
                 track = session.query(Track).get(track_id)
                 if track:
+                    # El historial no tiene relación ORM con el track; con
+                    # foreign_keys=ON hay que borrarlo explícitamente
+                    session.query(PlayHistory).filter_by(track_id=track_id).delete()
                     session.delete(track)
                     session.commit()
                     return True
@@ -161,19 +488,28 @@ class Repository:
             logging.error(f"Error eliminando playlist {playlist_id}: {e}")
             return False
     
-    def get_all_tracks(self, limit: int = 1000) -> list[Track]:
+    def get_all_tracks(
+        self,
+        limit: int = 1000,
+        include_playlists: bool = False
+    ) -> list[Track]:
         """
         Obtiene todos los tracks de la biblioteca.
         
         Args:
             limit: Límite de resultados
+            include_playlists: Cargar también las playlists de cada track
+                (una sola consulta adicional en lugar de una por track)
             
         Returns:
             Lista de todos los tracks
         """
         try:
             with self._session() as session:
-                return session.query(Track).limit(limit).all()
+                q = session.query(Track)
+                if include_playlists:
+                    q = q.options(selectinload(Track.playlists))
+                return q.limit(limit).all()
         except SQLAlchemyError as e:
             logging.error(f"Error obteniendo todos los tracks: {e}")
             return []
@@ -205,7 +541,12 @@ class Repository:
                 q = session.query(Track)
                 
                 # Aplicar búsqueda de texto
-                if query:
+                match = _fts_match_query(query) if self.fts_enabled else ""
+                if match:
+                    q = q.join(
+                        _tracks_fts, _tracks_fts.c.rowid == Track.id
+                    ).filter(_tracks_fts.c.tracks_fts.match(match))
+                elif query:
                     q = q.filter(
                         Track.title.ilike(f"%{query}%") |
                         Track.artist.ilike(f"%{query}%") |
@@ -311,8 +652,8 @@ class Repository:
         """
         try:
             with self._session() as session:
-                from sqlalchemy.orm import joinedload
-                playlists = session.query(Playlist).options(joinedload(Playlist.tracks)).all()
+                # Playlist.tracks se carga en bloque (lazy='selectin')
+                playlists = session.query(Playlist).all()
                 # Expunge para poder usar fuera de la sesión
                 for playlist in playlists:
                     session.expunge(playlist)
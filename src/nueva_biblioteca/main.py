@@ -11,12 +11,10 @@ import os
 import sys
 from pathlib import Path
 
-from PyQt6.QtCore import QSettings
-from PyQt6.QtGui import QFontDatabase
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QSettings, Qt
+from PyQt6.QtGui import QColor, QFontDatabase, QPixmap
+from PyQt6.QtWidgets import QApplication, QSplashScreen
 
-from .data.repository import get_repository
-from .ui.main_window import MainWindow
 from .ui.theme_manager import get_theme_manager
 from .utils.config import get_config
 from .utils.logger import get_logger
@@ -26,12 +24,14 @@ logger = get_logger(__name__)
 class Application(QApplication):
     """Aplicación principal."""
     
-    def __init__(self, argv):
+    def __init__(self, argv, show_splash: bool = False):
         """
         Inicializa la aplicación.
         
         Args:
             argv: Argumentos de línea de comandos
+            show_splash: Si debe mostrar una pantalla de carga mientras
+                se importan y crean los componentes pesados
         """
         super().__init__(argv)
         
@@ -39,10 +39,40 @@ class Application(QApplication):
         self.setOrganizationDomain("fmbluesystem.com")
         self.setApplicationName("Nueva Biblioteca")
         
+        splash = self._show_splash() if show_splash else None
+        
         self._setup_app()
+        
+        if splash:
+            splash.finish(self.main_window)
+    
+    def _show_splash(self) -> QSplashScreen:
+        """
+        Muestra la pantalla de carga.
+        
+        Returns:
+            Pantalla de carga visible
+        """
+        pixmap = QPixmap(400, 200)
+        pixmap.fill(QColor("#2980B9"))
+        
+        splash = QSplashScreen(pixmap)
+        splash.showMessage(
+            "Cargando Nueva Biblioteca...",
+            Qt.AlignmentFlag.AlignCenter,
+            QColor("white")
+        )
+        splash.show()
+        self.processEvents()
+        return splash
     
     def _setup_app(self) -> None:
         """Configura la aplicación."""
+        # Importaciones pesadas (base de datos, ventana principal y sus
+        # widgets) diferidas hasta que existe la QApplication
+        from .data.repository import get_repository
+        from .ui.main_window import MainWindow
+        
         # Configuración
         get_config()
         self.settings = QSettings()
@@ -9,10 +9,11 @@ cantidades de archivos sin problemas de memoria.
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sized
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from itertools import islice
 from typing import Generic, TypeVar
 
 T = TypeVar('T')
@@ -74,15 +75,20 @@ class BatchProcessor(Generic[T, R]):
     
     async def process_items(
         self,
-        items: list[T],
+        items: Iterable[T],
         process_func: Callable[[T], R],
         on_progress: Callable[[BatchProgress], None] | None = None
     ) -> list[R]:
         """
-        Procesa una lista de items en chunks.
+        Procesa items en chunks.
+        
+        Los items se consumen de chunk en chunk, así que pueden venir de un
+        generador: solo hay un chunk en memoria a la vez y el procesamiento
+        empieza sin esperar a que se produzcan todos. Si items no tiene
+        longitud, total_items crece a medida que se leen.
         
         Args:
-            items: Lista de items a procesar
+            items: Items a procesar (lista o iterable)
             process_func: Función de procesamiento
             on_progress: Callback para reportar progreso
             
@@ -90,18 +96,23 @@ class BatchProcessor(Generic[T, R]):
             Lista de resultados
         """
         # Reiniciar estado
-        self._progress = BatchProgress(total_items=len(items))
+        sized = isinstance(items, Sized)
+        self._progress = BatchProgress(total_items=len(items) if sized else 0)
         self._cancel_requested = False
         results: list[R] = []
         
         try:
+            iterator = iter(items)
+            chunks_done = 0
+            
             # Procesar en chunks
-            for i in range(0, len(items), self.chunk_size):
-                if self._cancel_requested:
-                    break
-                
+            while not self._cancel_requested:
                 # Obtener chunk actual
-                chunk = items[i:i + self.chunk_size]
+                chunk = list(islice(iterator, self.chunk_size))
+                if not chunk:
+                    break
+                if not sized:
+                    self._progress.total_items += len(chunk)
                 
                 # Procesar chunk
                 chunk_results = await self._process_chunk(chunk, process_func)
@@ -113,7 +124,8 @@ class BatchProcessor(Generic[T, R]):
                     on_progress(self._progress)
                 
                 # Limpiar memoria si corresponde
-                if (i + 1) % (self.cleanup_interval * self.chunk_size) == 0:
+                chunks_done += 1
+                if chunks_done % self.cleanup_interval == 0:
                     self._cleanup_memory()
             
             return results
@@ -52,9 +52,10 @@ class CacheManager:
         self.max_memory_items = max_memory_items
         self.default_ttl = default_ttl
         
-        # Estado
-        self._memory_cache: dict[str, dict[str, Any]] = {}
-        self._access_counts: dict[str, int] = {}
+        # Estado; en memoria las entradas se indexan por (namespace, clave)
+        # y la clave de texto "namespace:clave" solo se construye para disco
+        self._memory_cache: dict[tuple[str, str], dict[str, Any]] = {}
+        self._access_counts: dict[tuple[str, str], int] = {}
         self._lock = Lock()
         
         # Crear directorio si no existe
@@ -98,23 +99,24 @@ class CacheManager:
         Returns:
             Valor almacenado o default
         """
-        full_key = f"{namespace}:{key}"
+        memory_key = (namespace, key)
         
         # Intentar obtener de memoria
         with self._lock:
-            if full_key in self._memory_cache:
-                item = self._memory_cache[full_key]
+            if memory_key in self._memory_cache:
+                item = self._memory_cache[memory_key]
                 if not self._is_expired(item):
-                    self._access_counts[full_key] = (
-                        self._access_counts.get(full_key, 0) + 1
+                    self._access_counts[memory_key] = (
+                        self._access_counts.get(memory_key, 0) + 1
                     )
                     return item["value"]
                 else:
-                    del self._memory_cache[full_key]
-                    if full_key in self._access_counts:
-                        del self._access_counts[full_key]
+                    del self._memory_cache[memory_key]
+                    if memory_key in self._access_counts:
+                        del self._access_counts[memory_key]
         
         # Intentar obtener de disco
+        full_key = f"{namespace}:{key}"
         try:
             with sqlite3.connect(self.db_path) as conn:
                 row = conn.execute("""
@@ -135,8 +137,8 @@ class CacheManager:
                     value = pickle.loads(value_blob)
                     
                     # Actualizar caché en memoria si es frecuentemente accedido
-                    if self._should_cache_in_memory(full_key):
-                        self._add_to_memory_cache(full_key, value)
+                    if self._should_cache_in_memory(memory_key):
+                        self._add_to_memory_cache(memory_key, value)
                     
                     return value
                 
@@ -166,6 +168,7 @@ class CacheManager:
         Returns:
             True si se almacenó correctamente
         """
+        memory_key = (namespace, key)
         full_key = f"{namespace}:{key}"
         
         try:
@@ -195,8 +198,8 @@ class CacheManager:
                 ))
             
             # Actualizar caché en memoria si corresponde
-            if self._should_cache_in_memory(full_key):
-                self._add_to_memory_cache(full_key, value, expires_at)
+            if self._should_cache_in_memory(memory_key):
+                self._add_to_memory_cache(memory_key, value, expires_at)
             
             return True
             
@@ -215,15 +218,16 @@ class CacheManager:
         Returns:
             True si se eliminó correctamente
         """
+        memory_key = (namespace, key)
         full_key = f"{namespace}:{key}"
         
         try:
             # Eliminar de memoria
             with self._lock:
-                if full_key in self._memory_cache:
-                    del self._memory_cache[full_key]
-                if full_key in self._access_counts:
-                    del self._access_counts[full_key]
+                if memory_key in self._memory_cache:
+                    del self._memory_cache[memory_key]
+                if memory_key in self._access_counts:
+                    del self._access_counts[memory_key]
             
             # Eliminar de disco
             with sqlite3.connect(self.db_path) as conn:
@@ -249,10 +253,9 @@ class CacheManager:
             # Limpiar memoria
             with self._lock:
                 if namespace:
-                    prefix = f"{namespace}:"
                     keys_to_delete = [
                         k for k in self._memory_cache
-                        if k.startswith(prefix)
+                        if k[0] == namespace
                     ]
                     for key in keys_to_delete:
                         del self._memory_cache[key]
@@ -319,7 +322,7 @@ class CacheManager:
         expires_at = item.get("expires_at")
         return expires_at and expires_at < datetime.now(tz=UTC)
     
-    def _should_cache_in_memory(self, key: str) -> bool:
+    def _should_cache_in_memory(self, key: tuple[str, str]) -> bool:
         """Determina si un item debe cachearse en memoria."""
         # Si hay espacio, siempre cachear
         if len(self._memory_cache) < self.max_memory_items:
@@ -331,7 +334,7 @@ class CacheManager:
     
     def _add_to_memory_cache(
         self,
-        key: str,
+        key: tuple[str, str],
         value: Any,
         expires_at: datetime | None = None
     ) -> None:
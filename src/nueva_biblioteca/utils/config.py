@@ -43,10 +43,25 @@ class FileConfig:
     backup_enabled: bool = True
     organize_by_artist: bool = True
     supported_formats: list = None
+    # Bytes del inicio y del final usados como huella
+    fingerprint_chunk_size: int = 64 * 1024
+    # Caché persistente de metadatos extraídos ("" la desactiva)
+    metadata_cache: str = str(Path.home() / ".nueva-biblioteca" / "metadata_cache.db")
     
     def __post_init__(self):
         if self.supported_formats is None:
             self.supported_formats = [".mp3", ".flac", ".m4a", ".wav", ".ogg"]
+        
+        # Normalizar una sola vez: ".mp3", "mp3" y ".MP3" son el mismo formato
+        self.supported_formats = list(dict.fromkeys(
+            f".{fmt.lstrip('.').lower()}" for fmt in self.supported_formats
+        ))
+        
+        # Extensiones soportadas en minúsculas y sin punto (ej: "mp3"); no
+        # es un campo, así que asdict() no la guarda con la configuración
+        self.extensions: frozenset[str] = frozenset(
+            fmt[1:] for fmt in self.supported_formats
+        )
 
 @dataclass
 class LoggingConfig:
@@ -200,6 +215,16 @@ def get_config() -> AppConfig:
         _config_manager = ConfigManager()
     return _config_manager.config
 
+def reset_config() -> None:
+    """
+    Descarta la configuración global en memoria.
+    
+    La siguiente llamada a get_config() vuelve a cargarla; pensado para
+    aislar tests entre sí.
+    """
+    global _config_manager
+    _config_manager = None
+
 def update_config(**kwargs) -> None:
     """Actualiza la configuración global."""
     global _config_manager
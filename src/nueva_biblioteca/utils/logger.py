@@ -183,6 +183,11 @@ class LoggerManager:
         Returns:
             Logger configurado
         """
+        # Camino rápido sin bloqueo: el logger ya existe
+        logger = self._loggers.get(name)
+        if logger is not None:
+            return logger
+        
         with self._lock:
             if name not in self._loggers:
                 # Usar configuración por defecto si no se especifica
@@ -235,3 +240,13 @@ def get_logger(name: str) -> Logger:
     if _logger_manager is None:
         _logger_manager = LoggerManager()
     return _logger_manager.get_logger(name)
+
+def reset_loggers() -> None:
+    """
+    Descarta el gestor global de loggers.
+    
+    La siguiente llamada a get_logger() lo recrea con la configuración
+    vigente; pensado para aislar tests entre sí.
+    """
+    global _logger_manager
+    _logger_manager = None
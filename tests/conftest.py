@@ -12,7 +12,8 @@ import json
 import asyncio
 import pytest_asyncio
 
-from nueva_biblioteca.utils.config import AppConfig, get_config
+from nueva_biblioteca.utils.config import AppConfig, get_config, reset_config
+from nueva_biblioteca.utils.logger import reset_loggers
 from nueva_biblioteca.data.repository import Repository, get_repository
 from nueva_biblioteca.data.models import Track, Playlist
 
@@ -171,6 +172,10 @@ def clean_environment(monkeypatch: "MonkeyPatch") -> None:
         "NUEVA_BIBLIOTECA_DEBUG"
     ]:
         monkeypatch.delenv(var, raising=False)
+    
+    # Descartar configuración y loggers cacheados por tests anteriores
+    reset_config()
+    reset_loggers()
 
 @pytest.fixture
 def mock_config(mocker: "MockerFixture") -> Dict[str, Any]:
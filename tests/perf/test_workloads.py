@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Cargas de trabajo representativas para el perfilado de rendimiento.
+
+Se seleccionan con ``-m perf_sample`` desde scripts/optimize_performance.py.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from nueva_biblioteca.data.repository import Repository
+
+# Tracks insertados en la biblioteca de prueba
+LIBRARY_SIZE = 500
+
+@pytest.fixture
+def library(tmp_path: Path) -> Repository:
+    """
+    Fixture que proporciona un repositorio con una biblioteca poblada.
+    
+    Args:
+        tmp_path: Directorio temporal proporcionado por pytest
+        
+    Returns:
+        Repositorio de prueba
+    """
+    repository = Repository(str(tmp_path / "library.db"))
+    
+    with repository.transaction():
+        for i in range(LIBRARY_SIZE):
+            repository.add_track({
+                "file_path": f"/music/artist_{i % 25}/track_{i}.mp3",
+                "title": f"Track {i}",
+                "artist": f"Artist {i % 25}",
+                "album": f"Album {i % 50}",
+                "genre": ("Rock", "Jazz", "Pop")[i % 3],
+                "duration": 180.0 + i
+            })
+    
+    return repository
+
+@pytest.mark.perf_sample
+def test_library_queries(library: Repository) -> None:
+    """
+    Ejecuta las consultas habituales de la interfaz sobre la biblioteca.
+    
+    Args:
+        library: Repositorio con la biblioteca poblada
+    """
+    assert len(library.get_all_tracks()) == LIBRARY_SIZE
+    
+    for i in range(25):
+        assert library.search_tracks(f"Artist {i}")
+    
+    with library.transaction():
+        playlist = library.create_playlist(name="Perf")
+        for track in library.get_all_tracks(limit=100):
+            library.add_track_to_playlist(playlist.id, track.id)
+    
+    assert len(library.get_playlist_tracks(playlist.id)) == 100
@@ -30,6 +30,14 @@ def test_imports():
     
     assert True  # Si llegamos aquí, todos los imports funcionaron
 
+def test_package_exports():
+    """Test que verifica que __all__ coincide con los componentes diferidos."""
+    import nueva_biblioteca
+    
+    assert set(nueva_biblioteca.__all__) == {
+        "__version__", *nueva_biblioteca._lazy_imports
+    }
+
 def test_config():
     """Test que verifica que la configuración funciona."""
     from nueva_biblioteca.utils.config import get_config
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests para el analizador de audio.
+"""
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from nueva_biblioteca.core import audio_analyzer
+from nueva_biblioteca.core.audio_analyzer import AudioAnalyzer
+from nueva_biblioteca.utils.cache_manager import CacheManager
+
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+    from pytest_mock.plugin import MockerFixture
+
+    from nueva_biblioteca.utils.config import AppConfig
+
+def _stub_worker(
+    file_path: str,
+    features: list[str] | None = None
+) -> dict[str, Any]:
+    """
+    Sustituye a _analyze_worker en los procesos trabajadores.
+
+    Args:
+        file_path: Ruta al archivo
+        features: Lista de características
+
+    Returns:
+        Análisis ficticio derivado de la ruta
+    """
+    if file_path.endswith("crash.mp3"):
+        os._exit(1)
+    return {"bpm": float(len(file_path))}
+
+@pytest.fixture
+def analyzer(
+    test_config: "AppConfig",
+    tmp_path: Path,
+    monkeypatch: "MonkeyPatch"
+) -> AudioAnalyzer:
+    """
+    Fixture que proporciona un analizador con caché temporal y el worker
+    de procesos sustituido.
+
+    Args:
+        test_config: Configuración de prueba
+        tmp_path: Directorio temporal proporcionado por pytest
+        monkeypatch: Fixture para modificar objetos
+
+    Returns:
+        Analizador de prueba
+    """
+    cache = CacheManager(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(audio_analyzer, "get_cache", lambda: cache)
+    monkeypatch.setattr(audio_analyzer, "get_task_queue", lambda: None)
+    monkeypatch.setattr(audio_analyzer, "_analyze_worker", _stub_worker)
+    return AudioAnalyzer(max_workers=2)
+
+def _make_files(folder: Path, names: list[str]) -> list[str]:
+    """
+    Crea archivos de audio ficticios.
+
+    Args:
+        folder: Directorio destino
+        names: Nombres de los archivos
+
+    Returns:
+        Rutas de los archivos creados
+    """
+    paths = []
+    for name in names:
+        path = folder / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+    return paths
+
+def test_batch_analyze_in_processes(analyzer: AudioAnalyzer, tmp_path: Path) -> None:
+    """
+    Prueba el análisis en procesos: orden, progreso y caché en el padre.
+
+    Args:
+        analyzer: Analizador de prueba
+        tmp_path: Directorio temporal proporcionado por pytest
+    """
+    files = _make_files(tmp_path, [f"{i}.mp3" for i in range(5)])
+    progress = []
+
+    results = analyzer.batch_analyze(
+        files,
+        on_progress=lambda percentage, _: progress.append(percentage),
+        use_processes=True
+    )
+
+    assert list(results) == files
+    assert all(results[f] == {"bpm": float(len(f))} for f in files)
+    assert progress[-1] == 100
+
+    # El padre guarda en caché lo calculado por los trabajadores
+    assert analyzer._lookup_cache(files[0])[1] == results[files[0]]
+
+def test_broken_process_pool_falls_back_to_threads(
+    analyzer: AudioAnalyzer,
+    tmp_path: Path
+) -> None:
+    """
+    Prueba que un trabajador caído no aborta el lote.
+
+    Args:
+        analyzer: Analizador de prueba
+        tmp_path: Directorio temporal proporcionado por pytest
+    """
+    files = _make_files(tmp_path, ["a.mp3", "crash.mp3", "b.mp3"])
+    progress = []
+
+    results = analyzer.batch_analyze(
+        files,
+        on_progress=lambda percentage, _: progress.append(percentage),
+        use_processes=True
+    )
+
+    assert sorted(results) == sorted(files)
+    assert progress[-1] == 100
+
+class _FakePool(dict):
+    """Pool de essentia simulado."""
+
+    def containsKey(self, key: str) -> bool:  # noqa: N802
+        return key in self
+
+@pytest.mark.parametrize("prefix", ["tonal.key_edma.", "tonal.key_"])
+def test_music_extractor_mapping(
+    analyzer: AudioAnalyzer,
+    monkeypatch: "MonkeyPatch",
+    mocker: "MockerFixture",
+    prefix: str
+) -> None:
+    """
+    Prueba la lectura de BPM, tonalidad y bailabilidad del pool de
+    MusicExtractor, con los nombres de descriptores de cada versión.
+
+    Args:
+        analyzer: Analizador de prueba
+        monkeypatch: Fixture para modificar objetos
+        mocker: Fixture de pytest-mock
+        prefix: Prefijo de los descriptores de tonalidad
+    """
+    pool = _FakePool({
+        "rhythm.bpm": 128,
+        "rhythm.danceability": 1.5,
+        f"{prefix}key": "A",
+        f"{prefix}scale": "minor",
+        f"{prefix}strength": 0.75
+    })
+    es = mocker.MagicMock()
+    es.MusicExtractor.return_value = mocker.MagicMock(return_value=(pool, None))
+    monkeypatch.setattr(audio_analyzer, "es", es)
+
+    results = analyzer._extract_combined("song.mp3", ["bpm", "key", "energy"])
+
+    assert results == {"bpm": 128.0, "key": ("A minor", 0.75)}
+    assert isinstance(results["bpm"], float)
+    assert analyzer._extract_combined("song.mp3", ["bpm", "danceability"]) == {
+        "bpm": 128.0,
+        "danceability": 1.5
+    }
+
+    # Con una sola de las tres características no compensa la pasada
+    assert analyzer._extract_combined("song.mp3", ["bpm", "energy"]) == {}
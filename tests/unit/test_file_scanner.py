@@ -5,6 +5,7 @@ Tests para el módulo de escaneo de archivos.
 
 from typing import TYPE_CHECKING, List, Set
 from pathlib import Path
+import asyncio
 import pytest
 import shutil
 
@@ -138,7 +139,7 @@ def test_scan_directory(
     )
     
     # Escanear directorio
-    tracks = list(scanner.scan_directory(music_dir))
+    tracks = scanner.scan_directory_sync(music_dir)
     
     assert len(tracks) == 5  # Solo archivos soportados
     
@@ -200,7 +201,7 @@ def test_removed_files(
         test_repository: Repositorio de prueba
     """
     # Escanear primero
-    tracks = list(scanner.scan_directory(music_dir))
+    tracks = scanner.scan_directory_sync(music_dir)
     for track in tracks:
         test_repository.save_track(track)
     
@@ -233,8 +234,22 @@ def test_error_handling(
     bad_file.write_text("not an audio file")
     
     # Escanear
-    tracks = list(scanner.scan_directory(music_dir))
+    tracks = scanner.scan_directory_sync(music_dir)
     
     # Verificar que se ignoró el archivo corrupto
     assert all(track.file_path != str(bad_file) for track in tracks)
     assert "Error processing file" in caplog.text
+
+def test_scan_missing_directory(scanner: FileScanner, tmp_path: Path) -> None:
+    """
+    Prueba que un directorio raíz inexistente se registra como error.
+    
+    Args:
+        scanner: Escáner de archivos
+        tmp_path: Directorio temporal proporcionado por pytest
+    """
+    results = asyncio.run(scanner.scan_directory(tmp_path / "missing"))
+    
+    assert results == []
+    assert len(scanner.get_progress().errors) == 1
+    assert "missing" in scanner.get_progress().errors[0]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests para el Meta Designer.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from nueva_biblioteca.core.meta_designer import MetaDesigner, MetaRule
+from nueva_biblioteca.utils.cache_manager import CacheManager
+
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+
+@pytest.fixture
+def designer(tmp_path: Path, monkeypatch: "MonkeyPatch") -> MetaDesigner:
+    """
+    Fixture que proporciona un Meta Designer con caché temporal.
+
+    Args:
+        tmp_path: Directorio temporal proporcionado por pytest
+        monkeypatch: Fixture para modificar objetos
+
+    Returns:
+        Instancia de MetaDesigner
+    """
+    cache = CacheManager(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(
+        "nueva_biblioteca.core.meta_designer.get_cache", lambda: cache
+    )
+    return MetaDesigner()
+
+def test_rules_follow_rule_updates(designer: MetaDesigner) -> None:
+    """
+    Prueba que las reglas agregadas, modificadas o eliminadas se aplican
+    en la siguiente llamada.
+    
+    Args:
+        designer: Meta Designer de prueba
+    """
+    metadata = {"artist": "the band", "title": "song"}
+    assert designer.apply_rules(metadata)["artist"] == "The Band"
+    
+    # Deshabilitar una regla
+    assert designer.update_rule("normalize_artist", enabled=False)
+    assert designer.apply_rules(metadata)["artist"] == "the band"
+    
+    # Campos o acciones no válidos no modifican la regla
+    assert not designer.update_rule("normalize_artist", action="delete")
+    assert not designer.update_rule("normalize_artist", unknown=True)
+    assert not designer.update_rule("missing", enabled=True)
+    
+    # Agregar una regla
+    assert designer.add_rule(MetaRule(
+        field="artist",
+        condition="any",
+        value=None,
+        action="replace",
+        parameters={"old": "band", "new": "group"}
+    ))
+    assert designer.apply_rules(metadata)["artist"] == "the group"
+    
+    # Modificar los parámetros
+    rule_id = next(name for name in designer.rules if name.startswith("artist_"))
+    assert designer.update_rule(rule_id, parameters={"old": "band", "new": "crew"})
+    assert designer.apply_rules_batch([metadata])[0]["artist"] == "the crew"
+    
+    # Eliminar la regla
+    assert designer.remove_rule(rule_id)
+    assert not designer.remove_rule(rule_id)
+    assert designer.apply_rules(metadata)["artist"] == "the band"
+
+def test_any_template_follows_enabled_changes(designer: MetaDesigner) -> None:
+    """
+    Prueba que el patrón combinado refleja los templates habilitados.
+
+    Args:
+        designer: Meta Designer de prueba
+    """
+    # El primer template habilitado que coincide es el que se aplica
+    assert designer.apply_any_template("Foo - Bar")[0] == "artist_title"
+    name, fields = designer.apply_any_template("Artist - Album - 03 - Song")
+    assert name == "artist_title"
+
+    designer.templates["artist_title"].enabled = False
+    assert designer.apply_any_template("Foo - Bar") is None
+    name, fields = designer.apply_any_template("Artist - Album - 03 - Song")
+    assert name == "artist_album_track"
+    assert fields["track_number"] == 3
+
+    designer.templates["artist_title"].enabled = True
+    assert designer.apply_any_template("Foo - Bar")[0] == "artist_title"
+
+@pytest.mark.parametrize("value, expected", [
+    ("song (live version)", "Song (Live Version)"),
+    ("AC/DC", "AC/DC"),
+    ("LED ZEPPELIN", "Led Zeppelin"),
+    ("don't stop me now", "Don't Stop Me Now"),
+    ("jay-z", "Jay-Z"),
+    ("80s hits", "80s Hits"),
+])
+def test_capitalize_words(designer: MetaDesigner, value: str, expected: str) -> None:
+    """
+    Prueba la capitalización por palabras de la normalización.
+
+    Args:
+        designer: Meta Designer de prueba
+        value: Valor original
+        expected: Valor capitalizado esperado
+    """
+    assert designer.apply_rules({"artist": value})["artist"] == expected
@@ -231,3 +231,40 @@ def test_supported_formats(metadata_manager: MetadataManager) -> None:
     assert metadata_manager.is_supported("test.m4a")
     assert not metadata_manager.is_supported("test.wav")
     assert not metadata_manager.is_supported("test.txt")
+
+def test_extract_metadata_cache(
+    tmp_path: Path,
+    monkeypatch: "MonkeyPatch"
+) -> None:
+    """
+    Prueba que la caché persistente evita releer archivos sin cambios.
+    
+    Args:
+        tmp_path: Directorio temporal proporcionado por pytest
+        monkeypatch: Fixture para modificar objetos
+    """
+    loads = []
+    
+    class FakeAudio:
+        def __init__(self, file_path: str):
+            loads.append(file_path)
+            self.info = type("Info", (), {"length": 1.5})()
+    
+    monkeypatch.setitem(MetadataManager.SUPPORTED_FORMATS, ".wav", (FakeAudio, None))
+    
+    audio_file = tmp_path / "track.wav"
+    audio_file.write_bytes(b"dummy audio data")
+    cache_path = str(tmp_path / "metadata_cache.db")
+    
+    first = MetadataManager(cache_path=cache_path).extract_metadata(str(audio_file))
+    
+    # Otra instancia reutiliza lo guardado en disco
+    second = MetadataManager(cache_path=cache_path).extract_metadata(str(audio_file))
+    
+    assert first.duration == second.duration == 1.5
+    assert len(loads) == 1
+    
+    # Un cambio de tamaño invalida la entrada
+    audio_file.write_bytes(b"other dummy audio data")
+    MetadataManager(cache_path=cache_path).extract_metadata(str(audio_file))
+    assert len(loads) == 2
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests para la cola de reproducción.
+"""
+
+import pytest
+
+from nueva_biblioteca.core.play_queue import PlayQueue, RepeatMode, ShuffleMode
+from nueva_biblioteca.data.models import Track
+
+
+@pytest.fixture
+def tracks() -> list[Track]:
+    """
+    Fixture que proporciona tracks de prueba con ID.
+
+    Returns:
+        Lista de tracks
+    """
+    return [
+        Track(id=i, file_path=f"/music/{i}.mp3", title=f"T{i}")
+        for i in range(5)
+    ]
+
+@pytest.fixture
+def queue(tracks: list[Track]) -> PlayQueue:
+    """
+    Fixture que proporciona una cola con los tracks de prueba.
+
+    Args:
+        tracks: Tracks de prueba
+
+    Returns:
+        Cola de reproducción
+    """
+    queue = PlayQueue()
+    queue.add_tracks(tracks)
+    return queue
+
+def test_next_and_jump(queue: PlayQueue, tracks: list[Track]) -> None:
+    """
+    Prueba el avance normal, el salto y la repetición de toda la cola.
+
+    Args:
+        queue: Cola de prueba
+        tracks: Tracks de prueba
+    """
+    assert queue.next_track() is tracks[0]
+    assert queue.next_track() is tracks[1]
+    assert queue.jump_to_track(4) is tracks[4]
+    assert queue.next_track() is None
+
+    queue.set_repeat_mode(RepeatMode.ALL)
+    assert queue.next_track() is tracks[0]
+    assert [t.id for t in queue.history] == [0, 1, 4]
+
+def test_mutations_keep_current_index(queue: PlayQueue, tracks: list[Track]) -> None:
+    """
+    Prueba que insertar, mover y eliminar mantienen el track actual.
+
+    Args:
+        queue: Cola de prueba
+        tracks: Tracks de prueba
+    """
+    queue.jump_to_track(2)
+    extra = Track(id=10, file_path="/music/10.mp3", title="Extra")
+
+    queue.add_track(extra, position=3)
+    assert queue.queue[3] is extra
+
+    assert queue.move_track(3, 0)
+    assert queue.queue[queue.current_index] is tracks[2]
+
+    assert queue.remove_track(0)
+    assert [t.id for t in queue.queue] == [0, 1, 2, 3, 4]
+    assert queue.queue[queue.current_index] is tracks[2]
+
+    # La propiedad devuelve una copia
+    queue.queue.clear()
+    assert queue.size == 5
+
+def test_shuffle_keeps_current_off_first_slot(queue: PlayQueue) -> None:
+    """
+    Prueba que el shuffle es una permutación sin el track actual al inicio.
+
+    Args:
+        queue: Cola de prueba
+    """
+    queue.jump_to_track(0)
+    queue.set_shuffle_mode(ShuffleMode.ON)
+
+    for _ in range(50):
+        queue._regenerate_shuffle()
+        indices = queue._shuffle_indices
+
+        assert sorted(indices) == list(range(5))
+        assert indices[0] != 0
+        assert indices[queue._shuffle_position] == 0
+
+def test_shuffle_updates_incrementally(queue: PlayQueue, tracks: list[Track]) -> None:
+    """
+    Prueba que añadir y eliminar con shuffle conserva el orden ya establecido.
+
+    Args:
+        queue: Cola de prueba
+        tracks: Tracks de prueba
+    """
+    queue.set_shuffle_mode(ShuffleMode.ON)
+    played = [queue.next_track(), queue.next_track()]
+    upcoming = [queue.queue[i] for i in queue._shuffle_indices[2:]]
+
+    extra = Track(id=10, file_path="/music/10.mp3", title="Extra")
+    queue.add_track(extra, position=0)
+    assert queue.queue[queue.current_index] is played[1]
+
+    removed = upcoming.pop()
+    assert queue.remove_track(queue.queue.index(removed))
+
+    rest = [queue.next_track() for _ in range(len(upcoming) + 1)]
+    assert [t for t in rest if t is not extra] == upcoming
+    assert extra in rest
+    assert queue.next_track() is None
+
+def test_bulk_operations_emit_once(queue: PlayQueue, tracks: list[Track]) -> None:
+    """
+    Prueba que las operaciones en bloque notifican un solo queue_changed.
+
+    Args:
+        queue: Cola de prueba
+        tracks: Tracks de prueba
+    """
+    emitted = []
+    queue.queue_changed.connect(lambda: emitted.append(True))
+
+    queue.add_tracks(tracks, clear_first=True)
+    assert len(emitted) == 1
+
+    with queue.batch_update():
+        with queue.batch_update():
+            queue.remove_track(0)
+        queue.add_track(tracks[0])
+    assert len(emitted) == 2
+
+    queue.restore_state(queue.get_state(), {t.id: t for t in tracks})
+    assert len(emitted) == 3
+    assert queue.size == 5
+
+def test_batch_keeps_other_signals(queue: PlayQueue, tracks: list[Track]) -> None:
+    """
+    Prueba que batch_update solo aplaza queue_changed.
+
+    Args:
+        queue: Cola de prueba
+        tracks: Tracks de prueba
+    """
+    changed = []
+    current = []
+    modes = []
+    queue.queue_changed.connect(lambda: changed.append(True))
+    queue.current_changed.connect(current.append)
+    queue.mode_changed.connect(lambda: modes.append(True))
+
+    with queue.batch_update():
+        queue.jump_to_track(2)
+        queue.set_shuffle_mode(ShuffleMode.ON)
+        assert current == [tracks[2]]
+        assert len(modes) == 1
+
+    # Sin cambios en la cola no hay queue_changed
+    assert changed == []
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests para el repositorio de datos.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from nueva_biblioteca.data.models import Track
+from nueva_biblioteca.data.repository import Repository
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Repository:
+    """
+    Fixture que proporciona un repositorio sobre una base temporal.
+
+    Args:
+        tmp_path: Directorio temporal proporcionado por pytest
+
+    Returns:
+        Repositorio de prueba
+    """
+    return Repository(str(tmp_path / "library.db"))
+
+def test_transaction_commits_once(repository: Repository) -> None:
+    """
+    Prueba que las operaciones dentro de una transacción se confirman juntas.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    with repository.transaction():
+        track = repository.add_track({"file_path": "/music/a.mp3", "title": "A"})
+        playlist = repository.create_playlist(name="Test")
+
+        assert track is not None and track.id is not None
+        assert repository.add_track_to_playlist(playlist.id, track.id)
+
+        # Un error en una operación solo deshace esa operación
+        assert repository.add_track({"file_path": "/music/a.mp3"}) is None
+
+    tracks = repository.get_all_tracks()
+    assert [t.title for t in tracks] == ["A"]
+    assert len(repository.get_playlist_tracks(playlist.id)) == 1
+
+def test_transaction_rollback(repository: Repository) -> None:
+    """
+    Prueba que una excepción deshace toda la transacción.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    with pytest.raises(RuntimeError), repository.transaction():
+        repository.add_track({"file_path": "/music/a.mp3"})
+        raise RuntimeError("fallo")
+
+    assert repository.get_all_tracks() == []
+
+def test_sqlite_pragmas(repository: Repository) -> None:
+    """
+    Prueba que las conexiones usan WAL y claves foráneas.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    pragmas = repository.get_pragmas()
+
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["foreign_keys"] == 1
+
+def test_search_tracks_full_text(repository: Repository) -> None:
+    """
+    Prueba que la búsqueda usa el índice FTS5 y sigue los cambios.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    assert repository.fts_enabled
+
+    track = repository.add_track({
+        "file_path": "/music/a.mp3",
+        "title": "Canción de prueba",
+        "artist": "Los \"Test\"",
+        "album": "Álbum"
+    })
+    repository.add_track({"file_path": "/music/b.mp3", "title": "Otra"})
+
+    assert [t.id for t in repository.search_tracks("cancion")] == [track.id]
+    assert [t.id for t in repository.search_tracks("los \"te")] == [track.id]
+    assert [t.id for t in repository.search_tracks("album")] == [track.id]
+
+    repository.update_track(track.id, {"title": "Renombrada"})
+    assert repository.search_tracks("cancion") == []
+    assert [t.id for t in repository.search_tracks("renom")] == [track.id]
+
+    repository.delete_track(track.id)
+    assert repository.search_tracks("renom") == []
+    assert len(repository.search_tracks()) == 1
+
+def test_playlists_load_tracks_eagerly(repository: Repository) -> None:
+    """
+    Prueba que las playlists cargan sus tracks sin una consulta por fila.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    with repository.transaction():
+        for i in range(5):
+            playlist = repository.create_playlist(name=f"Lista {i}")
+            track = repository.add_track({"file_path": f"/music/{i}.mp3"})
+            repository.add_track_to_playlist(playlist.id, track.id)
+
+    statements = []
+    event.listen(
+        repository.engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    playlists = repository.get_all_playlists()
+
+    # Fuera de la sesión los tracks ya están cargados
+    assert [p.track_count for p in playlists] == [1] * 5
+    assert sum(s.lstrip().startswith("SELECT") for s in statements) == 2
+
+def test_add_tracks_bulk(repository: Repository) -> None:
+    """
+    Prueba la inserción por lotes omitiendo rutas existentes.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    repository.add_track({"file_path": "/music/0.mp3"})
+
+    inserted = repository.add_tracks(
+        [{"file_path": f"/music/{i}.mp3", "title": f"T{i}"} for i in range(3)]
+        + [{"file_path": "/music/x.mp3", "artist": "Solo"}]
+    )
+
+    assert inserted == 3
+    tracks = repository.get_all_tracks()
+    assert len(tracks) == 4
+    assert all(t.play_count == 0 for t in tracks)
+    assert [t.file_path for t in repository.search_tracks("solo")] == ["/music/x.mp3"]
+
+def test_save_tracks_batches(repository: Repository) -> None:
+    """
+    Prueba el guardado por lotes, incluido un lote con una ruta duplicada.
+
+    Args:
+        repository: Repositorio de prueba
+    """
+    repository.add_track({"file_path": "/music/dup.mp3"})
+    tracks = [Track(file_path=f"/music/{i}.mp3") for i in range(5)]
+    tracks.insert(3, Track(file_path="/music/dup.mp3"))
+
+    progress = []
+    saved = repository.save_tracks(
+        tracks, batch_size=2,
+        on_batch=lambda processed, batch: progress.append(processed)
+    )
+
+    assert saved == 5
+    assert progress == [2, 4, 6]
+    assert len(repository.get_all_tracks()) == 6